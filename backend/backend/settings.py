@@ -48,14 +48,39 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication sans lecture de la ligne User à chaque requête
+        'portfolio.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated'
-    ]
+    ],
+    # Pagination par curseur sur (-created_at, -id), voir portfolio/pagination.py
+    'DEFAULT_PAGINATION_CLASS': 'portfolio.pagination.CreatedAtCursorPagination',
+    'PAGE_SIZE': 50,
+    # Un seul proxy (nginx, frontend/nginx.conf) devant le backend: l'IP du client est la
+    # dernière entrée de X-Forwarded-For, les entrées envoyées par le client sont ignorées
+    'NUM_PROXIES': 1,
+    # Seaux à jetons par portée '<throttle_scope>.<ip|email|user>' (portfolio/throttling.py)
+    'DEFAULT_THROTTLE_RATES': {
+        'signin.ip': '20/min',
+        'signin.email': '5/min',
+        'signup.ip': '5/hour',
+        'password_reset.ip': '5/hour',
+        'password_reset.email': '3/hour',
+        'password_reset_confirm.ip': '10/hour',
+        'contact.ip': '10/hour',
+        'contact.user': '100/day',
+    },
 }
 
+# Stockage des seaux: CacheBucketStore (cache Django ci-dessous) ou
+# RedisBucketStore (atomique, paquet redis) avec PORTFOLIO_THROTTLE_REDIS_URL
+# En production, PORTFOLIO_THROTTLE_CACHE doit être un cache partagé (Redis,
+# Memcached): avec LocMemCache chaque worker a ses seaux (avertissement portfolio.W002)
+PORTFOLIO_THROTTLE_STORE = 'portfolio.throttling.CacheBucketStore'
+PORTFOLIO_THROTTLE_CACHE = 'default'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=30),
@@ -97,6 +122,23 @@ EMAIL_HOST_USER = '________'
 EMAIL_HOST_PASSWORD = '________'
 DEFAULT_FROM_EMAIL = '________'
 
+# Outbox: les emails sont mis en file et envoyés par: manage.py send_outbox
+# Messages envoyés par connexion SMTP
+PORTFOLIO_OUTBOX_BATCH_SIZE = 100
+# Nombre de tentatives avant abandon d'un message
+PORTFOLIO_OUTBOX_MAX_ATTEMPTS = 5
+# Délai (secondes) avant la première nouvelle tentative, doublé à chaque échec
+PORTFOLIO_OUTBOX_RETRY_DELAY = 60
+
+# Durée (secondes) de conservation en mémoire des champs d'authentification d'un
+# utilisateur (is_active, is_staff...), voir portfolio/authentication.py
+PORTFOLIO_AUTH_CACHE_TTL = 30
+
+# Purge des jetons expirés (refresh tokens, liste noire, réinitialisation de mot de passe):
+# manage.py purge_expired_tokens, ou toutes les N secondes dans chaque processus si défini
+PORTFOLIO_TOKEN_HOUSEKEEPING_INTERVAL = None
+PORTFOLIO_TOKEN_HOUSEKEEPING_BATCH_SIZE = 1000
+
 AUTH_USER_MODEL = 'portfolio.User'
 
 # CORS (pour le frontend)
@@ -111,7 +153,9 @@ CORS_ALLOWED_ORIGINS = [
 # CORS_ALLOW_ALL_ORIGINS = True  # Décommentez seulement pour le développement
 
 MIDDLEWARE = [
-    'corsheaders.middleware.CorsMiddleware',  # Déplacé en premier
+    'portfolio.log.RequestIdMiddleware',  # En tête: identifiant de requête pour tous les logs
+    'portfolio.metrics.RequestMetricsMiddleware',  # Mesure toute la requête
+    'corsheaders.middleware.CorsMiddleware',  # Avant CommonMiddleware
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -171,6 +215,28 @@ DATABASES = {
 }
 
 
+# Hachage des mots de passe (portfolio/hashing.py)
+# Le premier hasher sert aux nouveaux hashes; les autres vérifient les anciens,
+# recalculés avec le premier à la connexion suivante.
+# Argon2 (paquet argon2-cffi): placer TunedArgon2PasswordHasher en premier
+PASSWORD_HASHERS = [
+    'portfolio.hashing.TunedScryptPasswordHasher',
+    'portfolio.hashing.TunedArgon2PasswordHasher',
+    'portfolio.hashing.TunedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+# Coût par algorithme (un changement est appliqué aux hashes existants à la connexion)
+PORTFOLIO_PASSWORD_HASHER_COST = {
+    'scrypt': {'work_factor': 2 ** 14},
+    'argon2': {'time_cost': 2, 'memory_cost': 102400, 'parallelism': 8},
+    'pbkdf2_sha256': {'iterations': 600000},
+}
+# Threads (donc cœurs) consacrés au hachage, et calculs en attente au-delà
+# desquels une connexion est refusée (503) après le délai d'admission (secondes)
+PORTFOLIO_HASHING_WORKERS = 2
+PORTFOLIO_HASHING_QUEUE_SIZE = 16
+PORTFOLIO_HASHING_ADMISSION_TIMEOUT = 2.0
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -204,7 +270,8 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
 STATIC_URL = '/static/'
-STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')  # Pour la production
+# Pour la production; PORTFOLIO_STATIC_ROOT: volume partagé avec nginx (docker-compose.yml)
+STATIC_ROOT = os.environ.get('PORTFOLIO_STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles'))
 
 # En développement, dossiers de fichiers statiques
 STATICFILES_DIRS = [
@@ -223,7 +290,28 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Configuration pour les fichiers media (fichiers uploadés)
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# PORTFOLIO_MEDIA_ROOT: volume partagé avec nginx (docker-compose.yml)
+MEDIA_ROOT = os.environ.get('PORTFOLIO_MEDIA_ROOT', os.path.join(BASE_DIR, 'media'))
+
+# Médias nommés par l'empreinte SHA-256 de leur contenu (dédupliqués, cache immuable)
+# Les fichiers orphelins sont supprimés par: manage.py sweep_media
+STORAGES = {
+    'default': {
+        'BACKEND': 'portfolio.storage.ContentAddressedStorage',
+    },
+    # Noms hachés par collectstatic (cache immuable) et fichiers .gz/.br précompressés
+    'staticfiles': {
+        'BACKEND': 'portfolio.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Envoi des fichiers /media/ et /static/ (portfolio.views.media_view):
+# 'x-accel' (nginx, voir frontend/nginx.conf), 'x-sendfile' ou 'django' (développement)
+# En mode x-accel, une requête qui n'est pas passée par nginx est servie par Django
+PORTFOLIO_FILE_SERVE_MODE = 'django' if DEBUG else 'x-accel'
+# Locations nginx 'internal' pointant sur MEDIA_ROOT et STATIC_ROOT
+PORTFOLIO_MEDIA_INTERNAL_PREFIX = '/protected-media/'
+PORTFOLIO_STATIC_INTERNAL_PREFIX = '/protected-static/'
 
 # URL du site (pour construire les URLs complètes des logos)
 SITE_URL = 'http://localhost:8000'  # En développement
@@ -249,6 +337,22 @@ ALLOWED_IMAGE_TYPES = [
 # Taille maximale des images (en bytes)
 MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5MB
 
+# Nombre maximal de pixels (largeur x hauteur) d'une image uploadée (protection contre les 'decompression bombs')
+MAX_IMAGE_PIXELS = 40_000_000
+
+# Variantes générées après upload (taille maximale du plus grand côté, en pixels)
+IMAGE_VARIANT_SIZES = {
+    'thumb': 160,
+    'medium': 640,
+    'full': 1600,
+}
+# 'original' = format de l'image uploadée; ajouter 'avif' si Pillow le supporte
+IMAGE_VARIANT_FORMATS = ['webp', 'original']
+# Nombre de threads dédiés au traitement des images (hors thread de requête)
+IMAGE_PROCESSING_WORKERS = 2
+# False pour générer les variantes de manière synchrone (tests, scripts)
+IMAGE_PROCESSING_ASYNC = True
+
 # ================================
 # CONFIGURATION DE LOGGING
 # ================================
@@ -258,25 +362,33 @@ LOGGING = {
     'disable_existing_loggers': False,
     'formatters': {
         'verbose': {
-            'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
+            'format': '{levelname} {asctime} {name} {process:d} {thread:d} [{request_id}] {message}',
             'style': '{',
         },
         'simple': {
-            'format': '{levelname} {message}',
+            'format': '{levelname} [{request_id}] {message}',
             'style': '{',
         },
     },
+    'filters': {
+        'request_id': {
+            '()': 'portfolio.log.RequestIdFilter',
+        },
+    },
     'handlers': {
+        # Écriture dans un thread dédié (fichier et console): ne bloque pas les requêtes
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'portfolio.log.QueuedFileHandler',
             'filename': os.path.join(BASE_DIR, 'debug.log'),
             'formatter': 'verbose',
+            'filters': ['request_id'],
         },
         'console': {
             'level': 'DEBUG',
-            'class': 'logging.StreamHandler',
+            'class': 'portfolio.log.QueuedStreamHandler',
             'formatter': 'simple',
+            'filters': ['request_id'],
         },
     },
     'root': {
@@ -289,9 +401,10 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        # Les logger.debug() ne coûtent qu'un test de niveau en production
         'portfolio': {
             'handlers': ['file', 'console'],
-            'level': 'DEBUG',
+            'level': 'DEBUG' if DEBUG else 'INFO',
             'propagate': False,
         },
     },
@@ -319,6 +432,11 @@ X_FRAME_OPTIONS = 'DENY'
 # CONFIGURATION CACHE (optionnel)
 # ================================
 
+# La production (plusieurs processus) REQUIERT un cache partagé (Redis, Memcached):
+# les versions du cache des réponses et les seaux de limitation de débit doivent
+# être communs à tous les workers. Un cache local au processus (LocMemCache) ne
+# convient qu'au développement (runserver, un seul processus).
+
 # Cache en développement (simple)
 CACHES = {
     'default': {
@@ -335,6 +453,30 @@ CACHES = {
 #     }
 # }
 
+# Durée de vie (secondes) des réponses publiques par utilisateur mises en cache
+# Les entrées sont invalidées par version à chaque modification (portfolio/signals.py)
+PORTFOLIO_CACHE_TIMEOUT = 60 * 60
+# Autorise le cache des réponses avec un cache local au processus; sinon il est
+# désactivé (avertissement portfolio.W001 de manage.py check)
+PORTFOLIO_CACHE_ALLOW_LOCAL = DEBUG
+
+# Synchronisation incrémentale (/api/sync/): durée de conservation des suppressions
+# (purgées par: manage.py purge_sync_tombstones)
+PORTFOLIO_SYNC_TOMBSTONE_RETENTION = timedelta(days=30)
+
+# ================================
+# INSTRUMENTATION DES REQUÊTES
+# ================================
+
+# Mesures par requête (requêtes SQL, temps DB/sérialisation, taille) et en-tête Server-Timing
+PORTFOLIO_METRICS_ENABLED = True
+# Nombre d'échantillons conservés par endpoint dans chaque processus
+PORTFOLIO_METRICS_MAX_SAMPLES = 1000
+# Dossier où chaque processus recopie ses mesures (lu par: manage.py metrics_report)
+PORTFOLIO_METRICS_DIR = os.path.join(BASE_DIR, 'metrics')
+# Intervalle (secondes) entre deux écritures, faites par un thread de chaque processus; 0 pour désactiver
+PORTFOLIO_METRICS_FLUSH_INTERVAL = 30
+
 # ================================
 # CONFIGURATION POUR CRÉER LES DOSSIERS AUTOMATIQUEMENT
 # ================================
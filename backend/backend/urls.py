@@ -15,13 +15,14 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+import re
+from django.urls import path, include, re_path
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
 from django.conf import settings
-from django.conf.urls.static import static
+from portfolio.views.media_view import serve_media, serve_static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -35,7 +36,9 @@ urlpatterns = [
 ]
 
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    # Optionnel: servir aussi les fichiers statiques si nécessaire
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
+# Médias et fichiers statiques collectés: ETag, cache immuable pour les noms
+# dérivés du contenu, envoi délégué à nginx en production (X-Accel-Redirect)
+urlpatterns += [
+    re_path(r'^%s(?P<path>.+)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve_media, name='media'),
+    re_path(r'^%s(?P<path>.+)$' % re.escape(settings.STATIC_URL.lstrip('/')), serve_static, name='static'),
+]
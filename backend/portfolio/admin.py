@@ -7,6 +7,8 @@ from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils import timezone
 from django import forms
+from django.db import transaction
+from django.db.models import Count
 import os
 
 from .models import (
@@ -21,8 +23,13 @@ from .models import (
     Skill,
     SocialType,
     Project,
-    Service
+    Service,
+    OutboundEmail
 )
+from .authentication import forget_user
+from .signals import invalidate_user_cache
+from .search import reindex_documents
+from .contacts import refresh_unread_counts
 
 class CustomUserCreationForm(UserCreationForm):
     """Formulaire de création d'utilisateur personnalisé"""
@@ -84,7 +91,7 @@ class UserAdmin(BaseUserAdmin):
             'classes': ('collapse',)
         }),
         (_('Contact'), {
-            'fields': ('phone_number',),
+            'fields': ('phone_number', 'contact_digest'),
             'classes': ('collapse',)
         }),
         (_('Permissions'), {
@@ -161,27 +168,47 @@ class UserAdmin(BaseUserAdmin):
             readonly.extend(['profile_image_url', 'banner_url'])
         return readonly
     
+    def update_users(self, queryset, **values):
+        """
+        queryset.update() n'émet pas de signal et ne met pas à jour les champs
+        auto_now: updated_at (ETag/Last-Modified), le cache des réponses et le
+        cache d'authentification (is_active) sont mis à jour explicitement
+        Les autres processus voient le changement à l'expiration de leur cache
+        d'authentification (PORTFOLIO_AUTH_CACHE_TTL)
+        """
+        # Identifiants lus avant l'UPDATE (le queryset peut filtrer sur le champ modifié)
+        user_ids = list(queryset.values_list('pk', flat=True))
+        updated = queryset.update(updated_at=timezone.now(), **values)
+        for user_id in user_ids:
+            invalidate_user_cache(user_id)
+
+        def forget_users():
+            for user_id in user_ids:
+                forget_user(user_id)
+        transaction.on_commit(forget_users)
+        return updated
+
     def activate_users(self, request, queryset):
         """Action pour activer des utilisateurs"""
-        updated = queryset.update(is_active=True)
+        updated = self.update_users(queryset, is_active=True)
         self.message_user(request, f'{updated} utilisateur(s) activé(s).')
     activate_users.short_description = "Activer les utilisateurs sélectionnés"
     
     def deactivate_users(self, request, queryset):
         """Action pour désactiver des utilisateurs"""
-        updated = queryset.update(is_active=False)
+        updated = self.update_users(queryset, is_active=False)
         self.message_user(request, f'{updated} utilisateur(s) désactivé(s).')
     deactivate_users.short_description = "Désactiver les utilisateurs sélectionnés"
     
     def verify_users(self, request, queryset):
         """Action pour vérifier des utilisateurs"""
-        updated = queryset.update(is_verified=True)
+        updated = self.update_users(queryset, is_verified=True)
         self.message_user(request, f'{updated} utilisateur(s) vérifié(s).')
     verify_users.short_description = "Vérifier les utilisateurs sélectionnés"
     
     def unverify_users(self, request, queryset):
         """Action pour dévérifier des utilisateurs"""
-        updated = queryset.update(is_verified=False)
+        updated = self.update_users(queryset, is_verified=False)
         self.message_user(request, f'{updated} utilisateur(s) dévérifié(s).')
     unverify_users.short_description = "Dévérifier les utilisateurs sélectionnés"
 
@@ -189,6 +216,7 @@ class UserAdmin(BaseUserAdmin):
 @admin.register(Education)
 class EducationAdmin(admin.ModelAdmin):
     list_display = ('user', 'title', 'school', 'description_short', 'start_date', 'end_date', 'is_current')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'user__email', 'school', 'description', 'title')
     list_per_page = 20
     list_filter = ('start_date', 'end_date', 'school')
@@ -209,6 +237,7 @@ class EducationAdmin(admin.ModelAdmin):
 @admin.register(Experience)
 class ExperienceAdmin(admin.ModelAdmin):
     list_display = ('user', 'title', 'company', 'description_short', 'start_date', 'end_date', 'is_current')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'user__email', 'company', 'description', 'title')
     list_per_page = 20
     list_filter = ('start_date', 'end_date', 'company')
@@ -229,16 +258,12 @@ class ExperienceAdmin(admin.ModelAdmin):
 @admin.register(Social)
 class SocialAdmin(admin.ModelAdmin):
     list_display = ('user', 'social_type', 'social_type_logo_display', 'link_display', 'created_at_safe')
+    list_select_related = ('user', 'social_type')
     search_fields = ('user__username', 'user__email', 'social_type__label', 'link')
     list_per_page = 20
     list_filter = ('social_type',)  # Enlevé created_at du filtre
     # date_hierarchy = 'created_at'  # Commenté pour éviter l'erreur timezone
     
-    def get_queryset(self, request):
-        """Override queryset pour optimiser les requêtes"""
-        qs = super().get_queryset(request)
-        return qs.select_related('social_type', 'user')
-    
     def created_at_safe(self, obj):
         """Affichage sécurisé de la date de création"""
         try:
@@ -286,6 +311,7 @@ class SocialAdmin(admin.ModelAdmin):
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
     list_display = ('user', 'label', 'created_at_safe')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'user__email', 'label')
     list_per_page = 20
     list_filter = ('label',)  # Enlevé created_at du filtre
@@ -309,6 +335,7 @@ class SkillAdmin(admin.ModelAdmin):
 @admin.register(Service)
 class ServiceAdmin(admin.ModelAdmin):
     list_display = ('title', 'user', 'price_display', 'duration_display', 'is_active', 'icon_preview', 'tags_display', 'created_at_safe')
+    list_select_related = ('user',)
     search_fields = ('title', 'description', 'user__username', 'user__email')
     list_per_page = 20
     list_filter = ('is_active', 'user')
@@ -394,27 +421,34 @@ class ServiceAdmin(admin.ModelAdmin):
     
     def activate_services(self, request, queryset):
         """Action pour activer les services"""
-        updated = queryset.update(is_active=True)
+        updated = queryset.update(is_active=True, updated_at=timezone.now())
+        for user_id in queryset.values_list('user_id', flat=True).distinct():
+            invalidate_user_cache(user_id)
+        reindex_documents(queryset)
         self.message_user(request, f'{updated} service(s) activé(s).')
     activate_services.short_description = "Activer les services sélectionnés"
     
     def deactivate_services(self, request, queryset):
         """Action pour désactiver les services"""
-        updated = queryset.update(is_active=False)
+        updated = queryset.update(is_active=False, updated_at=timezone.now())
+        for user_id in queryset.values_list('user_id', flat=True).distinct():
+            invalidate_user_cache(user_id)
+        reindex_documents(queryset)
         self.message_user(request, f'{updated} service(s) désactivé(s).')
     deactivate_services.short_description = "Désactiver les services sélectionnés"
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
     list_display = ('title', 'user', 'image_preview', 'technologies_display', 'created_at_safe')
+    list_select_related = ('user',)
     search_fields = ('title', 'description', 'user__username', 'user__email')
     list_per_page = 20
-    list_filter = ('user',)
+    list_filter = ('status', 'user')
     ordering = ['-created_at']
     
     fieldsets = (
         ('Informations de base', {
-            'fields': ('user', 'title', 'description')
+            'fields': ('user', 'title', 'description', 'status')
         }),
         ('Image', {
             'fields': ('image', 'image_url'),
@@ -511,6 +545,7 @@ class ProjectAdmin(admin.ModelAdmin):
 @admin.register(Settings)
 class SettingsAdmin(admin.ModelAdmin):
     list_display = ('user', 'color', 'color_preview', 'created_at_safe')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'user__email')
     list_per_page = 20
     list_filter = ()  # Enlevé created_at du filtre
@@ -544,6 +579,7 @@ class SettingsAdmin(admin.ModelAdmin):
 @admin.register(Contact)
 class ContactAdmin(admin.ModelAdmin):
     list_display = ('user', 'name', 'email', 'message_short', 'read', 'read_status', 'created_at_safe')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'user__email', 'name', 'email', 'message')
     list_per_page = 20
     list_filter = ('read',)  # Enlevé created_at du filtre
@@ -580,13 +616,19 @@ class ContactAdmin(admin.ModelAdmin):
     
     def mark_as_read(self, request, queryset):
         """Action pour marquer comme lu"""
-        updated = queryset.update(read=True)
+        # Destinataires lus avant l'UPDATE (le queryset peut filtrer sur read)
+        user_ids = list(queryset.values_list('user_id', flat=True).distinct())
+        updated = queryset.update(read=True, updated_at=timezone.now())
+        refresh_unread_counts(user_ids)
         self.message_user(request, f'{updated} message(s) marqué(s) comme lu(s).')
     mark_as_read.short_description = "Marquer comme lu"
     
     def mark_as_unread(self, request, queryset):
         """Action pour marquer comme non lu"""
-        updated = queryset.update(read=False)
+        # Destinataires lus avant l'UPDATE (le queryset peut filtrer sur read)
+        user_ids = list(queryset.values_list('user_id', flat=True).distinct())
+        updated = queryset.update(read=False, updated_at=timezone.now())
+        refresh_unread_counts(user_ids)
         self.message_user(request, f'{updated} message(s) marqué(s) comme non lu(s).')
     mark_as_unread.short_description = "Marquer comme non lu"
 
@@ -596,6 +638,10 @@ class CategoryAdmin(admin.ModelAdmin):
     list_display = ('name', 'articles_count', 'created_at_safe')
     search_fields = ('name',)
     list_per_page = 20
+
+    def get_queryset(self, request):
+        """Nombre d'articles calculé dans la requête de la liste (pas de COUNT par ligne)"""
+        return super().get_queryset(request).annotate(articles_total=Count('article'))
     
     def created_at_safe(self, obj):
         """Affichage sécurisé de la date de création"""
@@ -613,14 +659,16 @@ class CategoryAdmin(admin.ModelAdmin):
     created_at_safe.admin_order_field = 'created_at'
     
     def articles_count(self, obj):
-        """Compte le nombre d'articles dans cette catégorie"""
-        return obj.articles.count()
+        """Nombre d'articles dans cette catégorie (annoté par get_queryset)"""
+        return obj.articles_total
     articles_count.short_description = "Nombre d'articles"
+    articles_count.admin_order_field = 'articles_total'
 
 
 @admin.register(Article)
 class ArticleAdmin(admin.ModelAdmin):
     list_display = ('title', 'user', 'category', 'content_short', 'coverage_image_preview', 'is_published', 'created_at_safe')
+    list_select_related = ('user', 'category')
     search_fields = ('title', 'content', 'category__name', 'user__username')
     list_per_page = 20
     list_filter = ('is_published', 'category', 'user')  # Enlevé created_at du filtre
@@ -660,13 +708,15 @@ class ArticleAdmin(admin.ModelAdmin):
     
     def publish_articles(self, request, queryset):
         """Action pour publier des articles"""
-        updated = queryset.update(is_published=True)
+        updated = queryset.update(is_published=True, updated_at=timezone.now())
+        reindex_documents(queryset)
         self.message_user(request, f'{updated} article(s) publié(s).')
     publish_articles.short_description = "Publier les articles sélectionnés"
     
     def unpublish_articles(self, request, queryset):
         """Action pour dépublier des articles"""
-        updated = queryset.update(is_published=False)
+        updated = queryset.update(is_published=False, updated_at=timezone.now())
+        reindex_documents(queryset)
         self.message_user(request, f'{updated} article(s) dépublié(s).')
     unpublish_articles.short_description = "Dépublier les articles sélectionnés"
 
@@ -676,6 +726,10 @@ class SocialTypeAdmin(admin.ModelAdmin):
     list_display = ('label', 'logo_preview', 'logo_url_display', 'socials_count', 'created_at_safe')
     search_fields = ('label',)
     list_per_page = 20
+
+    def get_queryset(self, request):
+        """Nombre d'utilisations calculé dans la requête de la liste (pas de COUNT par ligne)"""
+        return super().get_queryset(request).annotate(socials_total=Count('social'))
     readonly_fields = ('logo_url', 'created_at_safe', 'updated_at_safe')
     
     fieldsets = (
@@ -751,9 +805,10 @@ class SocialTypeAdmin(admin.ModelAdmin):
     logo_url_display.short_description = "URL du logo"
     
     def socials_count(self, obj):
-        """Compte le nombre de réseaux sociaux utilisant ce type"""
-        return obj.social_set.count()
+        """Nombre de réseaux sociaux utilisant ce type (annoté par get_queryset)"""
+        return obj.socials_total
     socials_count.short_description = "Utilisations"
+    socials_count.admin_order_field = 'socials_total'
     
     def save_model(self, request, obj, form, change):
         """Override pour afficher un message personnalisé"""
@@ -766,6 +821,31 @@ class SocialTypeAdmin(admin.ModelAdmin):
             )
 
 
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipients_display', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    search_fields = ('subject', 'recipients')
+    list_filter = ('status',)
+    list_per_page = 50
+    # Pas de corps: il peut contenir un lien de réinitialisation de mot de passe valide
+    exclude = ('body',)
+    readonly_fields = ('subject', 'from_email', 'recipients', 'attempts', 'last_error', 'sent_at', 'created_at', 'updated_at')
+    actions = ['retry_now']
+
+    def recipients_display(self, obj):
+        return ', '.join(obj.recipients)
+    recipients_display.short_description = "Destinataires"
+
+    def retry_now(self, request, queryset):
+        """Remet les messages en file pour le prochain passage de send_outbox"""
+        # Un message dont le corps a été effacé (lien expiré) n'est plus envoyé
+        updated = queryset.exclude(status=OutboundEmail.STATUS_SENT).exclude(body='').update(
+            status=OutboundEmail.STATUS_PENDING, attempts=0, next_attempt_at=timezone.now(), updated_at=timezone.now()
+        )
+        self.message_user(request, f'{updated} email(s) remis en file.')
+    retry_now.short_description = "Renvoyer maintenant"
+
+
 # Configuration optionnelle : personnaliser l'en-tête de l'admin
 admin.site.site_header = "Administration Portfolio"
 admin.site.site_title = "Portfolio Admin"
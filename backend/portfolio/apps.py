@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class PortfolioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'portfolio'
+
+    def ready(self):
+        # Enregistrement des signaux (invalidation du cache, index de recherche, tags)
+        from . import signals  # noqa: F401
+        # Vérifications de configuration (cache partagé...)
+        from . import checks  # noqa: F401
+        # Purge périodique des jetons expirés dans le processus (si PORTFOLIO_TOKEN_HOUSEKEEPING_INTERVAL)
+        from .housekeeping import start_scheduler
+        start_scheduler()
@@ -0,0 +1,85 @@
+"""
+Authentification JWT sans lecture de la ligne utilisateur
+
+JWTAuthentication charge toute la ligne User (adresse, images, variantes...)
+à chaque requête. CachedJWTAuthentication garde en mémoire du processus, pour
+une courte durée (PORTFOLIO_AUTH_CACHE_TTL), les seuls champs nécessaires à
+l'authentification et aux permissions (id, is_active, is_staff, is_superuser)
+et renvoie une instance User partielle: les autres champs sont chargés, en une
+seule requête, la première fois qu'une vue les lit (voir User.refresh_from_db).
+L'entrée d'un utilisateur est effacée quand il est sauvegardé ou supprimé; une
+modification faite par un autre processus ou par queryset.update() est prise
+en compte au plus tard à l'expiration de l'entrée.
+"""
+
+import time
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .models import User
+
+# Dans l'ordre des champs du modèle, attendu par Model.from_db()
+AUTH_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname in ('id', 'is_active', 'is_staff', 'is_superuser')
+)
+DEFAULT_AUTH_CACHE_TTL = 30
+# Au-delà, le cache est vidé (borne la mémoire du processus)
+MAX_CACHED_USERS = 10000
+
+# {user_id: (expiration, valeurs de AUTH_FIELDS)}
+_auth_cache = {}
+
+
+def auth_cache_ttl():
+    return getattr(settings, 'PORTFOLIO_AUTH_CACHE_TTL', DEFAULT_AUTH_CACHE_TTL)
+
+
+def forget_user(user_id):
+    """Efface l'entrée d'un utilisateur (appelé après sa sauvegarde ou sa suppression)"""
+    _auth_cache.pop(user_id, None)
+
+
+def clear_auth_cache():
+    _auth_cache.clear()
+
+
+def get_auth_values(user_id):
+    """Valeurs de AUTH_FIELDS d'un utilisateur (cache du processus), None s'il n'existe pas"""
+    now = time.monotonic()
+    entry = _auth_cache.get(user_id)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    values = User.objects.filter(pk=user_id).values_list(*AUTH_FIELDS).first()
+    if values is None:
+        return None
+    if len(_auth_cache) >= MAX_CACHED_USERS:
+        _auth_cache.clear()
+    _auth_cache[user_id] = (now + auth_cache_ttl(), values)
+    return values
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication dont l'utilisateur est une instance partielle, sans requête si déjà en cache"""
+
+    def get_user(self, validated_token):
+        # La révocation par mot de passe a besoin de la ligne complète
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_FIELD != 'id':
+            return super().get_user(validated_token)
+
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        values = get_auth_values(user_id)
+        if values is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        user = User.from_db(User.objects.db, AUTH_FIELDS, values)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,132 @@
+"""
+Cache versionné des réponses publiques par utilisateur
+
+Chaque utilisateur possède un compteur de version stocké dans le cache.
+Les réponses sont stockées sous la clé (user_id, section, version): incrémenter
+le compteur rend toutes les entrées de l'utilisateur obsolètes sans avoir à les
+supprimer une par une.
+Le compteur doit être partagé par tous les processus (Redis, Memcached): avec un
+cache local au processus (LocMemCache), une modification n'invaliderait que les
+entrées du processus qui l'a traitée. Dans ce cas le cache des réponses est
+désactivé, sauf si PORTFOLIO_CACHE_ALLOW_LOCAL (développement, un seul processus).
+"""
+
+import hashlib
+import time
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+# Backends dont le contenu n'est pas partagé entre processus
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+# Paramètres de requête faisant varier une section (pagination)
+VARY_PARAMS = ('cursor', 'offset', 'page_size')
+
+def _version_key(user_id):
+    return f"portfolio:user:{user_id}:version"
+
+
+def is_process_local_cache(alias='default'):
+    return isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
+
+
+def response_cache_enabled():
+    return getattr(settings, 'PORTFOLIO_CACHE_ALLOW_LOCAL', False) or not is_process_local_cache()
+
+
+def _section_key(user_id, section, version, request):
+    """
+    Clé d'une section: la réponse contient des URLs absolues (images, liens
+    next/previous), l'origine (schéma + hôte) en fait partie, ainsi que les
+    seuls paramètres de pagination (VARY_PARAMS): des paramètres arbitraires
+    ne créent pas de nouvelles entrées
+    """
+    key = f"portfolio:user:{user_id}:{section}:v{version}"
+    if request is not None:
+        params = urlencode([(name, request.GET.get(name, '')) for name in VARY_PARAMS])
+        variant = request.build_absolute_uri('/') + '?' + params
+        key += ":" + hashlib.md5(variant.encode()).hexdigest()
+    return key
+
+
+def _new_version():
+    """
+    Version initiale basée sur l'horloge: si le compteur est évincé du cache,
+    il ne repart jamais sur une valeur déjà utilisée par d'anciennes entrées
+    """
+    return int(time.time() * 1000)
+
+
+def get_user_cache_version(user_id):
+    """Retourne la version courante du cache d'un utilisateur"""
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = _new_version()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_user_cache_version(user_id):
+    """Invalide toutes les réponses en cache d'un utilisateur"""
+    key = _version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), timeout=None)
+
+
+def cached_user_section(user_id, section, builder, request=None):
+    """
+    Retourne les données d'une section publique d'un utilisateur depuis le cache,
+    ou les construit avec builder() et les stocke pour les lectures suivantes
+    request: requête dont l'origine et les paramètres (curseur de pagination...)
+    font varier la réponse
+    """
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return builder()
+    if not response_cache_enabled():
+        return builder()
+
+    key = _section_key(user_id, section, get_user_cache_version(user_id), request)
+    data = cache.get(key)
+    if data is None:
+        data = builder()
+        cache.set(key, data, getattr(settings, 'PORTFOLIO_CACHE_TIMEOUT', 3600))
+    return data
+
+
+async def aget_user_cache_version(user_id):
+    """Version asynchrone de get_user_cache_version (vues ASGI)"""
+    key = _version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = _new_version()
+        if not await cache.aadd(key, version, timeout=None):
+            version = await cache.aget(key, version)
+    return version
+
+
+async def acached_user_section(user_id, section, builder, request=None):
+    """
+    Version asynchrone de cached_user_section: builder est une coroutine
+    Les entrées sont partagées avec les vues synchrones pour une même section
+    """
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return await builder()
+    if not response_cache_enabled():
+        return await builder()
+
+    key = _section_key(user_id, section, await aget_user_cache_version(user_id), request)
+    data = await cache.aget(key)
+    if data is None:
+        data = await builder()
+        await cache.aset(key, data, getattr(settings, 'PORTFOLIO_CACHE_TIMEOUT', 3600))
+    return data
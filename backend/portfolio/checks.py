@@ -0,0 +1,37 @@
+"""
+Vérifications de configuration (manage.py check, lancées aussi au démarrage)
+"""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+from .cache import is_process_local_cache
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Le cache des réponses a besoin d'un cache partagé entre processus"""
+    if getattr(settings, 'PORTFOLIO_CACHE_ALLOW_LOCAL', False) or not is_process_local_cache():
+        return []
+    return [Warning(
+        "Le cache 'default' est local au processus: le cache des réponses publiques est désactivé.",
+        hint="Configurez un cache partagé (Redis, Memcached) dans CACHES, "
+             "ou PORTFOLIO_CACHE_ALLOW_LOCAL = True pour un seul processus.",
+        id='portfolio.W001',
+    )]
+
+
+@register(Tags.caches)
+def check_throttle_cache(app_configs, **kwargs):
+    """Les seaux de CacheBucketStore doivent être partagés entre processus"""
+    store = getattr(settings, 'PORTFOLIO_THROTTLE_STORE', 'portfolio.throttling.CacheBucketStore')
+    alias = getattr(settings, 'PORTFOLIO_THROTTLE_CACHE', 'default')
+    if (store != 'portfolio.throttling.CacheBucketStore'
+            or getattr(settings, 'PORTFOLIO_CACHE_ALLOW_LOCAL', False) or not is_process_local_cache(alias)):
+        return []
+    return [Warning(
+        f"Le cache '{alias}' des limites de débit est local au processus: "
+        "chaque worker a ses propres seaux, la limite est multipliée par le nombre de workers.",
+        hint="Configurez un cache partagé (Redis, Memcached) pour PORTFOLIO_THROTTLE_CACHE, "
+             "ou PORTFOLIO_THROTTLE_STORE = 'portfolio.throttling.RedisBucketStore'.",
+        id='portfolio.W002',
+    )]
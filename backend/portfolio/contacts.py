@@ -0,0 +1,110 @@
+"""
+Messages de contact: compteur de non lus et résumés par email
+
+User.unread_contacts_count est incrémenté à la création d'un message non lu
+et recalculé (un UPDATE avec sous-requête) quand le statut de lecture change
+ou qu'un message est supprimé: connaître le nombre de nouveaux messages ne
+coûte qu'une lecture de la ligne utilisateur.
+Les propriétaires qui l'ont choisi reçoivent un résumé périodique des messages
+non lus, généré par la commande send_contact_digests et envoyé via l'outbox.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .models import User, Contact, OutboundEmail
+
+DIGEST_PERIODS = {
+    User.DIGEST_DAILY: timedelta(days=1),
+    User.DIGEST_WEEKLY: timedelta(days=7),
+}
+# Messages détaillés dans un résumé (les suivants sont seulement comptés)
+DIGEST_MAX_MESSAGES = 20
+EXCERPT_LENGTH = 120
+
+
+def increment_unread_count(user_id):
+    User.objects.filter(pk=user_id).update(unread_contacts_count=F('unread_contacts_count') + 1)
+
+
+def refresh_unread_counts(user_ids):
+    """Recalcule le compteur de messages non lus des utilisateurs donnés"""
+    unread = (
+        Contact.objects.filter(user=OuterRef('pk'), read=False)
+        .order_by()
+        .values('user')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    User.objects.filter(pk__in=set(user_ids)).update(
+        unread_contacts_count=Coalesce(Subquery(unread, output_field=IntegerField()), 0)
+    )
+
+
+def digest_due_users(now):
+    """Utilisateurs abonnés dont le dernier résumé date d'au moins une période"""
+    due = Q()
+    for frequency, period in DIGEST_PERIODS.items():
+        due |= Q(contact_digest=frequency) & (
+            Q(contact_digest_sent_at__isnull=True) | Q(contact_digest_sent_at__lte=now - period)
+        )
+    return User.objects.filter(due).only(
+        'id', 'email', 'username', 'contact_digest', 'contact_digest_sent_at', 'unread_contacts_count'
+    )
+
+
+def build_digest(user, contacts):
+    """Sujet et corps du résumé d'un utilisateur"""
+    count = len(contacts)
+    lines = [f"Bonjour {user.username},", "", f"Vous avez {count} nouveau(x) message(s) non lu(s):", ""]
+    for contact in contacts[:DIGEST_MAX_MESSAGES]:
+        message = ' '.join(contact.message.split())
+        if len(message) > EXCERPT_LENGTH:
+            message = message[:EXCERPT_LENGTH] + '…'
+        lines.append(f"- {contact.name} <{contact.email}> le {timezone.localtime(contact.created_at):%d/%m/%Y %H:%M}: {message}")
+    if count > DIGEST_MAX_MESSAGES:
+        lines.append(f"… et {count - DIGEST_MAX_MESSAGES} autre(s) message(s)")
+    return f"{count} nouveau(x) message(s) sur votre portfolio", '\n'.join(lines)
+
+
+def send_contact_digests(now=None):
+    """
+    Met en file (outbox) le résumé des utilisateurs dont l'envoi est dû
+    Seuls les messages non lus reçus depuis le résumé précédent sont repris,
+    en une requête pour tous les utilisateurs
+    Retourne le nombre de résumés mis en file
+    """
+    now = now or timezone.now()
+    users = list(digest_due_users(now))
+    if not users:
+        return 0
+
+    # Sans résumé précédent: messages de la dernière période
+    since = {
+        user.pk: user.contact_digest_sent_at or now - DIGEST_PERIODS[user.contact_digest]
+        for user in users
+    }
+    # Les utilisateurs sans message non lu sont écartés sans requête
+    candidates = [user for user in users if user.unread_contacts_count]
+    contacts_by_user = {user.pk: [] for user in candidates}
+    if candidates:
+        contacts = Contact.objects.filter(
+            user_id__in=contacts_by_user, read=False, created_at__gt=min(since[pk] for pk in contacts_by_user),
+        ).order_by('-created_at').only('user_id', 'name', 'email', 'message', 'created_at')
+        for contact in contacts:
+            if contact.created_at > since[contact.user_id]:
+                contacts_by_user[contact.user_id].append(contact)
+
+    emails = []
+    for user in candidates:
+        if contacts_by_user[user.pk]:
+            subject, body = build_digest(user, contacts_by_user[user.pk])
+            emails.append(OutboundEmail(
+                subject=subject, body=body, recipients=[user.email], from_email=settings.DEFAULT_FROM_EMAIL
+            ))
+    OutboundEmail.objects.bulk_create(emails)
+    # Les utilisateurs sans nouveau message attendent aussi une période complète
+    User.objects.filter(pk__in=[user.pk for user in users]).update(contact_digest_sent_at=now)
+    return len(emails)
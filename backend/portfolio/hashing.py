@@ -0,0 +1,174 @@
+"""
+Hachage des mots de passe hors du thread de requête
+
+Vérifier ou calculer un hash (PBKDF2, scrypt, Argon2) occupe un cœur pendant
+des dizaines de millisecondes. User.check_password() et User.set_password()
+passent par ce module: le calcul est exécuté dans un pool de
+PORTFOLIO_HASHING_WORKERS threads (hashlib et argon2 libèrent le GIL), ce qui
+fixe explicitement le nombre de cœurs consacrés à l'authentification. Au plus
+PORTFOLIO_HASHING_QUEUE_SIZE calculs attendent une place; au-delà, la requête
+est refusée (503, Retry-After) après PORTFOLIO_HASHING_ADMISSION_TIMEOUT
+secondes au lieu d'occuper un worker.
+
+Le premier hasher de PASSWORD_HASHERS est celui des nouveaux hashes; un hash
+d'un autre algorithme, ou d'un coût différent de PORTFOLIO_PASSWORD_HASHER_COST,
+est recalculé à la connexion réussie suivante.
+Les durées (attente et calcul) sont ajoutées à Server-Timing ('hash') et
+agrégées par processus (hashing_stats()).
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework.exceptions import APIException
+from .metrics import PERCENTILES, current_metrics, percentile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_ADMISSION_TIMEOUT = 2.0
+# Nombre de mesures conservées pour les percentiles
+STATS_WINDOW = 1000
+
+
+class HashingOverloaded(APIException):
+    status_code = 503
+    default_detail = "Service d'authentification surchargé, réessayez dans quelques instants."
+    default_code = 'hashing_overloaded'
+    # Retry-After (secondes), ajouté par le gestionnaire d'exceptions DRF
+    wait = 1
+
+
+def hasher_cost(algorithm, name, default):
+    return getattr(settings, 'PORTFOLIO_PASSWORD_HASHER_COST', {}).get(algorithm, {}).get(name, default)
+
+
+class TunedScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    work_factor = property(lambda self: hasher_cost('scrypt', 'work_factor', hashers.ScryptPasswordHasher.work_factor))
+
+
+class TunedArgon2PasswordHasher(hashers.Argon2PasswordHasher):
+    time_cost = property(lambda self: hasher_cost('argon2', 'time_cost', hashers.Argon2PasswordHasher.time_cost))
+    memory_cost = property(lambda self: hasher_cost('argon2', 'memory_cost', hashers.Argon2PasswordHasher.memory_cost))
+    parallelism = property(lambda self: hasher_cost('argon2', 'parallelism', hashers.Argon2PasswordHasher.parallelism))
+
+
+class TunedPBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    iterations = property(lambda self: hasher_cost('pbkdf2_sha256', 'iterations', hashers.PBKDF2PasswordHasher.iterations))
+
+
+class HashingStats:
+    """Compteurs et durées récentes du processus (millisecondes)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.completed = 0
+            self.rejected = 0
+            self.wait_ms = deque(maxlen=STATS_WINDOW)
+            self.hash_ms = deque(maxlen=STATS_WINDOW)
+
+    def record(self, wait, duration):
+        with self.lock:
+            self.completed += 1
+            self.wait_ms.append(round(wait * 1000, 3))
+            self.hash_ms.append(round(duration * 1000, 3))
+
+    def record_rejected(self):
+        with self.lock:
+            self.rejected += 1
+
+    def summary(self):
+        """{completed, rejected, wait_ms: {p50, p95, p99}, hash_ms: {...}}"""
+        with self.lock:
+            wait_ms, hash_ms = list(self.wait_ms), list(self.hash_ms)
+            summary = {'completed': self.completed, 'rejected': self.rejected}
+        summary['wait_ms'] = {f'p{p}': percentile(wait_ms, p) for p in PERCENTILES}
+        summary['hash_ms'] = {f'p{p}': percentile(hash_ms, p) for p in PERCENTILES}
+        return summary
+
+
+stats = HashingStats()
+
+_executor = None
+_slots = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Pool de threads et sémaphore d'admission (créés au premier hachage)"""
+    global _executor, _slots
+    with _pool_lock:
+        if _executor is None:
+            workers = getattr(settings, 'PORTFOLIO_HASHING_WORKERS', DEFAULT_WORKERS)
+            queue_size = getattr(settings, 'PORTFOLIO_HASHING_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+            _slots = threading.BoundedSemaphore(workers + queue_size)
+    return _executor, _slots
+
+
+def hashing_stats():
+    return stats.summary()
+
+
+def run_hashing(function, *args):
+    """Exécute function(*args) dans le pool et attend son résultat"""
+    executor, slots = get_pool()
+    timeout = getattr(settings, 'PORTFOLIO_HASHING_ADMISSION_TIMEOUT', DEFAULT_ADMISSION_TIMEOUT)
+    if not slots.acquire(timeout=timeout):
+        stats.record_rejected()
+        logger.warning("Pool de hachage saturé: requête refusée")
+        raise HashingOverloaded()
+
+    submitted = time.perf_counter()
+    timings = {}
+
+    def timed():
+        timings['started'] = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            timings['finished'] = time.perf_counter()
+
+    try:
+        result = executor.submit(timed).result()
+    finally:
+        slots.release()
+
+    wait = timings['started'] - submitted
+    duration = timings['finished'] - timings['started']
+    stats.record(wait, duration)
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.hash_time += wait + duration
+    return result
+
+
+def make_password(password):
+    """hashers.make_password() calculé dans le pool (sauf mot de passe inutilisable)"""
+    if password is None:
+        return hashers.make_password(None)
+    return run_hashing(hashers.make_password, password)
+
+
+def check_password(password, encoded, setter=None):
+    """
+    hashers.check_password() vérifié dans le pool
+    setter(password) est appelé dans le thread courant (il sauvegarde la ligne)
+    quand le hash doit être recalculé avec le hasher ou le coût préféré
+    """
+    is_correct = run_hashing(hashers.check_password, password, encoded)
+    if setter and is_correct:
+        preferred = hashers.get_hasher('default')
+        hasher = hashers.identify_hasher(encoded)
+        if hasher.algorithm != preferred.algorithm or preferred.must_update(encoded):
+            setter(password)
+    return is_correct
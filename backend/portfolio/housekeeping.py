@@ -0,0 +1,109 @@
+"""
+Nettoyage des jetons expirés
+
+Avec ROTATE_REFRESH_TOKENS et BLACKLIST_AFTER_ROTATION, chaque rafraîchissement
+ajoute une ligne OutstandingToken et une ligne BlacklistedToken; les jetons de
+réinitialisation de mot de passe ne sont supprimés qu'à la demande suivante du
+même utilisateur. purge_expired_tokens() supprime les lignes expirées par lots
+bornés (index sur OutstandingToken.expires_at et PasswordResetToken.created_at):
+les tables restent à la taille des jetons encore valides. Le corps des emails
+envoyés ou en échec depuis plus longtemps (lien de réinitialisation) est effacé.
+Lancé par la commande purge_expired_tokens, ou par un thread du processus si
+PORTFOLIO_TOKEN_HOUSEKEEPING_INTERVAL est défini (voir start_scheduler()).
+"""
+
+import logging
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from .models import OutboundEmail, PasswordResetToken
+
+logger = logging.getLogger(__name__)
+
+# Durée de validité d'un lien de réinitialisation de mot de passe
+PASSWORD_RESET_TOKEN_LIFETIME = timedelta(hours=24)
+DEFAULT_BATCH_SIZE = 1000
+
+_scheduler = None
+
+
+def delete_in_batches(queryset, batch_size):
+    """
+    Supprime les lignes d'un queryset par lots de batch_size (transactions courtes)
+    Retourne {label du modèle: lignes supprimées}, cascades comprises
+    """
+    deleted = {}
+    while True:
+        pks = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        _, per_model = queryset.model.objects.filter(pk__in=pks).delete()
+        for label, count in per_model.items():
+            deleted[label] = deleted.get(label, 0) + count
+        if len(pks) < batch_size:
+            return deleted
+
+
+def purge_expired_tokens(now=None, batch_size=None):
+    """
+    Supprime les refresh tokens expirés (et leur entrée de liste noire) et les
+    jetons de réinitialisation expirés, efface le corps des emails qui ne seront
+    plus envoyés
+    Retourne le nombre de lignes supprimées (ou effacées) par table
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or getattr(settings, 'PORTFOLIO_TOKEN_HOUSEKEEPING_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+
+    # Un jeton expiré est refusé par simplejwt avant toute consultation de la liste noire
+    deleted = delete_in_batches(OutstandingToken.objects.filter(expires_at__lt=now), batch_size)
+    deleted.update(delete_in_batches(
+        PasswordResetToken.objects.filter(created_at__lt=now - PASSWORD_RESET_TOKEN_LIFETIME), batch_size
+    ))
+    # Un message en échec garde son corps pour "Renvoyer maintenant" tant que son lien est valide
+    blanked = OutboundEmail.objects.filter(
+        status__in=[OutboundEmail.STATUS_SENT, OutboundEmail.STATUS_FAILED],
+        created_at__lt=now - PASSWORD_RESET_TOKEN_LIFETIME,
+    ).exclude(body='').update(body='', updated_at=now)
+    purged = {
+        'outstanding_tokens': deleted.get(OutstandingToken._meta.label, 0),
+        'blacklisted_tokens': deleted.get(BlacklistedToken._meta.label, 0),
+        'password_reset_tokens': deleted.get(PasswordResetToken._meta.label, 0),
+        'email_bodies': blanked,
+    }
+    logger.info(
+        "Jetons purgés: outstanding=%(outstanding_tokens)d blacklisted=%(blacklisted_tokens)d "
+        "password_reset=%(password_reset_tokens)d email_bodies=%(email_bodies)d", purged
+    )
+    return purged
+
+
+def _run_scheduler(interval, stop_event):
+    while not stop_event.wait(interval):
+        try:
+            purge_expired_tokens()
+        except Exception:
+            logger.exception("Échec du nettoyage des jetons")
+        finally:
+            close_old_connections()
+
+
+def start_scheduler(interval=None):
+    """
+    Démarre (une fois par processus) un thread qui purge les jetons toutes les
+    `interval` secondes. Les suppressions étant idempotentes, plusieurs workers
+    peuvent le faire tourner sans coordination
+    """
+    global _scheduler
+    interval = interval or getattr(settings, 'PORTFOLIO_TOKEN_HOUSEKEEPING_INTERVAL', None)
+    if not interval or _scheduler is not None:
+        return None
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=_run_scheduler, args=(interval, stop_event), name='token-housekeeping', daemon=True
+    )
+    thread.start()
+    _scheduler = (thread, stop_event)
+    return stop_event
@@ -0,0 +1,157 @@
+"""
+Pipeline de traitement des images uploadées
+
+Après l'upload, les variantes redimensionnées (thumb/medium/full) sont générées
+en WebP et dans le format d'origine par un pool de threads, hors du thread de
+la requête. Les noms des fichiers générés sont stockés dans un JSONField du
+modèle, au format {variante: {format: nom_du_fichier}}.
+Les fichiers remplacés ne sont pas supprimés ici (ils peuvent être partagés
+avec d'autres lignes): voir portfolio.media et la commande sweep_media.
+"""
+
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VARIANT_SIZES = {'thumb': 160, 'medium': 640, 'full': 1600}
+DEFAULT_VARIANT_FORMATS = ['webp', 'original']
+
+# Formats Pillow conservés tels quels pour la variante 'original'
+ORIGINAL_FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+
+_executor = None
+
+
+def get_executor():
+    """Pool de threads partagé, créé au premier upload"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'IMAGE_PROCESSING_WORKERS', 2),
+            thread_name_prefix='image-processing',
+        )
+    return _executor
+
+
+def _variant_formats(source_format):
+    """Liste des couples (format Pillow, extension) à générer pour une image source"""
+    formats = []
+    for name in getattr(settings, 'IMAGE_VARIANT_FORMATS', DEFAULT_VARIANT_FORMATS):
+        if name == 'original':
+            # Les GIF et autres formats sont convertis en PNG
+            target = source_format if source_format in ORIGINAL_FORMATS else 'PNG'
+            fmt = (target, ORIGINAL_FORMATS[target])
+        elif name == 'avif' and not features.check('avif'):
+            continue
+        else:
+            fmt = (name.upper(), name)
+        if fmt not in formats:
+            formats.append(fmt)
+    return formats
+
+
+def _encode(image, image_format):
+    """Encode une image Pillow et retourne le contenu binaire"""
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    elif image.mode not in ('RGB', 'RGBA', 'L'):
+        image = image.convert('RGBA')
+
+    buffer = io.BytesIO()
+    options = {'optimize': True} if image_format in ('JPEG', 'PNG') else {}
+    if image_format in ('JPEG', 'WEBP', 'AVIF'):
+        options['quality'] = 82
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def generate_image_variants(file_field):
+    """
+    Génère les variantes redimensionnées d'un fichier image
+    Retourne {variante: {extension: nom_du_fichier}}
+    """
+    storage = file_field.storage
+    base, _ = os.path.splitext(file_field.name)
+    directory, stem = os.path.split(base)
+    sizes = getattr(settings, 'IMAGE_VARIANT_SIZES', DEFAULT_VARIANT_SIZES)
+
+    variants = {}
+    with file_field.open('rb'), Image.open(file_field) as source:
+        formats = _variant_formats(source.format)
+        image = ImageOps.exif_transpose(source)
+        for variant, max_size in sizes.items():
+            resized = image.copy()
+            resized.thumbnail((max_size, max_size), Image.LANCZOS)
+            variants[variant] = {}
+            for image_format, extension in formats:
+                name = os.path.join(directory, 'variants', f"{stem}_{variant}.{extension}")
+                saved_name = storage.save(name, ContentFile(_encode(resized, image_format)))
+                variants[variant][extension] = saved_name
+    return variants
+
+
+def build_variant_urls(variants):
+    """Convertit les noms de fichiers des variantes en URLs complètes"""
+    site_url = getattr(settings, 'SITE_URL', '')
+    return {
+        variant: {extension: f"{site_url}{default_storage.url(name)}" for extension, name in formats.items()}
+        for variant, formats in (variants or {}).items()
+    }
+
+
+def process_image_variants(model, pk, field_name, variants_field, source_name):
+    """
+    Tâche exécutée dans le pool: génère les variantes puis les enregistre sur
+    l'instance si l'image n'a pas été remplacée entre temps
+    """
+    try:
+        instance = model.objects.filter(pk=pk).first()
+        if instance is None or getattr(instance, field_name).name != source_name:
+            return
+
+        try:
+            variants = generate_image_variants(getattr(instance, field_name))
+        except (OSError, Image.DecompressionBombError) as e:
+            logger.warning("Variantes non générées pour %s: %s", source_name, e)
+            return
+
+        with transaction.atomic():
+            instance = model.objects.select_for_update().filter(pk=pk).first()
+            if instance is None or getattr(instance, field_name).name != source_name:
+                return
+            setattr(instance, variants_field, variants)
+            instance.save(update_fields=[variants_field, 'updated_at'])
+    except Exception:
+        logger.exception("Erreur lors du traitement de l'image %s", source_name)
+
+
+def _run_in_worker(func, *args):
+    """Exécute une tâche du pool puis libère la connexion DB du thread"""
+    try:
+        func(*args)
+    finally:
+        connection.close()
+
+
+def schedule_image_variants(instance, field_name, variants_field):
+    """
+    Planifie la génération des variantes après la validation de la transaction
+    A appeler après super().save(), une fois le fichier écrit sur le stockage
+    """
+    args = (type(instance), instance.pk, field_name, variants_field, getattr(instance, field_name).name)
+
+    def submit():
+        if getattr(settings, 'IMAGE_PROCESSING_ASYNC', True):
+            get_executor().submit(_run_in_worker, process_image_variants, *args)
+        else:
+            process_image_variants(*args)
+
+    transaction.on_commit(submit)
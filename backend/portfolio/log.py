@@ -0,0 +1,156 @@
+"""
+Journalisation de l'application portfolio
+
+- RequestIdMiddleware attribue un identifiant à chaque requête (en-tête
+  X-Request-ID repris ou généré) et le renvoie dans la réponse
+- RequestIdFilter ajoute cet identifiant à chaque enregistrement (%(request_id)s)
+- QueuedFileHandler et QueuedStreamHandler remplacent le FileHandler et le
+  StreamHandler bloquants: la requête ne fait que déposer l'enregistrement dans
+  une file, l'écriture (disque, console) est faite par un thread QueueListener
+"""
+
+import atexit
+import contextvars
+import logging
+import queue
+import re
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+REQUEST_ID_MAX_LENGTH = 64
+REQUEST_ID_RE = re.compile(r'^[A-Za-z0-9._-]+$')
+
+request_id_var = contextvars.ContextVar('portfolio_request_id', default='-')
+
+
+def get_request_id():
+    """Identifiant de la requête en cours ('-' hors requête)"""
+    return request_id_var.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Ajoute l'attribut request_id aux enregistrements de log"""
+
+    def filter(self, record):
+        request_id = request_id_var.get()
+        if request_id == '-':
+            # django.request journalise les erreurs après la sortie des middlewares,
+            # mais joint la requête à l'enregistrement
+            request_id = getattr(getattr(record, 'request', None), 'request_id', request_id)
+        record.request_id = request_id
+        return True
+
+
+class RequestIdMiddleware:
+    """
+    Associe un identifiant à chaque requête pour corréler les logs
+    A placer en tête de MIDDLEWARE (synchrone et asynchrone)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response[REQUEST_ID_HEADER] = request.request_id
+        return response
+
+    async def __acall__(self, request):
+        token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response[REQUEST_ID_HEADER] = request.request_id
+        return response
+
+    def start(self, request):
+        request.request_id = self.incoming_request_id(request) or uuid.uuid4().hex
+        return request_id_var.set(request.request_id)
+
+    @staticmethod
+    def incoming_request_id(request):
+        """Identifiant transmis par le proxy, ignoré s'il n'est pas sûr à journaliser"""
+        value = request.headers.get(REQUEST_ID_HEADER, '')
+        if len(value) <= REQUEST_ID_MAX_LENGTH and REQUEST_ID_RE.match(value):
+            return value
+        return None
+
+
+class QueuedHandler(QueueHandler):
+    """
+    Handler non bloquant: la requête dépose l'enregistrement dans une file, le
+    formatage et l'écriture sont faits par `target` dans le thread du QueueListener
+    """
+
+    def __init__(self, target, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.target = target
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=False)
+        self.listener.start()
+        atexit.register(self.stop_listener)
+
+    def setFormatter(self, fmt):
+        # Le formatage est fait à l'écriture, par le handler cible
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        """
+        Copie de l'enregistrement transmise au thread d'écriture: les arguments
+        sont fusionnés dans le message (ils peuvent être modifiés après l'appel)
+        et l'exception est mise en texte
+        """
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Jamais de blocage de la requête: l'enregistrement est perdu
+            pass
+
+    def stop_listener(self):
+        """Vide la file puis arrête le thread d'écriture (appelable plusieurs fois)"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def close(self):
+        self.stop_listener()
+        self.target.close()
+        super().close()
+
+
+class QueuedFileHandler(QueuedHandler):
+    """Même configuration qu'un logging.FileHandler (filename, mode, encoding)"""
+
+    def __init__(self, filename, mode='a', encoding='utf-8', maxsize=10000):
+        super().__init__(logging.FileHandler(filename, mode=mode, encoding=encoding, delay=True), maxsize)
+
+
+class QueuedStreamHandler(QueuedHandler):
+    """
+    Même configuration qu'un logging.StreamHandler (stream, sys.stderr par défaut)
+    Un terminal ou un pipe lent (collecteur de logs) ne bloque pas la requête
+    """
+
+    def __init__(self, stream=None, maxsize=10000):
+        super().__init__(logging.StreamHandler(stream), maxsize)
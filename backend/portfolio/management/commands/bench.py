@@ -0,0 +1,259 @@
+"""
+Commande bench
+
+Génère un jeu de données (N utilisateurs et leurs sections, via bulk_create),
+appelle les principaux endpoints avec le client de test DRF puis affiche en
+JSON le débit, les percentiles de latence et le nombre de requêtes SQL par
+requête. Les données sont générées avec une graine fixe et supprimées à la fin
+(transaction annulée), pour que deux exécutions sur deux commits différents
+soient comparables.
+Usage: python manage.py bench --users 50 --projects 20 --requests 200 --output bench.json
+"""
+
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import date, timedelta
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+from portfolio.cache import bump_user_cache_version
+from portfolio.metrics import percentile
+from portfolio.models import (
+    User,
+    SocialType,
+    Social,
+    Project,
+    Service,
+    Contact,
+    Category,
+    Article,
+    Education,
+    Experience,
+    Skill,
+)
+from portfolio.search import rebuild_index
+
+WORDS = (
+    'django react portfolio api design mobile web application plateforme données '
+    'analyse cloud docker python typescript interface performance sécurité paiement '
+    'boutique tableau gestion client serveur recherche image'
+).split()
+
+# (nom, méthode de construction du chemin, authentification requise)
+ENDPOINTS = (
+    ('portfolio', lambda user: f'/api/portfolio/{user.pk}/', False),
+    ('public_portfolio', lambda user: f'/api/public/portfolio/{user.pk}/', False),
+    ('projects_by_user', lambda user: f'/api/projects/user/{user.pk}/', True),
+    ('my_projects', lambda user: '/api/projects/my-projects/', True),
+    ('services_by_user', lambda user: f'/api/services/user/{user.pk}/', True),
+    ('socials_by_user', lambda user: f'/api/socials/user/{user.pk}/', True),
+    ('educations_by_user', lambda user: f'/api/educations/user/{user.pk}/', False),
+    ('my_contacts', lambda user: '/api/contacts/my-contacts/', True),
+    ('articles', lambda user: '/api/articles/', True),
+    ('search', lambda user: '/api/search/?q=port', False),
+)
+
+
+class Command(BaseCommand):
+    help = "Mesure le débit et la latence des principaux endpoints sur un jeu de données généré"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help="Nombre d'utilisateurs générés")
+        parser.add_argument('--projects', type=int, default=10, help="Projets par utilisateur")
+        parser.add_argument('--services', type=int, default=5, help="Services par utilisateur")
+        parser.add_argument('--socials', type=int, default=3, help="Réseaux sociaux par utilisateur")
+        parser.add_argument('--contacts', type=int, default=20, help="Messages de contact par utilisateur")
+        parser.add_argument('--articles', type=int, default=5, help="Articles par utilisateur")
+        parser.add_argument('--sections', type=int, default=5,
+                            help="Formations, expériences et skills par utilisateur")
+        parser.add_argument('--requests', type=int, default=100, help="Requêtes mesurées par endpoint")
+        parser.add_argument('--warmup', type=int, default=10, help="Requêtes de chauffe par endpoint")
+        parser.add_argument('--endpoint', action='append', help="Limite le bench à certains endpoints")
+        parser.add_argument('--cold', action='store_true', help="Invalide le cache de l'utilisateur avant chaque requête")
+        parser.add_argument('--seed', type=int, default=42, help="Graine du générateur de données")
+        parser.add_argument('--output', help="Écrit aussi le résultat JSON dans ce fichier")
+        parser.add_argument('--keep', action='store_true',
+                            help="Conserve les données générées au lieu d'annuler la transaction")
+
+    def handle(self, *args, **options):
+        endpoints = [e for e in ENDPOINTS if not options['endpoint'] or e[0] in options['endpoint']]
+        if User.objects.filter(username__startswith='bench_').exists():
+            raise CommandError("Des comptes bench_* existent déjà (exécution précédente avec --keep ?)")
+
+        # Les mesures du bench ne doivent pas se mélanger à celles du serveur (metrics_report)
+        with override_settings(PORTFOLIO_METRICS_FLUSH_INTERVAL=0), transaction.atomic():
+            dataset = self.seed(options)
+            users = list(User.objects.filter(username__startswith='bench_').order_by('pk')[:options['users']])
+            try:
+                results = {name: self.run_endpoint(users, path, auth, options) for name, path, auth in endpoints}
+            finally:
+                # Pas de réponse des comptes bench_* (identifiants réutilisables après
+                # l'annulation) laissée dans le cache partagé
+                self.invalidate(users)
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        report = {
+            'commit': self.git_commit(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'cache': settings.CACHES['default']['BACKEND'],
+            },
+            'config': {
+                key: options[key] for key in (
+                    'users', 'projects', 'services', 'socials', 'contacts', 'articles',
+                    'sections', 'requests', 'warmup', 'cold', 'seed',
+                )
+            },
+            'dataset': dataset,
+            'endpoints': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output)
+        self.stdout.write(output)
+
+    def seed(self, options):
+        """Génère les données avec bulk_create. Retourne le nombre de lignes par table"""
+        rng = random.Random(options['seed'])
+        text = lambda count: ' '.join(rng.choice(WORDS) for _ in range(count))
+        # Le hachage est coûteux: un seul mot de passe pour tous les comptes
+        password = make_password('bench-password')
+
+        User.objects.bulk_create([
+            User(username=f'bench_{index}', email=f'bench_{index}@bench.local', password=password,
+                 first_name='Bench', last_name=str(index), bio=text(30))
+            for index in range(options['users'])
+        ])
+        # bulk_create ne renvoie pas les clés sous MySQL: relecture des comptes créés
+        user_ids = list(User.objects.filter(username__startswith='bench_').values_list('pk', flat=True))
+
+        SocialType.objects.bulk_create(
+            [SocialType(label=f'bench_social_{index}') for index in range(max(options['socials'], 1))]
+        )
+        social_type_ids = list(
+            SocialType.objects.filter(label__startswith='bench_social_').values_list('pk', flat=True)
+        )
+        category = Category.objects.create(name='bench')
+
+        today = date.today()
+        rows = {
+            Project: [
+                Project(user_id=user_id, title=text(4), description=text(60), position=index,
+                        technologies=rng.sample(WORDS, 3))
+                for user_id in user_ids for index in range(options['projects'])
+            ],
+            Service: [
+                Service(user_id=user_id, title=text(3), description=text(40), position=index,
+                        tags=rng.sample(WORDS, 2))
+                for user_id in user_ids for index in range(options['services'])
+            ],
+            Social: [
+                Social(user_id=user_id, social_type_id=social_type_ids[index % len(social_type_ids)],
+                       link=f'https://example.com/{user_id}/{index}')
+                for user_id in user_ids for index in range(options['socials'])
+            ],
+            Contact: [
+                Contact(user_id=user_id, name=text(2), email=f'contact_{index}@bench.local',
+                        message=text(50), read=rng.random() < 0.5)
+                for user_id in user_ids for index in range(options['contacts'])
+            ],
+            Article: [
+                Article(user_id=user_id, category=category, title=text(5), content=text(300),
+                        is_published=True)
+                for user_id in user_ids for index in range(options['articles'])
+            ],
+            Education: [
+                Education(user_id=user_id, title=text(3), school=text(2), description=text(20),
+                          start_date=today - timedelta(days=365 * (index + 1)))
+                for user_id in user_ids for index in range(options['sections'])
+            ],
+            Experience: [
+                Experience(user_id=user_id, title=text(3), company=text(2), description=text(20),
+                           start_date=today - timedelta(days=365 * (index + 1)))
+                for user_id in user_ids for index in range(options['sections'])
+            ],
+            Skill: [
+                Skill(user_id=user_id, label=text(1))
+                for user_id in user_ids for index in range(options['sections'])
+            ],
+        }
+        dataset = {'users': len(user_ids)}
+        for model, instances in rows.items():
+            model.objects.bulk_create(instances, batch_size=1000)
+            dataset[model._meta.model_name] = len(instances)
+
+        # bulk_create n'émet pas de signaux: l'index de recherche est reconstruit en une fois
+        dataset['search_documents'] = rebuild_index()
+        return dataset
+
+    def run_endpoint(self, users, build_path, requires_auth, options):
+        client = APIClient(HTTP_HOST='localhost')
+        latencies, query_counts, statuses = [], [], {}
+        self.invalidate(users)
+
+        total = options['warmup'] + options['requests']
+        started = None
+        for index in range(total):
+            user = users[index % len(users)]
+            if requires_auth:
+                client.force_authenticate(user)
+            if options['cold']:
+                self.invalidate([user])
+            if index == options['warmup']:
+                started = time.perf_counter()
+
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = client.get(build_path(user))
+                elapsed = time.perf_counter() - start
+
+            if index >= options['warmup']:
+                latencies.append(elapsed * 1000)
+                query_counts.append(len(queries))
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        wall_time = time.perf_counter() - started if started is not None else 0
+        return {
+            'requests': len(latencies),
+            'status_codes': statuses,
+            'req_per_s': round(len(latencies) / wall_time, 1) if wall_time else None,
+            'latency_ms': {
+                'mean': round(statistics.fmean(latencies), 3) if latencies else None,
+                **{f'p{p}': round(percentile(latencies, p), 3) if latencies else None for p in (50, 95, 99)},
+            },
+            'queries_per_request': {
+                'mean': round(statistics.fmean(query_counts), 2) if query_counts else None,
+                'max': max(query_counts) if query_counts else None,
+            },
+        }
+
+    @staticmethod
+    def invalidate(users):
+        """
+        Invalide les réponses en cache des comptes du bench seulement: le cache
+        peut être partagé avec le serveur (cache.clear() viderait aussi ses entrées)
+        """
+        for user in users:
+            bump_user_cache_version(user.pk)
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,61 @@
+"""
+Commande metrics_report
+
+Affiche les percentiles p50/p95/p99 par endpoint (durée, requêtes SQL,
+temps en base, temps de sérialisation, taille de réponse) à partir des
+mesures écrites par les processus serveur dans PORTFOLIO_METRICS_DIR
+(les fichiers des processus arrêtés sont supprimés). --reset remet les
+mesures à zéro, y compris celles en mémoire des processus en cours.
+Usage: python manage.py metrics_report [--json] [--endpoint ProjectViewSet] [--reset]
+"""
+
+import json
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from portfolio.metrics import (
+    SAMPLE_FIELDS,
+    load_flushed_samples,
+    prune_dead_processes,
+    reset_flushed_samples,
+    summarize,
+)
+
+
+class Command(BaseCommand):
+    help = "Affiche les percentiles de latence et de requêtes SQL par endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help="Sortie JSON")
+        parser.add_argument('--endpoint', help="Filtre sur le nom de l'endpoint (sous-chaîne)")
+        parser.add_argument('--reset', action='store_true', help="Remet les mesures à zéro après affichage")
+
+    def handle(self, *args, **options):
+        prune_dead_processes()
+        samples = load_flushed_samples()
+        if options['endpoint']:
+            samples = {name: values for name, values in samples.items() if options['endpoint'] in name}
+        summary = summarize(samples)
+
+        if options['json']:
+            self.stdout.write(json.dumps(summary, indent=2))
+        elif not summary:
+            self.stdout.write(f"Aucune mesure dans {settings.PORTFOLIO_METRICS_DIR}")
+        else:
+            self.write_table(summary)
+
+        if options['reset']:
+            reset_flushed_samples()
+
+    def write_table(self, summary):
+        header = f"{'endpoint':<45} {'n':>6}" + ''.join(f" {field + ' p50/p95/p99':>30}" for field in SAMPLE_FIELDS)
+        self.stdout.write(header)
+        for endpoint, stats in summary.items():
+            columns = ''.join(
+                f" {'/'.join(self.format_value(stats[field][p]) for p in ('p50', 'p95', 'p99')):>30}"
+                for field in SAMPLE_FIELDS
+            )
+            self.stdout.write(f"{endpoint:<45} {stats['count']:>6}{columns}")
+
+    @staticmethod
+    def format_value(value):
+        return f"{value:g}" if isinstance(value, float) else str(value)
@@ -0,0 +1,29 @@
+"""
+Commande purge_expired_tokens
+
+Supprime par lots les refresh tokens expirés (OutstandingToken et leur entrée
+BlacklistedToken) et les jetons de réinitialisation de mot de passe expirés,
+efface le corps des anciens emails de l'outbox.
+A lancer une fois par heure (cron), sauf si le nettoyage tourne dans le
+processus (PORTFOLIO_TOKEN_HOUSEKEEPING_INTERVAL).
+Usage: python manage.py purge_expired_tokens [--batch-size 1000]
+"""
+
+from django.core.management.base import BaseCommand
+from portfolio.housekeeping import purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Purge les jetons JWT et de réinitialisation de mot de passe expirés"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help="Lignes supprimées par requête")
+
+    def handle(self, *args, **options):
+        purged = purge_expired_tokens(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{purged['outstanding_tokens']} refresh token(s), "
+            f"{purged['blacklisted_tokens']} entrée(s) de liste noire, "
+            f"{purged['password_reset_tokens']} jeton(s) de réinitialisation supprimé(s), "
+            f"{purged['email_bodies']} corps d'email effacé(s)"
+        ))
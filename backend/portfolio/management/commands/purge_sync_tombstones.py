@@ -0,0 +1,19 @@
+"""
+Commande purge_sync_tombstones
+
+Supprime les traces de suppression plus anciennes que
+PORTFOLIO_SYNC_TOMBSTONE_RETENTION (les clients plus anciens repartent d'une
+copie complète). A lancer une fois par jour.
+Usage: python manage.py purge_sync_tombstones
+"""
+
+from django.core.management.base import BaseCommand
+from portfolio.sync import purge_tombstones
+
+
+class Command(BaseCommand):
+    help = "Purge les traces de suppression expirées de la synchronisation incrémentale"
+
+    def handle(self, *args, **options):
+        count = purge_tombstones()
+        self.stdout.write(self.style.SUCCESS(f"{count} trace(s) supprimée(s)"))
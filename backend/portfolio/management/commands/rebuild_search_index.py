@@ -0,0 +1,18 @@
+"""
+Commande rebuild_search_index
+
+Reconstruit entièrement l'index de recherche (à lancer après la migration
+qui crée la table, ou si l'index a été modifié hors de l'ORM)
+Usage: python manage.py rebuild_search_index
+"""
+
+from django.core.management.base import BaseCommand
+from portfolio.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruit l'index de recherche plein texte (articles, projets, services)"
+
+    def handle(self, *args, **options):
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"{count} document(s) indexé(s)"))
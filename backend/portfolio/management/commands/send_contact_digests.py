@@ -0,0 +1,19 @@
+"""
+Commande send_contact_digests
+
+Met en file (outbox) le résumé des nouveaux messages de contact des
+utilisateurs abonnés (quotidien ou hebdomadaire) dont l'envoi est dû.
+A lancer régulièrement (ex: toutes les heures), avant send_outbox.
+Usage: python manage.py send_contact_digests
+"""
+
+from django.core.management.base import BaseCommand
+from portfolio.contacts import send_contact_digests
+
+
+class Command(BaseCommand):
+    help = "Génère les résumés par email des nouveaux messages de contact"
+
+    def handle(self, *args, **options):
+        count = send_contact_digests()
+        self.stdout.write(self.style.SUCCESS(f"{count} résumé(s) mis en file"))
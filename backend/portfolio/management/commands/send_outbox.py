@@ -0,0 +1,39 @@
+"""
+Commande send_outbox
+
+Envoie les emails en attente de l'outbox par lots, sur une connexion SMTP par
+lot. Sans --loop, traite les messages dus puis s'arrête (adapté à un cron);
+avec --loop, tourne en continu comme worker.
+Usage: python manage.py send_outbox --loop --interval 10
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from portfolio.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = "Envoie les emails en attente (outbox)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help="Messages envoyés par connexion SMTP")
+        parser.add_argument('--loop', action='store_true', help="Tourne en continu")
+        parser.add_argument('--interval', type=float, default=10,
+                            help="Attente en secondes quand l'outbox est vide (avec --loop)")
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_pending(options['batch_size'])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f"{sent} email(s) envoyé(s), {failed} échec(s)")
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Terminé: {total_sent} email(s) envoyé(s), {total_failed} échec(s)"
+        ))
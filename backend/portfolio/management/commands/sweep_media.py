@@ -0,0 +1,26 @@
+"""
+Commande sweep_media
+
+Supprime les fichiers médias qui ne sont plus référencés par aucune ligne
+(images remplacées ou retirées, lignes supprimées). Les fichiers plus récents
+que --min-age secondes sont conservés. A lancer une fois par jour.
+Usage: python manage.py sweep_media [--min-age 3600] [--dry-run]
+"""
+
+from django.core.management.base import BaseCommand
+from portfolio.media import DEFAULT_MIN_AGE, sweep_unreferenced
+
+
+class Command(BaseCommand):
+    help = "Supprime les fichiers médias qui ne sont plus référencés"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-age', type=int, default=DEFAULT_MIN_AGE,
+                            help="Âge minimal (secondes) d'un fichier pour être supprimé")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Affiche ce qui serait supprimé sans rien supprimer")
+
+    def handle(self, *args, **options):
+        deleted, freed = sweep_unreferenced(min_age=options['min_age'], dry_run=options['dry_run'])
+        verb = "à supprimer" if options['dry_run'] else "supprimé(s)"
+        self.stdout.write(self.style.SUCCESS(f"{deleted} fichier(s) {verb}, {freed / 1024:.1f} Ko libéré(s)"))
@@ -0,0 +1,82 @@
+"""
+Nettoyage des médias
+
+Avec le stockage adressé par contenu, un fichier peut être partagé par
+plusieurs lignes (même image uploadée deux fois, variantes identiques): il ne
+peut pas être supprimé quand une ligne le remplace ou est supprimée.
+sweep_unreferenced() compte les références de chaque fichier dans la base
+(champs image et variantes de User, Project, Service et SocialType) et
+supprime les fichiers qui n'en ont plus aucune.
+"""
+
+import os
+import time
+from collections import Counter
+from django.core.files.storage import default_storage
+from .models import User, Project, Service, SocialType
+
+# (modèle, champs fichier, champs JSON des variantes)
+MEDIA_FIELDS = (
+    (User, ('profile_image', 'banner'), ('profile_image_variants', 'banner_variants')),
+    (Project, ('image',), ('image_variants',)),
+    (Service, ('icon',), ('icon_variants',)),
+    (SocialType, ('logo',), ('logo_variants',)),
+)
+
+# Un fichier plus récent peut appartenir à une transaction pas encore validée
+DEFAULT_MIN_AGE = 3600
+
+
+def count_references():
+    """Retourne {nom de fichier: nombre de références en base}"""
+    references = Counter()
+    for model, file_fields, variant_fields in MEDIA_FIELDS:
+        rows = model.objects.order_by().values_list(*file_fields, *variant_fields)
+        for row in rows.iterator():
+            for name in row[:len(file_fields)]:
+                if name:
+                    references[name] += 1
+            for variants in row[len(file_fields):]:
+                for formats in (variants or {}).values():
+                    for name in formats.values():
+                        references[name] += 1
+    return references
+
+
+def stored_files(storage=None):
+    """Parcourt récursivement le stockage: (nom, chemin absolu)"""
+    storage = storage or default_storage
+    root = storage.location
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.startswith('.'):
+                continue
+            path = os.path.join(directory, filename)
+            yield os.path.relpath(path, root).replace(os.sep, '/'), path
+
+
+def sweep_unreferenced(min_age=DEFAULT_MIN_AGE, dry_run=False, storage=None):
+    """
+    Supprime les fichiers du stockage qui ne sont référencés par aucune ligne
+    Retourne (nombre de fichiers supprimés, octets libérés)
+    """
+    storage = storage or default_storage
+    # Références lues avant le parcours: un fichier uploadé pendant le
+    # parcours est protégé par min_age
+    references = count_references()
+    deadline = time.time() - min_age
+    deleted = freed = 0
+    for name, path in stored_files(storage):
+        if name in references:
+            continue
+        try:
+            stat = os.stat(path)
+            if stat.st_mtime > deadline:
+                continue
+            if not dry_run:
+                os.remove(path)
+        except OSError:
+            continue
+        deleted += 1
+        freed += stat.st_size
+    return deleted, freed
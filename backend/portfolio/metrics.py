@@ -0,0 +1,407 @@
+"""
+Instrumentation des requêtes
+
+Pour chaque requête, le middleware RequestMetricsMiddleware mesure le nombre
+de requêtes SQL, le temps passé en base, le temps de sérialisation DRF, la
+durée totale et la taille de la réponse. Les mesures sont renvoyées dans
+l'en-tête Server-Timing et agrégées en mémoire par action de viewset
+(ex: 'ProjectViewSet.projects_by_user'). Chaque processus recopie
+périodiquement ses mesures dans PORTFOLIO_METRICS_DIR pour la commande
+metrics_report, depuis un thread dédié: l'écriture du fichier ne retarde
+aucune requête. metrics_report --reset ouvre une nouvelle époque (fichier
+'epoch' du dossier): chaque processus vide ses mesures avant sa prochaine
+écriture, les fichiers d'une époque précédente sont ignorés. Les fichiers des
+processus arrêtés sont supprimés par le rapport (dossier local à la machine).
+"""
+
+import contextvars
+import glob
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+# Ordre des valeurs d'un échantillon
+SAMPLE_FIELDS = ('duration_ms', 'queries', 'db_ms', 'serializer_ms', 'size')
+PERCENTILES = (50, 95, 99)
+# Fichier de PORTFOLIO_METRICS_DIR contenant l'époque courante (metrics_report --reset)
+EPOCH_FILE = 'epoch'
+
+_current_metrics = contextvars.ContextVar('portfolio_request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Mesures d'une requête; sert aussi de wrapper d'exécution SQL (connection.execute_wrapper)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        # Hachage de mots de passe (attente du pool comprise), voir portfolio.hashing
+        self.hash_time = 0.0
+        self.duration = 0.0
+        self.size = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+    def finish(self, response):
+        self.duration = time.perf_counter() - self.started
+        self.size = 0 if response.streaming else len(response.content)
+
+    def server_timing(self):
+        """Valeur de l'en-tête Server-Timing (durées en millisecondes)"""
+        timing = (
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries", '
+            f'serializer;dur={self.serializer_time * 1000:.1f}, '
+        )
+        if self.hash_time:
+            timing += f'hash;dur={self.hash_time * 1000:.1f}, '
+        return timing + f'total;dur={self.duration * 1000:.1f}'
+
+    def as_sample(self):
+        return (
+            round(self.duration * 1000, 3),
+            self.queries,
+            round(self.db_time * 1000, 3),
+            round(self.serializer_time * 1000, 3),
+            self.size,
+        )
+
+
+def current_metrics():
+    """Mesures de la requête en cours (None hors d'une requête mesurée)"""
+    return _current_metrics.get()
+
+
+def percentile(values, p):
+    """Percentile par la méthode du rang le plus proche"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples_by_endpoint):
+    """Retourne {endpoint: {count, <champ>: {p50, p95, p99}}} pour des échantillons bruts"""
+    summary = {}
+    for endpoint, samples in sorted(samples_by_endpoint.items()):
+        if not samples:
+            continue
+        stats = {'count': len(samples)}
+        for index, field in enumerate(SAMPLE_FIELDS):
+            values = [sample[index] for sample in samples]
+            stats[field] = {f'p{p}': percentile(values, p) for p in PERCENTILES}
+        summary[endpoint] = stats
+    return summary
+
+
+class MetricsRegistry:
+    """Derniers échantillons de chaque endpoint, en mémoire du processus"""
+
+    def __init__(self):
+        self._samples = defaultdict(self._new_buffer)
+        self._lock = threading.Lock()
+        # Époque des mesures en mémoire (None: pas encore lue)
+        self._epoch = None
+
+    @staticmethod
+    def _new_buffer():
+        return deque(maxlen=getattr(settings, 'PORTFOLIO_METRICS_MAX_SAMPLES', 1000))
+
+    def record(self, endpoint, metrics):
+        with self._lock:
+            self._samples[endpoint].append(metrics.as_sample())
+
+    def snapshot(self):
+        with self._lock:
+            return {endpoint: list(samples) for endpoint, samples in self._samples.items()}
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        return summarize(self.snapshot())
+
+    def check_epoch(self, directory=None):
+        """Vide les mesures en mémoire si une remise à zéro a eu lieu depuis la dernière lecture"""
+        epoch = read_epoch(directory)
+        with self._lock:
+            if self._epoch is not None and self._epoch != epoch:
+                self._samples.clear()
+            self._epoch = epoch
+        return epoch
+
+    def flush(self, directory=None):
+        """Écrit les échantillons du processus dans <directory>/<pid>.json"""
+        directory = directory or settings.PORTFOLIO_METRICS_DIR
+        os.makedirs(directory, exist_ok=True)
+        epoch = self.check_epoch(directory)
+        path = os.path.join(directory, f'{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'epoch': epoch, 'samples': self.snapshot()}, f)
+        os.replace(tmp_path, path)
+
+
+registry = MetricsRegistry()
+
+# (pid, événement d'arrêt) du thread d'écriture: un processus forké après le
+# démarrage (gunicorn --preload) n'hérite pas du thread et en démarre un
+_flusher = None
+
+
+def _run_flusher(interval, stop_event):
+    # Les mesures prises avant une remise à zéro ultérieure seront abandonnées
+    registry.check_epoch()
+    while not stop_event.wait(interval):
+        try:
+            registry.flush()
+        except OSError:
+            logger.warning("Écriture des mesures impossible dans %s", settings.PORTFOLIO_METRICS_DIR, exc_info=True)
+
+
+def start_flusher(interval=None):
+    """
+    Démarre (une fois par processus) le thread qui recopie les mesures toutes
+    les `interval` secondes (PORTFOLIO_METRICS_FLUSH_INTERVAL)
+    """
+    global _flusher
+    pid = os.getpid()
+    if _flusher is not None and _flusher[0] == pid:
+        return _flusher[1]
+    interval = interval or getattr(settings, 'PORTFOLIO_METRICS_FLUSH_INTERVAL', 30)
+    if not interval:
+        return None
+    stop_event = threading.Event()
+    thread = threading.Thread(target=_run_flusher, args=(interval, stop_event), name='metrics-flush', daemon=True)
+    thread.start()
+    _flusher = (pid, stop_event)
+    return stop_event
+
+
+def read_epoch(directory=None):
+    """Époque courante des mesures (0 avant la première remise à zéro)"""
+    directory = directory or settings.PORTFOLIO_METRICS_DIR
+    try:
+        with open(os.path.join(directory, EPOCH_FILE)) as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def reset_flushed_samples(directory=None):
+    """
+    Remise à zéro: nouvelle époque, puis suppression des fichiers écrits
+    Chaque processus vide ses mesures en mémoire avant sa prochaine écriture
+    """
+    directory = directory or settings.PORTFOLIO_METRICS_DIR
+    os.makedirs(directory, exist_ok=True)
+    epoch = read_epoch(directory) + 1
+    path = os.path.join(directory, EPOCH_FILE)
+    with open(f'{path}.tmp', 'w') as f:
+        f.write(str(epoch))
+    os.replace(f'{path}.tmp', path)
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return epoch
+
+
+def process_exists(pid):
+    if os.name == 'nt':
+        # os.kill() terminerait le processus: pas de vérification sous Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def prune_dead_processes(directory=None):
+    """Supprime les fichiers des processus arrêtés; retourne leur nombre"""
+    directory = directory or settings.PORTFOLIO_METRICS_DIR
+    removed = 0
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        try:
+            pid = int(os.path.splitext(os.path.basename(path))[0])
+        except ValueError:
+            continue
+        if not process_exists(pid):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+    return removed
+
+
+def load_flushed_samples(directory=None):
+    """Fusionne les échantillons de l'époque courante écrits par tous les processus"""
+    directory = directory or settings.PORTFOLIO_METRICS_DIR
+    epoch = read_epoch(directory)
+    merged = defaultdict(list)
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        # Fichier écrit avant la dernière remise à zéro
+        if not isinstance(data, dict) or data.get('epoch') != epoch:
+            continue
+        for endpoint, samples in data.get('samples', {}).items():
+            merged[endpoint].extend(tuple(sample) for sample in samples)
+    return merged
+
+
+_original_serializer_data = serializers.BaseSerializer.data
+
+
+def _timed_serializer_data(self):
+    """BaseSerializer.data chronométré (seul le serializer de plus haut niveau est compté)"""
+    metrics = _current_metrics.get()
+    if metrics is None or metrics.serializer_depth:
+        return _original_serializer_data.fget(self)
+    metrics.serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        return _original_serializer_data.fget(self)
+    finally:
+        metrics.serializer_depth -= 1
+        metrics.serializer_time += time.perf_counter() - start
+
+
+def install_serializer_timing():
+    """Chronomètre la sérialisation DRF (coût nul hors d'une requête mesurée)"""
+    serializers.BaseSerializer.data = property(_timed_serializer_data)
+
+
+def endpoint_name(request, view_func):
+    """Nom d'agrégation: 'Classe.action' pour les vues DRF, nom de la route sinon"""
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        match = getattr(request, 'resolver_match', None)
+        return (match and match.view_name) or getattr(view_func, '__name__', 'unknown')
+    method = request.method.lower()
+    actions = getattr(view_func, 'actions', None) or {}
+    return f'{view_class.__name__}.{actions.get(method, method)}'
+
+
+class RequestMetricsMiddleware:
+    """
+    Mesure chaque requête, ajoute l'en-tête Server-Timing et enregistre
+    l'échantillon dans le registre du processus
+    A placer en tête de MIDDLEWARE pour mesurer toute la chaîne
+    Fonctionne en synchrone (WSGI) comme en asynchrone (ASGI): le contexte de
+    mesure est propagé aux threads de l'ORM asynchrone
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PORTFOLIO_METRICS_ENABLED', True)
+        if self.enabled:
+            install_serializer_timing()
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            with self.instrument(metrics):
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        return self.record(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            with self.instrument(metrics):
+                response = await self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        return self.record(request, response, metrics)
+
+    @staticmethod
+    def instrument(metrics):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics))
+        return stack
+
+    def record(self, request, response, metrics):
+        metrics.finish(response)
+        response['Server-Timing'] = metrics.server_timing()
+        # Accessible dans les tests via la réponse du client de test
+        response.metrics = metrics
+        registry.record(getattr(request, 'metrics_endpoint', 'unresolved'), metrics)
+        start_flusher()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_endpoint = endpoint_name(request, view_func)
+        return None
+
+
+class EndpointBudgetMixin:
+    """
+    Mixin de TestCase pour vérifier le budget d'une réponse du client de test
+    Ex: self.assertWithinBudget(response, queries=3)
+    """
+
+    def assertWithinBudget(self, response, queries=None, duration_ms=None, size=None):
+        metrics = getattr(response, 'metrics', None)
+        self.assertIsNotNone(metrics, "Aucune mesure: RequestMetricsMiddleware est-il activé ?")
+        if queries is not None:
+            self.assertLessEqual(
+                metrics.queries, queries,
+                f"{response.wsgi_request.path}: {metrics.queries} requêtes SQL (budget: {queries})"
+            )
+        if duration_ms is not None:
+            self.assertLessEqual(
+                metrics.duration * 1000, duration_ms,
+                f"{response.wsgi_request.path}: {metrics.duration * 1000:.1f} ms (budget: {duration_ms} ms)"
+            )
+        if size is not None:
+            self.assertLessEqual(
+                metrics.size, size,
+                f"{response.wsgi_request.path}: {metrics.size} octets (budget: {size})"
+            )
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0008_alter_service_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, help_text="Variantes redimensionnées de l'image (générées automatiquement après upload)"),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='icon_variants',
+            field=models.JSONField(blank=True, default=dict, help_text="Variantes redimensionnées de l'icône (générées automatiquement après upload)"),
+        ),
+        migrations.AddField(
+            model_name='socialtype',
+            name='logo_variants',
+            field=models.JSONField(blank=True, default=dict, help_text='Variantes redimensionnées du logo (générées automatiquement après upload)'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='banner_variants',
+            field=models.JSONField(blank=True, default=dict, help_text='Variantes redimensionnées de la bannière (générées automatiquement après upload)'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='profile_image_variants',
+            field=models.JSONField(blank=True, default=dict, help_text="Variantes redimensionnées de l'image de profil (générées automatiquement après upload)"),
+        ),
+    ]
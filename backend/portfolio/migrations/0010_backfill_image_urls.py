@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import migrations
+
+
+# (modèle, champ fichier, champ URL)
+IMAGE_URL_FIELDS = [
+    ('Project', 'image', 'image_url'),
+    ('Service', 'icon', 'icon_url'),
+    ('SocialType', 'logo', 'logo_url'),
+    ('User', 'profile_image', 'profile_image_url'),
+    ('User', 'banner', 'banner_url'),
+]
+
+
+def backfill_image_urls(apps, schema_editor):
+    """
+    Recalcule les URLs des images déjà uploadées: save() les calcule désormais
+    avant l'écriture au lieu d'un second UPDATE
+    """
+    site_url = getattr(settings, 'SITE_URL', '')
+    for model_name, file_field, url_field in IMAGE_URL_FIELDS:
+        model = apps.get_model('portfolio', model_name)
+        rows = model.objects.exclude(**{file_field: ''}).exclude(**{f'{file_field}__isnull': True})
+        for pk, name in rows.values_list('pk', file_field).iterator():
+            url = f"{site_url}{default_storage.url(name)}"
+            model.objects.filter(pk=pk).exclude(**{url_field: url}).update(**{url_field: url})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0009_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_image_urls, migrations.RunPython.noop),
+    ]
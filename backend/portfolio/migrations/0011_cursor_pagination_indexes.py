@@ -0,0 +1,73 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0010_backfill_image_urls'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='contact',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Contact', 'verbose_name_plural': 'Contacts'},
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='portfolio_a_user_id_b28d16_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-created_at', '-id'], name='portfolio_a_created_72bdd3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['-created_at', '-id'], name='portfolio_c_created_731f20_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='portfolio_c_user_id_b5ee5d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['-created_at', '-id'], name='portfolio_c_created_5e1990_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='portfolio_e_user_id_411f62_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['user', '-start_date', '-id'], name='portfolio_e_user_id_b55aef_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='portfolio_e_user_id_65d982_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='portfolio_p_user_id_3b8589_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='portfolio_s_user_id_e0a9bf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='portfolio_s_user_id_2c172b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='social',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='portfolio_s_user_id_3f17b2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialtype',
+            index=models.Index(fields=['-created_at', '-id'], name='portfolio_s_created_a2b3fd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-created_at', '-id'], name='portfolio_u_created_60f1c3_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0011_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('document_type', models.CharField(choices=[('article', 'Article'), ('project', 'Projet'), ('service', 'Service')], max_length=20)),
+                ('document_id', models.PositiveBigIntegerField()),
+                ('weight', models.PositiveIntegerField(default=1)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Search Term',
+                'verbose_name_plural': 'Search Terms',
+                'indexes': [models.Index(fields=['term', 'document_type'], name='portfolio_s_term_d27e25_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchterm',
+            constraint=models.UniqueConstraint(fields=('document_type', 'document_id', 'term'), name='unique_search_term_per_document'),
+        ),
+    ]
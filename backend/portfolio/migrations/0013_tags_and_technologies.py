@@ -0,0 +1,92 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0012_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Tag',
+                'verbose_name_plural': 'Tags',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Technology',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Technology',
+                'verbose_name_plural': 'Technologies',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ServiceTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='service_tags', to='portfolio.service')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='service_tags', to='portfolio.tag')),
+            ],
+            options={
+                'verbose_name': 'Service Tag',
+                'verbose_name_plural': 'Service Tags',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectTechnology',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_technologies', to='portfolio.project')),
+                ('technology', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_technologies', to='portfolio.technology')),
+            ],
+            options={
+                'verbose_name': 'Project Technology',
+                'verbose_name_plural': 'Project Technologies',
+            },
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='normalized_technologies',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='projects', through='portfolio.ProjectTechnology', to='portfolio.technology'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='normalized_tags',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='services', through='portfolio.ServiceTag', to='portfolio.tag'),
+        ),
+        migrations.AddIndex(
+            model_name='servicetag',
+            index=models.Index(fields=['tag', 'service'], name='portfolio_s_tag_id_211823_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='servicetag',
+            constraint=models.UniqueConstraint(fields=('service', 'tag'), name='unique_service_tag'),
+        ),
+        migrations.AddIndex(
+            model_name='projecttechnology',
+            index=models.Index(fields=['technology', 'project'], name='portfolio_p_technol_34e421_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='projecttechnology',
+            constraint=models.UniqueConstraint(fields=('project', 'technology'), name='unique_project_technology'),
+        ),
+    ]
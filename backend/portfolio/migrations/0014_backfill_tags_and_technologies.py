@@ -0,0 +1,51 @@
+from django.db import migrations
+
+
+# (modèle propriétaire, champ JSON, modèle du nom, modèle de liaison, champ propriétaire, champ nom)
+NORMALIZED_FIELDS = [
+    ('Service', 'tags', 'Tag', 'ServiceTag', 'service', 'tag'),
+    ('Project', 'technologies', 'Technology', 'ProjectTechnology', 'project', 'technology'),
+]
+
+
+def normalize_name(value):
+    return ' '.join(str(value).split()).lower()[:100]
+
+
+def backfill_normalized_tables(apps, schema_editor):
+    """Recopie les listes JSON existantes dans les tables Tag/Technology et leurs liaisons"""
+    for owner_name, json_field, name_model_name, link_model_name, owner_field, name_field in NORMALIZED_FIELDS:
+        owner_model = apps.get_model('portfolio', owner_name)
+        name_model = apps.get_model('portfolio', name_model_name)
+        link_model = apps.get_model('portfolio', link_model_name)
+
+        names_by_owner = {}
+        for pk, values in owner_model.objects.values_list('pk', json_field).iterator():
+            if isinstance(values, list):
+                names = {normalize_name(value) for value in values} - {''}
+                if names:
+                    names_by_owner[pk] = names
+
+        all_names = set().union(*names_by_owner.values()) if names_by_owner else set()
+        name_model.objects.bulk_create([name_model(name=name) for name in all_names], ignore_conflicts=True)
+        ids = dict(name_model.objects.filter(name__in=all_names).values_list('name', 'pk'))
+        link_model.objects.bulk_create(
+            [
+                link_model(**{f'{owner_field}_id': pk, f'{name_field}_id': ids[name]})
+                for pk, names in names_by_owner.items()
+                for name in names
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0013_tags_and_technologies'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_normalized_tables, migrations.RunPython.noop),
+    ]
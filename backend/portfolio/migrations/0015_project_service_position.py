@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:19
+
+from django.db import migrations, models
+
+
+def backfill_positions(apps, schema_editor):
+    """Les positions reprennent l'ordre d'affichage précédent (plus récent en tête)"""
+    for model_name in ('Project', 'Service'):
+        model = apps.get_model('portfolio', model_name)
+        positions = {}
+        rows = model.objects.order_by('user_id', '-created_at', '-id').values_list('pk', 'user_id')
+        for pk, user_id in rows.iterator():
+            position = positions.get(user_id, 0)
+            positions[user_id] = position + 1
+            if position:
+                model.objects.filter(pk=pk).update(position=position)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0014_backfill_tags_and_technologies'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='project',
+            options={'ordering': ['position', '-created_at'], 'verbose_name': 'Project', 'verbose_name_plural': 'Projects'},
+        ),
+        migrations.AlterModelOptions(
+            name='service',
+            options={'ordering': ['position', '-created_at'], 'verbose_name': 'Service', 'verbose_name_plural': 'Services'},
+        ),
+        migrations.RemoveIndex(
+            model_name='project',
+            name='portfolio_p_user_id_3b8589_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='service',
+            name='portfolio_s_user_id_e0a9bf_idx',
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='position',
+            field=models.IntegerField(default=0, help_text="Position d'affichage (les nouveaux éléments sont placés en tête)"),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='position',
+            field=models.IntegerField(default=0, help_text="Position d'affichage (les nouveaux éléments sont placés en tête)"),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['user', 'position', '-created_at', '-id'], name='portfolio_p_user_id_e031e6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['user', 'position', '-created_at', '-id'], name='portfolio_s_user_id_384474_idx'),
+        ),
+        migrations.RunPython(backfill_positions, migrations.RunPython.noop),
+    ]
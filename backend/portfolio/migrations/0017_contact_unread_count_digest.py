@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:30
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_unread_counts(apps, schema_editor):
+    """Initialise le compteur de messages non lus de chaque utilisateur"""
+    User = apps.get_model('portfolio', 'User')
+    Contact = apps.get_model('portfolio', 'Contact')
+    unread = (
+        Contact.objects.filter(user=OuterRef('pk'), read=False)
+        .order_by()
+        .values('user')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    User.objects.update(unread_contacts_count=Coalesce(Subquery(unread, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0016_outbound_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='contact_digest',
+            field=models.CharField(choices=[('none', 'Aucun'), ('daily', 'Quotidien'), ('weekly', 'Hebdomadaire')], default='none', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='contact_digest_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='unread_contacts_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['user', 'read'], name='portfolio_c_user_id_e1a7e2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['contact_digest', 'contact_digest_sent_at'], name='portfolio_u_contact_011041_idx'),
+        ),
+        migrations.RunPython(backfill_unread_counts, migrations.RunPython.noop),
+    ]
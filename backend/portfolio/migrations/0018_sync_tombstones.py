@@ -0,0 +1,63 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0017_contact_unread_count_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('user_id', models.PositiveBigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Tombstone',
+                'verbose_name_plural': 'Tombstones',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['user', 'updated_at'], name='portfolio_c_user_id_09205f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['user', 'updated_at'], name='portfolio_e_user_id_4f7b52_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['user', 'updated_at'], name='portfolio_e_user_id_3a86cb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['user', 'updated_at'], name='portfolio_p_user_id_b9bc87_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['user', 'updated_at'], name='portfolio_s_user_id_8cd36c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['user', 'updated_at'], name='portfolio_s_user_id_abee30_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='social',
+            index=models.Index(fields=['user', 'updated_at'], name='portfolio_s_user_id_abb6eb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['user_id', 'deleted_at'], name='portfolio_t_user_id_5a80a2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['deleted_at'], name='portfolio_t_deleted_686d37_idx'),
+        ),
+    ]
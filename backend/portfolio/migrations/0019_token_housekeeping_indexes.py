@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:42
+
+from django.db import migrations, models
+
+# Index sur l'expiration des refresh tokens (table de simplejwt): créé ici, hors
+# de l'état des migrations de token_blacklist, pour la purge par lots
+OUTSTANDING_EXPIRES_INDEX = models.Index(fields=['expires_at'], name='outstanding_expires_at_idx')
+
+
+def add_outstanding_token_index(apps, schema_editor):
+    OutstandingToken = apps.get_model('token_blacklist', 'OutstandingToken')
+    schema_editor.add_index(OutstandingToken, OUTSTANDING_EXPIRES_INDEX)
+
+
+def remove_outstanding_token_index(apps, schema_editor):
+    OutstandingToken = apps.get_model('token_blacklist', 'OutstandingToken')
+    schema_editor.remove_index(OutstandingToken, OUTSTANDING_EXPIRES_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0018_sync_tombstones'),
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(fields=['created_at'], name='password_re_created_265757_idx'),
+        ),
+        migrations.RunPython(add_outstanding_token_index, remove_outstanding_token_index),
+    ]
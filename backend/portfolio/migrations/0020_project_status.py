@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0019_token_housekeeping_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Brouillon'), ('in_progress', 'En cours'), ('completed', 'Terminé'), ('archived', 'Archivé')], default='completed', help_text='Statut du projet', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['user', 'status'], name='portfolio_p_user_id_74641c_idx'),
+        ),
+    ]
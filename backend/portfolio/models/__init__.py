@@ -9,4 +9,8 @@ from .contact import Contact
 from .category import Category
 from .article import Article
 from .service import Service
-from .project import Project
\ No newline at end of file
+from .project import Project
+from .search import SearchTerm
+from .tag import Tag, ServiceTag, Technology, ProjectTechnology
+from .outbox import OutboundEmail
+from .tombstone import Tombstone
@@ -26,6 +26,8 @@ class Article(TimeStampedModel):
             models.Index(fields=['-created_at']),
             models.Index(fields=['user']),
             models.Index(fields=['category']),
+            models.Index(fields=['user', '-created_at', '-id']),
+            models.Index(fields=['-created_at', '-id']),
         ]
 
     
\ No newline at end of file
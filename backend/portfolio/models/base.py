@@ -1,4 +1,5 @@
 from django.db import models
+from django.conf import settings
 
 # Create your models here.
 
@@ -8,3 +9,33 @@ class TimeStampedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+def commit_uploaded_file(file_field):
+    """
+    Écrit sur le stockage un fichier uploadé qui ne l'est pas encore,
+    afin de connaître son nom définitif avant l'INSERT/UPDATE
+    (FileField.pre_save ignore ensuite les fichiers déjà enregistrés)
+    """
+    if file_field and not file_field._committed:
+        file_field.save(file_field.name, file_field.file, save=False)
+
+
+def build_media_url(file_field):
+    """Retourne l'URL complète d'un fichier uploadé"""
+    if hasattr(settings, 'SITE_URL'):
+        return f"{settings.SITE_URL}{file_field.url}"
+    return file_field.url
+
+
+def first_position(model, user_id):
+    """
+    Position d'un nouvel élément placé avant le premier de la liste d'un utilisateur
+    La ligne de l'utilisateur est verrouillée (SELECT ... FOR UPDATE) jusqu'à la fin
+    de la transaction: deux créations simultanées ne lisent pas le même minimum
+    A appeler dans transaction.atomic(), avant l'INSERT
+    """
+    user_model = model._meta.get_field('user').related_model
+    list(user_model.objects.select_for_update().filter(pk=user_id).order_by().values_list('pk', flat=True))
+    first = model.objects.filter(user_id=user_id).aggregate(first=models.Min('position'))['first']
+    return first - 1 if first is not None else 0
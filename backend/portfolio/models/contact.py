@@ -10,4 +10,20 @@ class Contact(TimeStampedModel):
     name = models.CharField(max_length=100)
     email = models.EmailField()
     message = models.TextField()
-    read = models.BooleanField(default=False)
\ No newline at end of file
+    read = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f"Message de {self.name} pour {self.user.username}"
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Contact'
+        verbose_name_plural = 'Contacts'
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id']),
+            models.Index(fields=['-created_at', '-id']),
+            # Recalcul du compteur de messages non lus
+            models.Index(fields=['user', 'read']),
+            # Synchronisation incrémentale (/api/sync/?since=)
+            models.Index(fields=['user', 'updated_at']),
+        ]
@@ -20,3 +20,9 @@ class Education(TimeStampedModel):
         ordering = ['-created_at']
         verbose_name = 'Education'
         verbose_name_plural = 'Educations'
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id']),
+            models.Index(fields=['user', '-start_date', '-id']),
+            # Synchronisation incrémentale (/api/sync/?since=)
+            models.Index(fields=['user', 'updated_at']),
+        ]
@@ -19,4 +19,9 @@ class Experience(TimeStampedModel):
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Experience'
-        verbose_name_plural = 'Experiences'
\ No newline at end of file
+        verbose_name_plural = 'Experiences'
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id']),
+            # Synchronisation incrémentale (/api/sync/?since=)
+            models.Index(fields=['user', 'updated_at']),
+        ]
@@ -0,0 +1,45 @@
+"""
+Model OutboundEmail
+"""
+
+from django.db import models
+from django.utils import timezone
+from .base import TimeStampedModel
+
+class OutboundEmail(TimeStampedModel):
+    """
+    Email en attente d'envoi (outbox)
+    Les vues se contentent d'insérer une ligne; la commande send_outbox envoie
+    les messages par lots sur une seule connexion SMTP
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'En attente'),
+        (STATUS_SENT, 'Envoyé'),
+        (STATUS_FAILED, 'Échec'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Date à partir de laquelle le message peut être (re)tenté
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Outbound Email'
+        verbose_name_plural = 'Outbound Emails'
+        indexes = [
+            # Sélection des messages à envoyer par le worker
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
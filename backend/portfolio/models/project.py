@@ -1,9 +1,9 @@
-from django.db import models
-from .base import TimeStampedModel
+from django.db import models, transaction
+from .base import TimeStampedModel, commit_uploaded_file, build_media_url, first_position
 from .user import User
 import os
 import uuid
-from django.conf import settings
+from ..images import schedule_image_variants
 
 def project_image_upload_path(instance, filename):
     """
@@ -17,6 +17,17 @@ def project_image_upload_path(instance, filename):
 Model Project
 """
 class Project(TimeStampedModel):
+    STATUS_DRAFT = 'draft'
+    STATUS_IN_PROGRESS = 'in_progress'
+    STATUS_COMPLETED = 'completed'
+    STATUS_ARCHIVED = 'archived'
+    STATUS_CHOICES = [
+        (STATUS_DRAFT, 'Brouillon'),
+        (STATUS_IN_PROGRESS, 'En cours'),
+        (STATUS_COMPLETED, 'Terminé'),
+        (STATUS_ARCHIVED, 'Archivé'),
+    ]
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='projects')
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -33,6 +44,11 @@ class Project(TimeStampedModel):
         blank=True,
         help_text="URL de l'image (généré automatiquement après upload ou URL externe)"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Variantes redimensionnées de l'image (générées automatiquement après upload)"
+    )
     
     # Technologies (JSON field pour stocker une liste)
     technologies = models.JSONField(
@@ -40,6 +56,14 @@ class Project(TimeStampedModel):
         blank=True,
         help_text="Liste des technologies utilisées dans le projet"
     )
+    # Copie normalisée et indexée de technologies (synchronisée automatiquement)
+    normalized_technologies = models.ManyToManyField(
+        'Technology',
+        through='ProjectTechnology',
+        related_name='projects',
+        blank=True,
+        editable=False
+    )
     
     # URLs optionnelles du projet
     demo_url = models.URLField(
@@ -52,30 +76,47 @@ class Project(TimeStampedModel):
         blank=True,
         help_text="URL du repository GitHub"
     )
+
+    # Seuls les projets terminés (publiés) apparaissent dans la recherche publique
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_COMPLETED,
+        help_text="Statut du projet"
+    )
+
+    # Position dans la liste de l'utilisateur (ordre croissant, modifiable par glisser-déposer)
+    position = models.IntegerField(
+        default=0,
+        help_text="Position d'affichage (les nouveaux éléments sont placés en tête)"
+    )
     
     def save(self, *args, **kwargs):
         """
         Override save pour générer automatiquement l'URL de l'image
+        et planifier la génération des variantes
+        L'URL est calculée avant l'INSERT/UPDATE: une seule écriture par sauvegarde
         """
-        super().save(*args, **kwargs)
-        
+        image_uploaded = bool(self.image) and not self.image._committed
+        # Les anciens fichiers sont supprimés par sweep_media s'ils ne sont plus référencés
+        if not self.image and self.image_variants:
+            self.image_variants = {}
+
         # Générer l'URL de l'image
         if self.image:
-            if hasattr(settings, 'SITE_URL'):
-                self.image_url = f"{settings.SITE_URL}{self.image.url}"
-            else:
-                self.image_url = self.image.url
-        
-        # Sauvegarder à nouveau si l'URL a changé
-        if self.pk and self.image:
-            Project.objects.filter(pk=self.pk).update(image_url=self.image_url)
+            commit_uploaded_file(self.image)
+            self.image_url = build_media_url(self.image)
 
-    def delete(self, *args, **kwargs):
-        """Surcharge la méthode delete pour supprimer le fichier image"""
-        if self.image:
-            if os.path.isfile(self.image.path):
-                os.remove(self.image.path)
-        super().delete(*args, **kwargs)
+        if self._state.adding:
+            # Un nouvel élément est placé avant le premier de la liste
+            with transaction.atomic():
+                self.position = first_position(Project, self.user_id)
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+
+        if image_uploaded:
+            schedule_image_variants(self, 'image', 'image_variants')
 
     @property
     def technologies_list(self):
@@ -93,8 +134,12 @@ class Project(TimeStampedModel):
     class Meta:
         verbose_name = "Project"
         verbose_name_plural = "Projects"
-        ordering = ['-created_at']
+        ordering = ['position', '-created_at']
         indexes = [
             models.Index(fields=['user']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['user', 'position', '-created_at', '-id']),
+            # Synchronisation incrémentale (/api/sync/?since=)
+            models.Index(fields=['user', 'updated_at']),
+            models.Index(fields=['user', 'status']),
         ]
\ No newline at end of file
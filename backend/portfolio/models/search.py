@@ -0,0 +1,40 @@
+"""
+Model SearchTerm
+"""
+
+from django.db import models
+from .user import User
+
+class SearchTerm(models.Model):
+    """
+    Entrée de l'index inversé de la recherche: un terme normalisé d'un document
+    (article, projet ou service) avec son poids dans ce document
+    """
+    DOCUMENT_TYPES = [
+        ('article', 'Article'),
+        ('project', 'Projet'),
+        ('service', 'Service'),
+    ]
+
+    term = models.CharField(max_length=64)
+    document_type = models.CharField(max_length=20, choices=DOCUMENT_TYPES)
+    document_id = models.PositiveBigIntegerField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='search_terms')
+    weight = models.PositiveIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.term} -> {self.document_type}:{self.document_id}"
+
+    class Meta:
+        verbose_name = 'Search Term'
+        verbose_name_plural = 'Search Terms'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['document_type', 'document_id', 'term'],
+                name='unique_search_term_per_document',
+            ),
+        ]
+        indexes = [
+            # Recherche exacte et par préfixe (LIKE 'abc%' utilise l'index B-tree)
+            models.Index(fields=['term', 'document_type']),
+        ]
@@ -1,9 +1,9 @@
-from django.db import models
-from .base import TimeStampedModel
+from django.db import models, transaction
+from .base import TimeStampedModel, commit_uploaded_file, build_media_url, first_position
 from .user import User
 import os
 import uuid
-from django.conf import settings
+from ..images import schedule_image_variants
 
 def service_icon_upload_path(instance, filename):
     """
@@ -33,6 +33,11 @@ class Service(TimeStampedModel):
         blank=True,
         help_text="URL de l'icône (généré automatiquement après upload ou URL externe)"
     )
+    icon_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Variantes redimensionnées de l'icône (générées automatiquement après upload)"
+    )
     
     # Prix du service (optionnel)
     price = models.DecimalField(
@@ -55,6 +60,12 @@ class Service(TimeStampedModel):
         default=True,
         help_text="Service disponible à la commande"
     )
+
+    # Position dans la liste de l'utilisateur (ordre croissant, modifiable par glisser-déposer)
+    position = models.IntegerField(
+        default=0,
+        help_text="Position d'affichage (les nouveaux éléments sont placés en tête)"
+    )
     
     # Tags pour catégoriser les services
     tags = models.JSONField(
@@ -62,30 +73,41 @@ class Service(TimeStampedModel):
         blank=True,
         help_text="Tags pour catégoriser le service (ex: ['web', 'design', 'mobile'])"
     )
+    # Copie normalisée et indexée de tags (synchronisée automatiquement)
+    normalized_tags = models.ManyToManyField(
+        'Tag',
+        through='ServiceTag',
+        related_name='services',
+        blank=True,
+        editable=False
+    )
 
     def save(self, *args, **kwargs):
         """
         Override save pour générer automatiquement l'URL de l'icône
+        et planifier la génération des variantes
+        L'URL est calculée avant l'INSERT/UPDATE: une seule écriture par sauvegarde
         """
-        super().save(*args, **kwargs)
-        
+        icon_uploaded = bool(self.icon) and not self.icon._committed
+        # Les anciens fichiers sont supprimés par sweep_media s'ils ne sont plus référencés
+        if not self.icon and self.icon_variants:
+            self.icon_variants = {}
+
         # Générer l'URL de l'icône
         if self.icon:
-            if hasattr(settings, 'SITE_URL'):
-                self.icon_url = f"{settings.SITE_URL}{self.icon.url}"
-            else:
-                self.icon_url = self.icon.url
-        
-        # Sauvegarder à nouveau si l'URL a changé
-        if self.pk and self.icon:
-            Service.objects.filter(pk=self.pk).update(icon_url=self.icon_url)
+            commit_uploaded_file(self.icon)
+            self.icon_url = build_media_url(self.icon)
 
-    def delete(self, *args, **kwargs):
-        """Surcharge la méthode delete pour supprimer le fichier icône"""
-        if self.icon:
-            if os.path.isfile(self.icon.path):
-                os.remove(self.icon.path)
-        super().delete(*args, **kwargs)
+        if self._state.adding:
+            # Un nouvel élément est placé avant le premier de la liste
+            with transaction.atomic():
+                self.position = first_position(Service, self.user_id)
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+
+        if icon_uploaded:
+            schedule_image_variants(self, 'icon', 'icon_variants')
 
     @property
     def tags_list(self):
@@ -125,10 +147,13 @@ class Service(TimeStampedModel):
         return f"{self.title} - {self.user.username}"
 
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['position', '-created_at']
         verbose_name = 'Service'
         verbose_name_plural = 'Services'
         indexes = [
             models.Index(fields=['user', 'is_active']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['user', 'position', '-created_at', '-id']),
+            # Synchronisation incrémentale (/api/sync/?since=)
+            models.Index(fields=['user', 'updated_at']),
         ]
\ No newline at end of file
@@ -15,4 +15,9 @@ class Skill(TimeStampedModel):
     class Meta: 
         verbose_name = "Skill"
         verbose_name_plural = "Skills"
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id']),
+            # Synchronisation incrémentale (/api/sync/?since=)
+            models.Index(fields=['user', 'updated_at']),
+        ]
@@ -17,4 +17,9 @@ class Social(TimeStampedModel):
     class Meta:
         verbose_name = "Social"
         verbose_name_plural = "Socials"
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id']),
+            # Synchronisation incrémentale (/api/sync/?since=)
+            models.Index(fields=['user', 'updated_at']),
+        ]
@@ -1,7 +1,7 @@
 from django.db import models
-from .base import TimeStampedModel
+from .base import TimeStampedModel, commit_uploaded_file, build_media_url
 import os
-from django.conf import settings
+from ..images import schedule_image_variants
 
 def social_type_logo_upload_path(instance, filename):
     """
@@ -29,6 +29,11 @@ class SocialType(TimeStampedModel):
         blank=True,
         help_text="URL du logo (généré automatiquement après upload ou URL externe)"
     )
+    logo_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Variantes redimensionnées du logo (générées automatiquement après upload)"
+    )
     label = models.CharField(max_length=100, unique=True)
 
     def __str__(self):
@@ -37,33 +42,28 @@ class SocialType(TimeStampedModel):
     def save(self, *args, **kwargs):
         """
         Override save pour générer automatiquement l'URL du logo
+        et planifier la génération des variantes
+        L'URL est calculée avant l'INSERT/UPDATE: une seule requête par sauvegarde
         """
-        super().save(*args, **kwargs)
-        
-        # Si un logo a été uploadé, générer l'URL complète
-        if self.logo:
-            # Construire l'URL complète
-            if hasattr(settings, 'SITE_URL'):
-                self.logo_url = f"{settings.SITE_URL}{self.logo.url}"
-            else:
-                # Fallback si SITE_URL n'est pas défini
-                self.logo_url = self.logo.url
-            
-            # Sauvegarder à nouveau si l'URL a changé
-            if self.pk:  # Éviter la récursion infinie
-                SocialType.objects.filter(pk=self.pk).update(logo_url=self.logo_url)
+        logo_uploaded = bool(self.logo) and not self.logo._committed
+        # Les anciens fichiers sont supprimés par sweep_media s'ils ne sont plus référencés
+        if not self.logo and self.logo_variants:
+            self.logo_variants = {}
 
-    def delete(self, *args, **kwargs):
-        """
-        Override delete pour supprimer le fichier logo du disque
-        """
+        # Générer l'URL du logo
         if self.logo:
-            # Supprimer le fichier physique
-            if os.path.isfile(self.logo.path):
-                os.remove(self.logo.path)
-        super().delete(*args, **kwargs)
-    
+            commit_uploaded_file(self.logo)
+            self.logo_url = build_media_url(self.logo)
+
+        super().save(*args, **kwargs)
+
+        if logo_uploaded:
+            schedule_image_variants(self, 'logo', 'logo_variants')
+
     class Meta:
         verbose_name = "Social Type"
         verbose_name_plural = "Social Types"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
@@ -0,0 +1,74 @@
+"""
+Models Tag / Technology
+
+Tables normalisées des tags des services et des technologies des projets.
+Elles sont synchronisées avec les JSONField Service.tags et Project.technologies
+(voir portfolio/tags.py) pour que le filtrage et les facettes passent par des
+index au lieu de parcourir les listes JSON de toutes les lignes.
+"""
+
+from django.db import models
+from .base import TimeStampedModel
+from .project import Project
+from .service import Service
+
+class Tag(TimeStampedModel):
+    # Nom normalisé (minuscules, sans espaces superflus)
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = 'Tag'
+        verbose_name_plural = 'Tags'
+        ordering = ['name']
+
+
+class ServiceTag(models.Model):
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='service_tags')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='service_tags')
+
+    def __str__(self):
+        return f"{self.service_id} - {self.tag_id}"
+
+    class Meta:
+        verbose_name = 'Service Tag'
+        verbose_name_plural = 'Service Tags'
+        constraints = [
+            models.UniqueConstraint(fields=['service', 'tag'], name='unique_service_tag'),
+        ]
+        indexes = [
+            models.Index(fields=['tag', 'service']),
+        ]
+
+
+class Technology(TimeStampedModel):
+    # Nom normalisé (minuscules, sans espaces superflus)
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = 'Technology'
+        verbose_name_plural = 'Technologies'
+        ordering = ['name']
+
+
+class ProjectTechnology(models.Model):
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='project_technologies')
+    technology = models.ForeignKey(Technology, on_delete=models.CASCADE, related_name='project_technologies')
+
+    def __str__(self):
+        return f"{self.project_id} - {self.technology_id}"
+
+    class Meta:
+        verbose_name = 'Project Technology'
+        verbose_name_plural = 'Project Technologies'
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'technology'], name='unique_project_technology'),
+        ]
+        indexes = [
+            models.Index(fields=['technology', 'project']),
+        ]
@@ -0,0 +1,28 @@
+"""
+Model Tombstone
+"""
+
+from django.db import models
+
+class Tombstone(models.Model):
+    """
+    Trace d'une suppression pour la synchronisation incrémentale (/api/sync/)
+    user_id n'est pas une clé étrangère: la trace doit pouvoir être écrite
+    pendant la suppression en cascade d'un utilisateur
+    """
+    section = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    user_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.section}:{self.object_id} supprimé le {self.deleted_at}"
+
+    class Meta:
+        verbose_name = 'Tombstone'
+        verbose_name_plural = 'Tombstones'
+        indexes = [
+            models.Index(fields=['user_id', 'deleted_at']),
+            # Purge des traces expirées
+            models.Index(fields=['deleted_at']),
+        ]
@@ -1,9 +1,10 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
-from .base import TimeStampedModel
+from .base import TimeStampedModel, commit_uploaded_file, build_media_url
 import uuid
 import os
-from django.conf import settings
+from ..images import schedule_image_variants
+from .. import hashing
 
 def user_profile_image_upload_path(instance, filename):
     """
@@ -43,6 +44,11 @@ class User(AbstractUser):
         blank=True,
         help_text="URL de l'image de profil (généré automatiquement après upload ou URL externe)"
     )
+    profile_image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Variantes redimensionnées de l'image de profil (générées automatiquement après upload)"
+    )
     
     banner = models.ImageField(
         upload_to=user_banner_upload_path,
@@ -55,6 +61,11 @@ class User(AbstractUser):
         blank=True,
         help_text="URL de la bannière (généré automatiquement après upload ou URL externe)"
     )
+    banner_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Variantes redimensionnées de la bannière (générées automatiquement après upload)"
+    )
     
     is_verified = models.BooleanField(default=True)
     
@@ -66,6 +77,20 @@ class User(AbstractUser):
     brief_description = models.CharField(max_length=200, blank=True)
     house_number = models.CharField(max_length=10, blank=True)
     phone_number = models.CharField(max_length=20, blank=True)
+
+    # Messages de contact: compteur dénormalisé des non lus (tenu à jour par
+    # portfolio.contacts) et résumé périodique par email
+    DIGEST_NONE = 'none'
+    DIGEST_DAILY = 'daily'
+    DIGEST_WEEKLY = 'weekly'
+    DIGEST_CHOICES = [
+        (DIGEST_NONE, 'Aucun'),
+        (DIGEST_DAILY, 'Quotidien'),
+        (DIGEST_WEEKLY, 'Hebdomadaire'),
+    ]
+    unread_contacts_count = models.PositiveIntegerField(default=0, editable=False)
+    contact_digest = models.CharField(max_length=10, choices=DIGEST_CHOICES, default=DIGEST_NONE)
+    contact_digest_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
     
     # Timestamps (pas besoin de redéfinir, AbstractUser les a déjà via date_joined)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -77,43 +102,65 @@ class User(AbstractUser):
     def save(self, *args, **kwargs):
         """
         Override save pour générer automatiquement les URLs des images
+        et planifier la génération des variantes
+        Les URLs sont calculées avant l'INSERT/UPDATE: une seule requête par sauvegarde
         """
-        super().save(*args, **kwargs)
-        
+        profile_image_uploaded = bool(self.profile_image) and not self.profile_image._committed
+        banner_uploaded = bool(self.banner) and not self.banner._committed
+        # Les anciens fichiers sont supprimés par sweep_media s'ils ne sont plus référencés
+        if not self.profile_image and self.profile_image_variants:
+            self.profile_image_variants = {}
+        if not self.banner and self.banner_variants:
+            self.banner_variants = {}
+
         # Générer l'URL de l'image de profil
         if self.profile_image:
-            if hasattr(settings, 'SITE_URL'):
-                self.profile_image_url = f"{settings.SITE_URL}{self.profile_image.url}"
-            else:
-                self.profile_image_url = self.profile_image.url
-        
+            commit_uploaded_file(self.profile_image)
+            self.profile_image_url = build_media_url(self.profile_image)
+
         # Générer l'URL de la bannière
         if self.banner:
-            if hasattr(settings, 'SITE_URL'):
-                self.banner_url = f"{settings.SITE_URL}{self.banner.url}"
-            else:
-                self.banner_url = self.banner.url
-        
-        # Sauvegarder à nouveau si les URLs ont changé
-        if self.pk and (self.profile_image or self.banner):
-            User.objects.filter(pk=self.pk).update(
-                profile_image_url=self.profile_image_url,
-                banner_url=self.banner_url
-            )
+            commit_uploaded_file(self.banner)
+            self.banner_url = build_media_url(self.banner)
+
+        super().save(*args, **kwargs)
+
+        if profile_image_uploaded:
+            schedule_image_variants(self, 'profile_image', 'profile_image_variants')
+        if banner_uploaded:
+            schedule_image_variants(self, 'banner', 'banner_variants')
+
+    def set_password(self, raw_password):
+        """Hash calculé dans le pool de portfolio.hashing"""
+        self.password = hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """
+        Vérification dans le pool de portfolio.hashing; un hash d'un autre
+        algorithme ou d'un autre coût que le hasher préféré est recalculé
+        """
+        def setter(raw_password):
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=['password'])
+
+        return hashing.check_password(raw_password, self.password, setter)
+
+    def refresh_from_db(self, using=None, fields=None):
+        """
+        Instance partielle (voir portfolio.authentication): le premier champ
+        différé lu charge tous les champs différés en une seule requête
+        """
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields)
 
     def delete(self, *args, **kwargs):
-        """Surcharge la méthode delete pour gérer les contraintes et supprimer les fichiers"""
+        """Surcharge la méthode delete pour gérer les contraintes (les fichiers sont supprimés par sweep_media)"""
         from django.contrib.admin.models import LogEntry
         
-        # Supprimer les fichiers images
-        if self.profile_image:
-            if os.path.isfile(self.profile_image.path):
-                os.remove(self.profile_image.path)
-        
-        if self.banner:
-            if os.path.isfile(self.banner.path):
-                os.remove(self.banner.path)
-        
         # Supprimer d'abord les logs admin liés à cet utilisateur
         LogEntry.objects.filter(user=self).delete()
         
@@ -148,6 +195,9 @@ class User(AbstractUser):
             models.Index(fields=['email']),
             models.Index(fields=['username']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['-created_at', '-id']),
+            # Sélection des résumés à envoyer (send_contact_digests)
+            models.Index(fields=['contact_digest', 'contact_digest_sent_at']),
         ]
         
 
@@ -162,5 +212,7 @@ class PasswordResetToken(models.Model):
         indexes = [
             models.Index(fields=['token']),
             models.Index(fields=['user', 'is_used']),
+            # Purge des jetons expirés (portfolio.housekeeping)
+            models.Index(fields=['created_at']),
         ]
 
@@ -0,0 +1,131 @@
+"""
+Envoi différé des emails (outbox)
+
+queue_email() enregistre le message (un INSERT) au lieu de l'envoyer pendant
+la requête. send_pending(), appelée par la commande send_outbox, envoie les
+messages dus par lots sur une seule connexion SMTP; un échec est retenté avec
+un délai croissant (backoff exponentiel) jusqu'à PORTFOLIO_OUTBOX_MAX_ATTEMPTS.
+Le corps d'un message envoyé est effacé (il peut contenir un lien de
+réinitialisation de mot de passe); celui d'un message en échec l'est par
+purge_expired_tokens() une fois le lien expiré.
+"""
+
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_ATTEMPTS = 5
+# Délai avant la première nouvelle tentative, doublé à chaque échec
+DEFAULT_RETRY_DELAY = 60
+MAX_RETRY_DELAY = 6 * 3600
+# Durée pendant laquelle un lot réservé par un worker est ignoré par les autres
+CLAIM_TIMEOUT = 600
+
+
+def queue_email(subject, body, recipients, from_email=None):
+    """Ajoute un email à l'outbox"""
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=body,
+        recipients=list(recipients),
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+    )
+
+
+def retry_delay(attempts):
+    """Délai avant la tentative suivante après `attempts` échecs"""
+    base = getattr(settings, 'PORTFOLIO_OUTBOX_RETRY_DELAY', DEFAULT_RETRY_DELAY)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), MAX_RETRY_DELAY))
+
+
+def claim_batch(batch_size):
+    """
+    Réserve un lot de messages dus: leur prochaine tentative est repoussée
+    de CLAIM_TIMEOUT, ce qui les masque aux autres workers pendant l'envoi
+    (et les remet en file si ce worker s'arrête en cours de route)
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        queryset = OutboundEmail.objects.filter(
+            status=OutboundEmail.STATUS_PENDING, next_attempt_at__lte=now
+        ).order_by('next_attempt_at', 'id')
+        if db_connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        messages = list(queryset[:batch_size])
+        if messages:
+            OutboundEmail.objects.filter(pk__in=[message.pk for message in messages]).update(
+                next_attempt_at=now + timedelta(seconds=CLAIM_TIMEOUT)
+            )
+    return messages
+
+
+def send_pending(batch_size=None):
+    """
+    Envoie un lot de messages dus sur une seule connexion
+    Retourne (nombre envoyés, nombre en échec)
+    """
+    batch_size = batch_size or getattr(settings, 'PORTFOLIO_OUTBOX_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    max_attempts = getattr(settings, 'PORTFOLIO_OUTBOX_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+    messages = claim_batch(batch_size)
+    if not messages:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        # Serveur injoignable: tout le lot est retenté plus tard
+        logger.warning("Connexion SMTP impossible: %s", e)
+        for message in messages:
+            mark_failed(message, e, max_attempts)
+        OutboundEmail.objects.bulk_update(messages, ['status', 'attempts', 'next_attempt_at', 'last_error', 'updated_at'])
+        return 0, len(messages)
+
+    try:
+        for message in messages:
+            email = EmailMessage(
+                message.subject, message.body, message.from_email or None, message.recipients,
+                connection=connection,
+            )
+            try:
+                email.send()
+            except Exception as e:
+                logger.warning("Échec d'envoi de l'email %s (tentative %d): %s", message.pk, message.attempts + 1, e)
+                mark_failed(message, e, max_attempts)
+                failed += 1
+            else:
+                message.status = OutboundEmail.STATUS_SENT
+                message.attempts += 1
+                message.sent_at = timezone.now()
+                message.last_error = ''
+                # Le corps peut contenir un lien de réinitialisation encore valide:
+                # il n'est pas conservé une fois le message parti
+                message.body = ''
+                sent += 1
+            # Statut enregistré message par message: si le worker s'arrête en cours
+            # de lot, les messages déjà partis ne sont pas renvoyés
+            message.save(update_fields=[
+                'status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at', 'body', 'updated_at',
+            ])
+    finally:
+        connection.close()
+
+    return sent, failed
+
+
+def mark_failed(message, error, max_attempts):
+    message.attempts += 1
+    message.last_error = str(error)[:1000]
+    message.updated_at = timezone.now()
+    if message.attempts >= max_attempts:
+        message.status = OutboundEmail.STATUS_FAILED
+    else:
+        message.next_attempt_at = timezone.now() + retry_delay(message.attempts)
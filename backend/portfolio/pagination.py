@@ -0,0 +1,39 @@
+"""
+Pagination par curseur (keyset) pour toutes les listes de l'API
+
+Le curseur encode la position dans l'ordre (-created_at, -id): chaque page
+est une requête indexée "WHERE created_at < position LIMIT n", dont le coût
+ne dépend pas du nombre de lignes déjà parcourues.
+Exception: les listes ordonnées par l'utilisateur (projets, services) sont
+paginées par décalage (voir PositionPagination).
+"""
+
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+class CreatedAtCursorPagination(CursorPagination):
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class StartDateCursorPagination(CreatedAtCursorPagination):
+    """Pagination des formations/expériences dans l'ordre chronologique inverse"""
+    ordering = ('-start_date', '-id')
+
+
+class PositionPagination(LimitOffsetPagination):
+    """
+    Pagination des projets/services dans l'ordre choisi par l'utilisateur
+    Le curseur DRF n'encode que le premier champ de l'ordre: position est
+    modifiable et peut être dupliquée, un curseur sur elle sauterait ou
+    répéterait des éléments. Ces listes sont courtes (les éléments d'un
+    utilisateur): un décalage (offset) sur un ordre total suffit.
+    """
+    ordering = ('position', '-created_at', '-id')
+    default_limit = 50
+    limit_query_param = 'page_size'
+    max_limit = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return super().paginate_queryset(queryset.order_by(*self.ordering), request, view)
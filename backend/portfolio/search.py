@@ -0,0 +1,281 @@
+"""
+Moteur de recherche plein texte
+
+Index inversé stocké dans la table SearchTerm: chaque document (article publié,
+projet terminé, service actif) y est découpé en termes normalisés (minuscules, sans
+accents) pondérés par champ. L'index est mis à jour à chaque sauvegarde ou
+suppression, et une recherche ne lit que les entrées des termes demandés au
+lieu de parcourir les champs texte de toutes les tables.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Max, Value, When
+from django.db.models.functions import Ln
+from .models import Article, Project, Service, SearchTerm
+
+# Poids de chaque champ indexé: un terme du titre compte plus qu'un terme du corps
+DOCUMENT_FIELDS = {
+    'article': (Article, {'title': 3, 'content': 1}),
+    'project': (Project, {'title': 3, 'technologies': 2, 'description': 1}),
+    'service': (Service, {'title': 3, 'tags': 2, 'description': 1}),
+}
+
+# Champs décidant si un document est public (voir is_searchable)
+VISIBILITY_FIELDS = {'is_published', 'is_active', 'status'}
+
+# Champ utilisé pour l'extrait affiché dans les résultats
+EXCERPT_FIELDS = {'article': 'content', 'project': 'description', 'service': 'description'}
+EXCERPT_LENGTH = 200
+
+STOP_WORDS = frozenset("""
+    au aux avec ce ces dans de des du elle en et eux il je la le les leur lui ma mais me meme
+    mes moi mon ne nos notre nous on ou par pas pour qu que qui sa se ses son sur ta te tes toi
+    ton tu un une vos votre vous est sont ete etre
+    a an and are as at be by for from has in is it its of on or that the to was were will with
+""".split())
+
+TERM_MAX_LENGTH = 64
+# Longueur minimale d'un mot de la requête pour la recherche par préfixe
+PREFIX_MIN_LENGTH = 2
+# Nombre maximal de termes de l'index retenus pour un préfixe
+PREFIX_MAX_EXPANSIONS = 50
+# Un terme trouvé par préfixe compte moitié moins qu'un terme exact
+PREFIX_MATCH_FACTOR = 0.5
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+TOKEN_RE = re.compile(r'[a-z0-9]+(?:[+#]+|(?:\.[a-z0-9]+)*)')
+
+
+def normalize(text):
+    """Met le texte en minuscules et retire les accents"""
+    text = unicodedata.normalize('NFKD', str(text))
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text):
+    """Découpe un texte en termes indexables (ex: 'Node.js', 'C++' et 'C#' sont conservés)"""
+    return [
+        token for token in TOKEN_RE.findall(normalize(text))
+        if len(token) >= 2 and len(token) <= TERM_MAX_LENGTH and token not in STOP_WORDS
+    ]
+
+
+def field_text(value):
+    """Texte d'un champ indexé (les JSONField technologies/tags sont des listes)"""
+    if isinstance(value, (list, tuple)):
+        return ' '.join(str(item) for item in value)
+    return value or ''
+
+
+def is_searchable(document_type, instance):
+    """Seuls les contenus publics sont indexés"""
+    if document_type == 'article':
+        return instance.is_published
+    if document_type == 'service':
+        return instance.is_active
+    if document_type == 'project':
+        return instance.status == Project.STATUS_COMPLETED
+    return False
+
+
+def document_type_for(model):
+    for document_type, (document_model, _) in DOCUMENT_FIELDS.items():
+        if issubclass(model, document_model):
+            return document_type
+    return None
+
+
+def build_terms(document_type, instance):
+    """Retourne {terme: poids} pour un document"""
+    _, fields = DOCUMENT_FIELDS[document_type]
+    terms = Counter()
+    for field, weight in fields.items():
+        for token in tokenize(field_text(getattr(instance, field))):
+            terms[token] += weight
+    return terms
+
+
+def build_entries(instance):
+    """Entrées de l'index d'un document (aucune s'il n'est pas public)"""
+    document_type = document_type_for(type(instance))
+    if not is_searchable(document_type, instance):
+        return []
+    return [
+        SearchTerm(
+            term=term,
+            document_type=document_type,
+            document_id=instance.pk,
+            user_id=instance.user_id,
+            weight=weight,
+        )
+        for term, weight in build_terms(document_type, instance).items()
+    ]
+
+
+def index_document(instance, created=False):
+    """
+    (Ré)indexe un document: ses anciennes entrées sont remplacées
+    Un document qui vient d'être créé n'a pas encore d'entrées à supprimer
+    """
+    entries = build_entries(instance)
+    if created:
+        SearchTerm.objects.bulk_create(entries)
+        return
+    with transaction.atomic():
+        SearchTerm.objects.filter(document_type=document_type_for(type(instance)), document_id=instance.pk).delete()
+        SearchTerm.objects.bulk_create(entries)
+
+
+def remove_document(instance):
+    """Retire un document de l'index"""
+    document_type = document_type_for(type(instance))
+    SearchTerm.objects.filter(document_type=document_type, document_id=instance.pk).delete()
+
+
+def reindex_documents(queryset):
+    """Réindexe les documents d'un queryset (après un queryset.update() qui n'émet pas de signal)"""
+    for instance in queryset.iterator():
+        index_document(instance)
+
+
+def rebuild_index(batch_size=1000):
+    """Reconstruit tout l'index par lots. Retourne le nombre de documents indexés"""
+    count = 0
+    with transaction.atomic():
+        SearchTerm.objects.all().delete()
+        entries = []
+        for model, _ in DOCUMENT_FIELDS.values():
+            for instance in model.objects.order_by().iterator():
+                entries.extend(build_entries(instance))
+                count += 1
+                if len(entries) >= batch_size:
+                    SearchTerm.objects.bulk_create(entries, batch_size=batch_size)
+                    entries = []
+        SearchTerm.objects.bulk_create(entries, batch_size=batch_size)
+    return count
+
+
+def expand_query(tokens, base_queryset):
+    """
+    Associe chaque mot de la requête aux termes de l'index qu'il désigne:
+    le terme exact et, si le mot est assez long, les termes qui commencent par lui
+    Retourne {mot: {terme: facteur}}
+    """
+    expansions = {}
+    for token in tokens:
+        matches = {token: 1.0}
+        if len(token) >= PREFIX_MIN_LENGTH:
+            # Les termes sont déjà normalisés en minuscules: LIKE 'abc%' utilise l'index
+            prefixed = (
+                base_queryset.filter(term__istartswith=token)
+                .exclude(term=token)
+                .values_list('term', flat=True)
+                .distinct()
+                .order_by('term')[:PREFIX_MAX_EXPANSIONS]
+            )
+            for term in prefixed:
+                matches[term] = PREFIX_MATCH_FACTOR
+        expansions[token] = matches
+    return expansions
+
+
+def rank_documents(expansions, base_queryset, limit):
+    """
+    Calcule le score de chaque document contenant tous les mots de la requête
+    Score d'un mot = meilleur (1 + log(poids)) * facteur * idf parmi ses termes,
+    où les termes rares (présents dans peu de documents) pèsent davantage
+    Le regroupement par document, le tri et la limite sont faits par la base:
+    seuls les `limit` meilleurs documents sont lus
+    Retourne (nombre de documents trouvés, [(score, type, id)] triés par pertinence)
+    """
+    all_terms = set()
+    for matches in expansions.values():
+        all_terms.update(matches)
+
+    # Nombre de documents par terme (un terme n'a qu'une entrée par document)
+    frequencies = dict(
+        base_queryset.filter(term__in=all_terms).order_by()
+        .values('term').annotate(documents=Count('pk')).values_list('term', 'documents')
+    )
+
+    # Un agrégat par mot: son meilleur score dans chaque document, NULL si absent
+    token_scores = {}
+    for index, matches in enumerate(expansions.values()):
+        whens = [
+            When(term=term, then=(Value(1.0) + Ln('weight')) * Value(factor / math.log(2 + frequencies[term])))
+            for term, factor in matches.items() if term in frequencies
+        ]
+        if not whens:
+            return 0, []
+        token_scores[f'token_{index}'] = Max(Case(*whens, output_field=FloatField()))
+
+    documents = (
+        base_queryset.filter(term__in=frequencies).order_by()
+        .values('document_type', 'document_id')
+        .annotate(**token_scores)
+        # Tous les mots de la requête doivent être présents
+        .filter(**{f'{name}__isnull': False for name in token_scores})
+        .annotate(score=sum((F(name) for name in token_scores), Value(0.0)))
+    )
+    page = documents.order_by('-score', '-document_id')[:limit]
+    ranked = [(row['score'], row['document_type'], row['document_id']) for row in page]
+    count = len(ranked) if len(ranked) < limit else documents.count()
+    return count, ranked
+
+
+def excerpt(text):
+    text = ' '.join(str(text or '').split())
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    return text[:EXCERPT_LENGTH].rsplit(' ', 1)[0] + '…'
+
+
+def search(query, document_types=None, user_id=None, limit=DEFAULT_LIMIT):
+    """
+    Recherche les documents correspondant à la requête
+    Retourne (nombre total de résultats, liste des résultats de la page)
+    """
+    tokens = list(dict.fromkeys(tokenize(query)))
+    if not tokens:
+        return 0, []
+
+    base_queryset = SearchTerm.objects.all()
+    if document_types:
+        base_queryset = base_queryset.filter(document_type__in=document_types)
+    if user_id is not None:
+        base_queryset = base_queryset.filter(user_id=user_id)
+
+    count, page = rank_documents(expand_query(tokens, base_queryset), base_queryset, limit)
+
+    # Chargement des documents de la page: une requête par type
+    ids_by_type = defaultdict(list)
+    for _, document_type, document_id in page:
+        ids_by_type[document_type].append(document_id)
+    documents = {}
+    for document_type, ids in ids_by_type.items():
+        model, _ = DOCUMENT_FIELDS[document_type]
+        excerpt_field = EXCERPT_FIELDS[document_type]
+        for instance in model.objects.filter(pk__in=ids).only('id', 'user_id', 'title', excerpt_field, 'created_at'):
+            documents[(document_type, instance.pk)] = instance
+
+    results = []
+    for score, document_type, document_id in page:
+        instance = documents.get((document_type, document_id))
+        if instance is None:
+            continue
+        results.append({
+            'type': document_type,
+            'id': instance.pk,
+            'user_id': instance.user_id,
+            'title': instance.title,
+            'excerpt': excerpt(getattr(instance, EXCERPT_FIELDS[document_type])),
+            'created_at': instance.created_at,
+            'score': round(score, 4),
+        })
+    return count, results
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from portfolio.models import User, PasswordResetToken
-import os
+from portfolio.images import build_variant_urls
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
@@ -45,13 +45,16 @@ class UserLoginSerializer(serializers.Serializer):
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
-    # Champs pour l'upload
-    profile_image_file = serializers.ImageField(source='profile_image', write_only=True, required=False)
-    banner_file = serializers.ImageField(source='banner', write_only=True, required=False)
+    # Champs pour l'upload (FileField: le contenu est validé dans la vue par
+    # validate_image_file, qui ne lit que l'en-tête, au lieu d'un décodage complet)
+    profile_image_file = serializers.FileField(source='profile_image', write_only=True, required=False)
+    banner_file = serializers.FileField(source='banner', write_only=True, required=False)
     
     # URLs en lecture seule
     profile_image_url = serializers.URLField(read_only=True)
     banner_url = serializers.URLField(read_only=True)
+    profile_image_variants = serializers.SerializerMethodField()
+    banner_variants = serializers.SerializerMethodField()
     
     # Informations supplémentaires
     full_name = serializers.CharField(read_only=True)
@@ -61,29 +64,21 @@ class UserProfileSerializer(serializers.ModelSerializer):
         model = User
         fields = [
             'id', 'email', 'username', 'first_name', 'last_name', 'bio', 'brief_description',
-            'profile_image_file', 'profile_image_url', 'banner_file', 'banner_url',
+            'profile_image_file', 'profile_image_url', 'profile_image_variants',
+            'banner_file', 'banner_url', 'banner_variants',
             'country', 'city', 'postal_code', 'street', 'house_number', 'phone_number',
             'is_verified', 'full_name', 'full_address', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'email', 'profile_image_url', 'banner_url', 'created_at', 'updated_at']
 
-    def update(self, instance, validated_data):
-        """
-        Mettre à jour un utilisateur avec gestion des images
-        """
-        # Gérer la suppression de l'ancienne image de profil
-        if 'profile_image' in validated_data and instance.profile_image:
-            old_profile_image = instance.profile_image
-            if old_profile_image and os.path.isfile(old_profile_image.path):
-                os.remove(old_profile_image.path)
-        
-        # Gérer la suppression de l'ancienne bannière
-        if 'banner' in validated_data and instance.banner:
-            old_banner = instance.banner
-            if old_banner and os.path.isfile(old_banner.path):
-                os.remove(old_banner.path)
-        
-        return super().update(instance, validated_data)
+    def get_profile_image_variants(self, obj):
+        """URLs des variantes redimensionnées de l'image de profil"""
+        return build_variant_urls(obj.profile_image_variants)
+
+    def get_banner_variants(self, obj):
+        """URLs des variantes redimensionnées de la bannière"""
+        return build_variant_urls(obj.banner_variants)
+
 
 
 class PasswordResetSerializer(serializers.Serializer):
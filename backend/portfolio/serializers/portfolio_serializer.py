@@ -0,0 +1,24 @@
+from .auth_serializer import UserProfileSerializer
+from .project_serializer import ProjectSerializer
+from .service_serializer import ServiceSerializer
+from .social_serializer import SocialSerializer
+from .education_serializer import EducationSerializer
+from .experience_serializer import ExperienceSerializer
+from .skill_serializer import SkillSerializer
+
+class PortfolioSerializer(UserProfileSerializer):
+    """
+    Profil public d'un utilisateur avec toutes les sections du portfolio.
+    Les relations doivent être préchargées (prefetch_related) par la vue.
+    """
+    projects = ProjectSerializer(many=True, read_only=True)
+    services = ServiceSerializer(many=True, read_only=True)
+    socials = SocialSerializer(many=True, read_only=True)
+    educations = EducationSerializer(many=True, read_only=True)
+    experiences = ExperienceSerializer(many=True, read_only=True)
+    skills = SkillSerializer(many=True, read_only=True)
+
+    class Meta(UserProfileSerializer.Meta):
+        fields = UserProfileSerializer.Meta.fields + [
+            'projects', 'services', 'socials', 'educations', 'experiences', 'skills'
+        ]
@@ -1,13 +1,16 @@
 from rest_framework import serializers
 from ..models.project import Project
+from ..images import build_variant_urls
 import os
 
 class ProjectSerializer(serializers.ModelSerializer):
-    # Champs pour l'upload
-    image_file = serializers.ImageField(source='image', write_only=True, required=False)
+    # Champs pour l'upload (FileField: le contenu est validé dans la vue par
+    # validate_image_file, qui ne lit que l'en-tête, au lieu d'un décodage complet)
+    image_file = serializers.FileField(source='image', write_only=True, required=False)
     
     # URLs en lecture seule
     image_url = serializers.URLField(read_only=True)
+    image_variants = serializers.SerializerMethodField()
     
     # Informations utilisateur
     user_name = serializers.CharField(source='user.username', read_only=True)
@@ -19,10 +22,14 @@ class ProjectSerializer(serializers.ModelSerializer):
         model = Project
         fields = [
             'id', 'user', 'user_name', 'title', 'description',
-            'image_file', 'image_url', 'technologies', 'technologies_string',
-            'demo_url', 'github_url', 'created_at', 'updated_at'
+            'image_file', 'image_url', 'image_variants', 'technologies', 'technologies_string',
+            'demo_url', 'github_url', 'status', 'position', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['user', 'created_at', 'updated_at']
+        read_only_fields = ['user', 'position', 'created_at', 'updated_at']
+
+    def get_image_variants(self, obj):
+        """URLs des variantes redimensionnées de l'image"""
+        return build_variant_urls(obj.image_variants)
 
     def validate_technologies(self, value):
         """Valide que technologies est une liste"""
@@ -30,12 +37,6 @@ class ProjectSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Technologies doit être une liste")
         return value
 
-    def validate_order(self, value):
-        """Valide que l'ordre est positif"""
-        if value < 0:
-            raise serializers.ValidationError("L'ordre doit être un nombre positif")
-        return value
-
     def update(self, instance, validated_data):
         """
         Mettre à jour un projet avec gestion de l'image
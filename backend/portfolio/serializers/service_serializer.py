@@ -1,13 +1,16 @@
 from rest_framework import serializers
 from ..models.service import Service
+from ..images import build_variant_urls
 import os
 
 class ServiceSerializer(serializers.ModelSerializer):
-    # Champs pour l'upload
-    icon_file = serializers.ImageField(source='icon', write_only=True, required=False)
+    # Champs pour l'upload (FileField: le contenu est validé dans la vue par
+    # validate_image_file, qui ne lit que l'en-tête, au lieu d'un décodage complet)
+    icon_file = serializers.FileField(source='icon', write_only=True, required=False)
     
     # URLs et informations en lecture seule
     icon_url = serializers.URLField(read_only=True)
+    icon_variants = serializers.SerializerMethodField()
     user_name = serializers.CharField(source='user.username', read_only=True)
     tags_string = serializers.CharField(read_only=True)
     price_display = serializers.CharField(read_only=True)
@@ -17,11 +20,15 @@ class ServiceSerializer(serializers.ModelSerializer):
         model = Service
         fields = [
             'id', 'user', 'user_name', 'title', 'description',
-            'icon_file', 'icon_url', 'price', 'price_display',
+            'icon_file', 'icon_url', 'icon_variants', 'price', 'price_display',
             'duration_hours', 'duration_display', 'is_active',
-            'tags', 'tags_string', 'created_at', 'updated_at'
+            'tags', 'tags_string', 'position', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['user', 'created_at', 'updated_at']
+        read_only_fields = ['user', 'position', 'created_at', 'updated_at']
+
+    def get_icon_variants(self, obj):
+        """URLs des variantes redimensionnées de l'icône"""
+        return build_variant_urls(obj.icon_variants)
 
     def validate_tags(self, value):
         """Valide que tags est une liste"""
@@ -41,12 +48,6 @@ class ServiceSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("La durée doit être positive")
         return value
 
-    def validate_order(self, value):
-        """Valide que l'ordre est positif"""
-        if value < 0:
-            raise serializers.ValidationError("L'ordre doit être un nombre positif")
-        return value
-
     def update(self, instance, validated_data):
         """
         Mettre à jour un service avec gestion de l'icône
@@ -1,16 +1,22 @@
 from rest_framework import serializers
 from ..models.social_type import SocialType
+from ..images import build_variant_urls
 import os
 
 class SocialTypeSerializer(serializers.ModelSerializer):
     logo_file = serializers.ImageField(source='logo', write_only=True, required=False)
     logo_url = serializers.URLField(read_only=True)
+    logo_variants = serializers.SerializerMethodField()
     
     class Meta:
         model = SocialType
-        fields = ['id', 'label', 'logo_file', 'logo_url', 'created_at', 'updated_at']
+        fields = ['id', 'label', 'logo_file', 'logo_url', 'logo_variants', 'created_at', 'updated_at']
         read_only_fields = ['logo_url', 'created_at', 'updated_at']
 
+    def get_logo_variants(self, obj):
+        """URLs des variantes redimensionnées du logo"""
+        return build_variant_urls(obj.logo_variants)
+
     def create(self, validated_data):
         """
         Créer un SocialType avec gestion du logo
@@ -0,0 +1,115 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from .authentication import forget_user
+from .cache import bump_user_cache_version
+from . import search
+from .tags import sync_service_tags, sync_project_technologies
+from .contacts import increment_unread_count, refresh_unread_counts
+from .sync import SYNC_SECTIONS, record_deletion
+from .models import (
+    User,
+    SocialType,
+    Social,
+    Project,
+    Service,
+    Education,
+    Experience,
+    Skill,
+    Article,
+    Contact,
+)
+
+# Modèles dont les lignes appartiennent à un utilisateur et apparaissent dans son portfolio public
+USER_SECTION_MODELS = (Project, Service, Social, Education, Experience, Skill)
+
+
+def invalidate_user_cache(user_id):
+    """Incrémente la version du cache de l'utilisateur une fois la transaction validée"""
+    transaction.on_commit(lambda: bump_user_cache_version(user_id))
+
+
+def user_section_changed(sender, instance, **kwargs):
+    invalidate_user_cache(instance.user_id)
+
+
+def user_changed(sender, instance, **kwargs):
+    invalidate_user_cache(instance.pk)
+    # Champs d'authentification en cache (is_active, is_staff...)
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_user(user_id))
+
+
+def search_document_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    """Réindexe le document, sauf si seuls des champs non indexés ont été sauvegardés"""
+    document_type = search.document_type_for(sender)
+    indexed_fields = set(search.DOCUMENT_FIELDS[document_type][1]) | search.VISIBILITY_FIELDS
+    if update_fields is not None and not indexed_fields.intersection(update_fields):
+        return
+    search.index_document(instance, created=created)
+
+
+def search_document_deleted(sender, instance, **kwargs):
+    search.remove_document(instance)
+
+
+def service_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    """Synchronise la table ServiceTag avec Service.tags"""
+    if update_fields is None or 'tags' in update_fields:
+        sync_service_tags(instance, created=created)
+
+
+def project_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    """Synchronise la table ProjectTechnology avec Project.technologies"""
+    if update_fields is None or 'technologies' in update_fields:
+        sync_project_technologies(instance, created=created)
+
+
+def contact_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    """Tient à jour le compteur de messages non lus du destinataire"""
+    if created:
+        if not instance.read:
+            increment_unread_count(instance.user_id)
+    elif update_fields is None or 'read' in update_fields:
+        refresh_unread_counts([instance.user_id])
+
+
+def contact_deleted(sender, instance, **kwargs):
+    refresh_unread_counts([instance.user_id])
+
+
+def sync_row_deleted(sender, instance, **kwargs):
+    """Trace la suppression pour les clients de /api/sync/"""
+    record_deletion(instance)
+
+
+def social_type_changed(sender, instance, **kwargs):
+    """Le label et le logo du SocialType sont embarqués dans les réseaux sociaux des utilisateurs"""
+    user_ids = (
+        Social.objects.filter(social_type_id=instance.pk)
+        .values_list('user_id', flat=True)
+        .distinct()
+    )
+    for user_id in user_ids:
+        invalidate_user_cache(user_id)
+
+
+for model in USER_SECTION_MODELS:
+    post_save.connect(user_section_changed, sender=model, dispatch_uid=f'cache_{model.__name__}_save')
+    post_delete.connect(user_section_changed, sender=model, dispatch_uid=f'cache_{model.__name__}_delete')
+
+post_save.connect(user_changed, sender=User, dispatch_uid='cache_User_save')
+post_delete.connect(user_changed, sender=User, dispatch_uid='cache_User_delete')
+post_save.connect(social_type_changed, sender=SocialType, dispatch_uid='cache_SocialType_save')
+
+for model in (Article, Project, Service):
+    post_save.connect(search_document_saved, sender=model, dispatch_uid=f'search_{model.__name__}_save')
+    post_delete.connect(search_document_deleted, sender=model, dispatch_uid=f'search_{model.__name__}_delete')
+
+post_save.connect(service_saved, sender=Service, dispatch_uid='tags_Service_save')
+post_save.connect(project_saved, sender=Project, dispatch_uid='tags_Project_save')
+
+post_save.connect(contact_saved, sender=Contact, dispatch_uid='unread_Contact_save')
+post_delete.connect(contact_deleted, sender=Contact, dispatch_uid='unread_Contact_delete')
+
+for model, _, _ in SYNC_SECTIONS.values():
+    post_delete.connect(sync_row_deleted, sender=model, dispatch_uid=f'sync_{model.__name__}_delete')
@@ -0,0 +1,124 @@
+"""
+Stockage des médias adressé par contenu
+
+Chaque fichier est nommé d'après l'empreinte SHA-256 de son contenu
+(blobs/ab/cd/<sha256>.<ext>): un même fichier uploadé plusieurs fois, par un
+ou plusieurs modèles, n'est écrit qu'une fois. Un nom ne désigne jamais qu'un
+seul contenu, les fichiers peuvent donc être servis avec un cache immuable.
+Les fichiers ne sont jamais supprimés pendant une requête: la commande
+sweep_media supprime ceux qui ne sont plus référencés (voir portfolio.media).
+Les fichiers statiques sont nommés d'après leur contenu par collectstatic
+(ManifestStaticFilesStorage) et précompressés en .gz (et .br si le paquet
+brotli est installé), servis par portfolio.views.media_view.
+"""
+
+import gzip
+import hashlib
+import os
+import re
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+try:
+    import brotli
+except ImportError:  # .br non générés, .gz seulement
+    brotli = None
+
+BLOB_DIRECTORY = 'blobs'
+EXTENSION_RE = re.compile(r'^\.[a-z0-9]{1,10}$')
+
+
+def content_digest(content):
+    """Empreinte SHA-256 d'un fichier Django (lu par morceaux)"""
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()
+
+
+def blob_name(digest, filename):
+    """Nom de stockage d'un contenu: l'extension d'origine est conservée (type MIME)"""
+    extension = os.path.splitext(filename)[1].lower()
+    if not EXTENSION_RE.match(extension):
+        extension = ''
+    return f"{BLOB_DIRECTORY}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+def is_blob_name(name):
+    """Vrai pour un nom produit par ContentAddressedStorage (contenu immuable)"""
+    return name.replace('\\', '/').startswith(f'{BLOB_DIRECTORY}/')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage dont les noms sont dérivés du contenu
+    Le chemin proposé par upload_to ne sert qu'à conserver l'extension
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = blob_name(content_digest(content), name)
+        # Contenu déjà stocké: aucune écriture. La date de modification est
+        # rafraîchie pour que sweep_media ne supprime pas un fichier orphelin
+        # qui vient de retrouver une référence
+        if self.exists(name):
+            try:
+                os.utime(self.path(name))
+            except OSError:
+                pass
+            else:
+                return name
+        return self._save(name, content).replace('\\', '/')
+
+
+# Extensions des fichiers statiques à précompresser (les images sont déjà compressées)
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ico', '.ttf', '.otf')
+# En dessous, le gain ne compense pas l'en-tête Content-Encoding
+MIN_COMPRESS_SIZE = 256
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Ajoute à collectstatic la précompression des fichiers texte (.gz, .br)
+    Un fichier absent du manifeste (collectstatic pas encore lancé, tests) est
+    servi sous son nom d'origine au lieu d'une erreur
+    """
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Fichier absent de STATIC_ROOT (collectstatic pas lancé): nom d'origine
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed = []
+        for name, hashed_name, result in super().post_process(paths, dry_run, **options):
+            processed.append(hashed_name or name)
+            yield name, hashed_name, result
+        if dry_run:
+            return
+        for name in {*paths, *processed}:
+            if name.lower().endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                self.compress(name)
+
+    def compress(self, name):
+        path = self.path(name)
+        with open(path, 'rb') as source:
+            content = source.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content)))
+        for extension, compressed in variants:
+            # Conservé seulement si le gain est réel
+            if len(compressed) < len(content) * 0.95:
+                with open(path + extension, 'wb') as target:
+                    target.write(compressed)
@@ -0,0 +1,100 @@
+"""
+Synchronisation incrémentale du tableau de bord
+
+Le client garde une copie locale des sections de l'utilisateur connecté et ne
+demande que les lignes créées ou modifiées depuis sa dernière synchronisation
+(index (user, updated_at)), ainsi que les identifiants supprimés, enregistrés
+par un signal post_delete dans la table Tombstone.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from .models import Project, Service, Social, Education, Experience, Skill, Contact, Tombstone
+from .serializers.project_serializer import ProjectSerializer
+from .serializers.service_serializer import ServiceSerializer
+from .serializers.social_serializer import SocialSerializer
+from .serializers.education_serializer import EducationSerializer
+from .serializers.experience_serializer import ExperienceSerializer
+from .serializers.skill_serializer import SkillSerializer
+from .serializers.contact_serializer import ContactSerializer
+
+# Sections synchronisées: (modèle, serializer, relations chargées avec la ligne)
+SYNC_SECTIONS = {
+    'projects': (Project, ProjectSerializer, ()),
+    'services': (Service, ServiceSerializer, ()),
+    'socials': (Social, SocialSerializer, ('social_type',)),
+    'educations': (Education, EducationSerializer, ()),
+    'experiences': (Experience, ExperienceSerializer, ()),
+    'skills': (Skill, SkillSerializer, ()),
+    'contacts': (Contact, ContactSerializer, ()),
+}
+
+# Durée de conservation des suppressions: un client plus ancien repart d'une copie complète
+DEFAULT_TOMBSTONE_RETENTION = timedelta(days=30)
+# Recouvrement appliqué au curseur renvoyé: une transaction validée juste après
+# la lecture, mais datée d'avant, est reprise à la synchronisation suivante
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def tombstone_retention():
+    return getattr(settings, 'PORTFOLIO_SYNC_TOMBSTONE_RETENTION', DEFAULT_TOMBSTONE_RETENTION)
+
+
+def section_for(model):
+    for section, (section_model, _, _) in SYNC_SECTIONS.items():
+        if model is section_model:
+            return section
+    return None
+
+
+def record_deletion(instance):
+    """Enregistre la suppression d'une ligne synchronisée"""
+    Tombstone.objects.create(
+        section=section_for(type(instance)), object_id=instance.pk, user_id=instance.user_id
+    )
+
+
+def purge_tombstones(now=None):
+    """Supprime les traces plus anciennes que la durée de conservation"""
+    now = now or timezone.now()
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=now - tombstone_retention()).delete()
+    return deleted
+
+
+def changes_since(user, since, request):
+    """
+    Lignes modifiées et supprimées de l'utilisateur depuis `since`
+    since=None (ou antérieur à la conservation des suppressions): copie complète,
+    signalée par reset=True; le client remplace alors sa copie locale
+    """
+    now = timezone.now()
+    reset = since is None or since < now - tombstone_retention()
+
+    changes = {}
+    for section, (model, serializer_class, related) in SYNC_SECTIONS.items():
+        queryset = model.objects.filter(user=user)
+        if related:
+            queryset = queryset.select_related(*related)
+        if not reset:
+            queryset = queryset.filter(updated_at__gt=since)
+        instances = list(queryset.order_by('updated_at', 'id'))
+        for instance in instances:
+            # user_name: l'utilisateur connecté est déjà chargé, pas de jointure
+            instance.user = user
+        changes[section] = serializer_class(instances, many=True, context={'request': request}).data
+
+    deleted = {section: [] for section in SYNC_SECTIONS}
+    if not reset:
+        tombstones = Tombstone.objects.filter(user_id=user.pk, deleted_at__gt=since).values_list('section', 'object_id')
+        for section, object_id in tombstones:
+            if section in deleted:
+                deleted[section].append(object_id)
+
+    return {
+        'reset': reset,
+        # Valeur de ?since= pour la synchronisation suivante
+        'next_since': now - SYNC_OVERLAP,
+        'changes': changes,
+        'deleted': deleted,
+    }
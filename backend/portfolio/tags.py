@@ -0,0 +1,63 @@
+"""
+Synchronisation des tables normalisées Tag / Technology
+
+Service.tags et Project.technologies restent la source de vérité exposée par
+l'API; leurs valeurs sont recopiées dans les tables de liaison indexées
+ServiceTag et ProjectTechnology à chaque sauvegarde.
+"""
+
+from django.db import transaction
+from .models import Tag, ServiceTag, Technology, ProjectTechnology
+
+NAME_MAX_LENGTH = 100
+
+
+def normalize_name(value):
+    """Nom normalisé d'un tag ou d'une technologie ('' si la valeur est vide)"""
+    return ' '.join(str(value).split()).lower()[:NAME_MAX_LENGTH]
+
+
+def normalize_names(values):
+    """Ensemble des noms normalisés d'une liste JSON (les valeurs vides sont ignorées)"""
+    if not isinstance(values, list):
+        return set()
+    return {name for name in (normalize_name(value) for value in values) if name}
+
+
+def _sync_links(names, name_model, link_model, owner_field, name_field, owner, created):
+    """
+    Aligne les lignes de liaison d'un propriétaire sur un ensemble de noms
+    Ne fait qu'une lecture quand rien n'a changé
+    """
+    links = link_model.objects.filter(**{owner_field: owner})
+    current = {} if created else dict(links.values_list(f'{name_field}__name', 'pk'))
+    if set(current) == names:
+        return
+
+    with transaction.atomic():
+        removed = [pk for name, pk in current.items() if name not in names]
+        if removed:
+            link_model.objects.filter(pk__in=removed).delete()
+
+        added = names - set(current)
+        if added:
+            name_model.objects.bulk_create(
+                [name_model(name=name) for name in added], ignore_conflicts=True
+            )
+            link_model.objects.bulk_create([
+                link_model(**{owner_field: owner, name_field: item})
+                for item in name_model.objects.filter(name__in=added)
+            ])
+
+
+def sync_service_tags(service, created=False):
+    """Recopie Service.tags dans la table ServiceTag"""
+    _sync_links(normalize_names(service.tags), Tag, ServiceTag, 'service', 'tag', service, created)
+
+
+def sync_project_technologies(project, created=False):
+    """Recopie Project.technologies dans la table ProjectTechnology"""
+    _sync_links(
+        normalize_names(project.technologies), Technology, ProjectTechnology,
+        'project', 'technology', project, created
+    )
@@ -1,3 +1,1352 @@
-from django.test import TestCase
+import io
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from smtplib import SMTPException
+from unittest import mock
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.contrib.auth.hashers import make_password
+from django.contrib import admin
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from PIL import Image
+from .authentication import clear_auth_cache
+from .cache import get_user_cache_version
+from .checks import check_throttle_cache
+from .contacts import digest_due_users, send_contact_digests
+from .housekeeping import purge_expired_tokens
+from .images import process_image_variants
+from .log import REQUEST_ID_HEADER, QueuedStreamHandler, RequestIdFilter, request_id_var
+from .metrics import EndpointBudgetMixin, load_flushed_samples, registry, reset_flushed_samples, start_flusher
+from .media import sweep_unreferenced
+from .outbox import send_pending
+from .pagination import CreatedAtCursorPagination
+from .storage import ContentAddressedStorage
+from .sync import purge_tombstones
+from .validators import validate_image_file
+from .models import (
+    User,
+    Project,
+    Service,
+    Social,
+    SocialType,
+    Education,
+    Experience,
+    Skill,
+    Settings,
+    Contact,
+    Category,
+    Article,
+    OutboundEmail,
+    PasswordResetToken,
+)
 
-# Create your tests here.
+# Budgets de requêtes SQL par endpoint (cache vide). Un dépassement signale
+# en général une requête N+1 introduite dans un serializer ou une vue.
+ENDPOINT_QUERY_BUDGETS = {
+    # Projets et services: pagination par décalage, un COUNT en plus
+    'ProjectViewSet.projects_by_user': ('/api/projects/user/{user_id}/', 4),
+    'ProjectViewSet.my_projects': ('/api/projects/my-projects/', 3),
+    'ProjectViewSet.list': ('/api/projects/', 3),
+    'ServiceViewSet.services_by_user': ('/api/services/user/{user_id}/', 4),
+    'ServiceViewSet.my_services': ('/api/services/my-services/', 3),
+    'SocialViewSet.socials_by_user': ('/api/socials/user/{user_id}/', 3),
+    'SocialViewSet.my_socials': ('/api/socials/my-socials/', 2),
+    'EducationViewSet.educations_by_user': ('/api/educations/user/{user_id}/', 3),
+    'ExperienceViewSet.experiences_by_user': ('/api/experiences/user/{user_id}/', 3),
+    'SkillViewSet.skills_by_user': ('/api/skills/user/{user_id}/', 3),
+    'PortfolioView.get': ('/api/portfolio/{user_id}/', 7),
+    'SearchView.get': ('/api/search/?q=projet', 5),
+    'TagFacetView.get': ('/api/tags/facets/', 1),
+    # Une lecture de la colonne du compteur
+    'ContactViewSet.unread_count': ('/api/contacts/unread-count/', 1),
+}
+
+
+class EndpointBudgetTests(EndpointBudgetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='budget@example.com', username='budget', password='pw-budget-123')
+        social_type = SocialType.objects.create(label='GitHub')
+        for index in range(5):
+            Project.objects.create(
+                user=cls.user, title=f'Projet {index}', description='Un projet de test',
+                technologies=['django', 'react'],
+            )
+            Service.objects.create(user=cls.user, title=f'Service {index}', description='Un service', tags=['web'])
+            Education.objects.create(
+                user=cls.user, title=f'Formation {index}', school='Université',
+                start_date=date(2015 + index, 9, 1), description='Formation',
+            )
+            Experience.objects.create(
+                user=cls.user, title=f'Poste {index}', company='Société',
+                start_date=date(2015 + index, 1, 1), description='Expérience',
+            )
+            Skill.objects.create(user=cls.user, label=f'Skill {index}')
+        Social.objects.create(user=cls.user, social_type=social_type, link='https://github.com/budget')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_endpoint_query_budgets(self):
+        for endpoint, (path, max_queries) in ENDPOINT_QUERY_BUDGETS.items():
+            with self.subTest(endpoint=endpoint):
+                response = self.client.get(path.format(user_id=self.user.pk))
+                self.assertEqual(response.status_code, 200, response.content)
+                self.assertWithinBudget(response, queries=max_queries)
+
+    def test_budget_with_bearer_token(self):
+        # Authentification réelle: request.user est l'instance partielle de CachedJWTAuthentication
+        clear_auth_cache()
+        self.addCleanup(clear_auth_cache)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        path, budget = ENDPOINT_QUERY_BUDGETS['ContactViewSet.unread_count']
+        # Première requête: lecture des champs d'authentification, mis en cache
+        self.assertWithinBudget(client.get(path), queries=budget + 1)
+        response = client.get(path)
+        self.assertEqual(response.data, {'unread_count': 0})
+        self.assertWithinBudget(response, queries=budget)
+
+    def test_server_timing_header(self):
+        response = self.client.get(f'/api/projects/user/{self.user.pk}/')
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('serializer;dur=', response['Server-Timing'])
+        self.assertGreater(response.metrics.serializer_time, 0)
+        self.assertEqual(response.metrics.size, len(response.content))
+
+    def test_metrics_aggregated_per_action(self):
+        registry.reset()
+        for _ in range(3):
+            self.client.get('/api/projects/my-projects/')
+        summary = registry.summary()
+        self.assertEqual(summary['ProjectViewSet.my_projects']['count'], 3)
+        self.assertIn('p99', summary['ProjectViewSet.my_projects']['duration_ms'])
+
+    def test_metrics_flushed_outside_requests(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        registry.reset()
+        with override_settings(PORTFOLIO_METRICS_DIR=directory), \
+                mock.patch('portfolio.metrics._flusher', None):
+            with mock.patch.object(registry, 'flush', wraps=registry.flush) as flush, \
+                    mock.patch('portfolio.metrics.start_flusher') as started:
+                self.client.get('/api/projects/my-projects/')
+            flush.assert_not_called()
+            started.assert_called_once_with()
+
+            stop_event = start_flusher(interval=0.01)
+            self.addCleanup(stop_event.set)
+            for _ in range(200):
+                if load_flushed_samples(directory):
+                    break
+                time.sleep(0.01)
+        self.assertIn('ProjectViewSet.my_projects', load_flushed_samples(directory))
+
+    def test_metrics_reset_reaches_running_processes(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        registry.reset()
+        with mock.patch('portfolio.metrics.start_flusher'):
+            self.client.get('/api/projects/my-projects/')
+        registry.flush(directory)
+        self.assertIn('ProjectViewSet.my_projects', load_flushed_samples(directory))
+
+        reset_flushed_samples(directory)
+        self.assertEqual(load_flushed_samples(directory), {})
+        # Écriture suivante du processus: les mesures d'avant la remise à zéro ne reviennent pas
+        registry.flush(directory)
+        self.assertEqual(load_flushed_samples(directory), {})
+        with mock.patch('portfolio.metrics.start_flusher'):
+            self.client.get('/api/projects/my-projects/')
+        registry.flush(directory)
+        self.assertEqual(len(load_flushed_samples(directory)['ProjectViewSet.my_projects']), 1)
+
+    def test_metrics_report_prunes_dead_processes(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        registry.reset()
+        with mock.patch('portfolio.metrics.start_flusher'):
+            self.client.get('/api/projects/my-projects/')
+        registry.flush(directory)
+        dead = subprocess.Popen([sys.executable, '-c', ''])
+        dead.wait()
+        with open(os.path.join(directory, f'{dead.pid}.json'), 'w') as f:
+            json.dump({'epoch': 0, 'samples': {'Mort.list': [[1, 1, 1, 1, 1]]}}, f)
+
+        with override_settings(PORTFOLIO_METRICS_DIR=directory):
+            call_command('metrics_report', '--json', stdout=io.StringIO())
+        self.assertEqual(sorted(os.listdir(directory)), [f'{os.getpid()}.json'])
+
+
+class PortfolioEndpointTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='folio@example.com', username='folio', password='pw-folio-123')
+        cls.other = User.objects.create_user(email='folio-other@example.com', username='folio-other', password='pw-other-123')
+        for owner in (cls.user, cls.other):
+            Project.objects.create(user=owner, title=f'Projet {owner.username}', description='Projet')
+            Skill.objects.create(user=owner, label=f'Skill {owner.username}')
+        Education.objects.create(user=cls.user, title='Ancienne', school='École', start_date=date(2010, 9, 1), description='.')
+        Education.objects.create(user=cls.user, title='Récente', school='École', start_date=date(2020, 9, 1), description='.')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_anonymous_gets_all_sections_of_one_user(self):
+        response = APIClient().get(f'/api/portfolio/{self.user.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['username'], 'folio')
+        for section in ('projects', 'services', 'socials', 'educations', 'experiences', 'skills'):
+            self.assertIn(section, response.data)
+        self.assertEqual([item['title'] for item in response.data['projects']], ['Projet folio'])
+        self.assertEqual([item['label'] for item in response.data['skills']], ['Skill folio'])
+        self.assertEqual([item['title'] for item in response.data['educations']], ['Récente', 'Ancienne'])
+
+    def test_draft_projects_and_inactive_services_hidden(self):
+        Project.objects.create(user=self.user, title='Brouillon', description='Projet', status=Project.STATUS_DRAFT)
+        Project.objects.create(user=self.user, title='Archivé', description='Projet', status=Project.STATUS_ARCHIVED)
+        Service.objects.create(user=self.user, title='Actif', description='Service')
+        Service.objects.create(user=self.user, title='Inactif', description='Service', is_active=False)
+        response = APIClient().get(f'/api/portfolio/{self.user.pk}/')
+        self.assertEqual([item['title'] for item in response.data['projects']], ['Projet folio'])
+        self.assertEqual([item['title'] for item in response.data['services']], ['Actif'])
+
+    def test_unknown_user_returns_404(self):
+        self.assertEqual(APIClient().get('/api/portfolio/999999/').status_code, 404)
+
+
+@override_settings(PORTFOLIO_CACHE_ALLOW_LOCAL=True)
+class AsyncPublicViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='async@example.com', username='async', password='pw-async-123')
+        social_type = SocialType.objects.create(label='GitHub')
+        Social.objects.create(user=cls.user, social_type=social_type, link='https://github.com/async')
+        Project.objects.create(user=cls.user, title='Projet', description='Projet', technologies=['django'])
+        Service.objects.create(user=cls.user, title='Service', description='Service', tags=['web'])
+        # Non publics: absents des deux vues
+        Project.objects.create(user=cls.user, title='Brouillon', description='Projet', status=Project.STATUS_DRAFT)
+        Service.objects.create(user=cls.user, title='Inactif', description='Service', is_active=False)
+        Education.objects.create(user=cls.user, title='Ancienne', school='École', start_date=date(2010, 9, 1), description='.')
+        Education.objects.create(user=cls.user, title='Récente', school='École', start_date=date(2020, 9, 1), description='.')
+        Experience.objects.create(user=cls.user, title='Poste', company='Société', start_date=date(2021, 1, 1), description='.')
+        Skill.objects.create(user=cls.user, label='Python')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_portfolio_matches_sync_view(self):
+        expected = self.client.get(f'/api/portfolio/{self.user.pk}/').json()
+        cache.clear()
+        response = self.client.get(f'/api/public/portfolio/{self.user.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), expected)
+        self.assertEqual([item['title'] for item in expected['projects']], ['Projet'])
+        self.assertEqual([item['title'] for item in expected['services']], ['Service'])
+
+    def test_sections_match_portfolio(self):
+        portfolio = self.client.get(f'/api/portfolio/{self.user.pk}/').json()
+        for section in ('projects', 'services', 'socials', 'educations', 'experiences', 'skills'):
+            data = self.client.get(f'/api/public/users/{self.user.pk}/{section}/').json()
+            self.assertEqual(data['results'], portfolio[section], section)
+            self.assertEqual(data['count'], len(portfolio[section]))
+            self.assertEqual((data['user_id'], data['user_name']), (self.user.pk, 'async'))
+        titles = {
+            section: [item['title'] for item in self.client.get(f'/api/public/users/{self.user.pk}/{section}/').json()['results']]
+            for section in ('projects', 'services')
+        }
+        self.assertEqual(titles, {'projects': ['Projet'], 'services': ['Service']})
+
+    def test_shares_cache_entry_with_sync_view(self):
+        self.client.get(f'/api/public/portfolio/{self.user.pk}/')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/portfolio/{self.user.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 0)
+
+    def test_not_found_matches_sync_view(self):
+        expected = self.client.get('/api/portfolio/999999/')
+        for url in ('/api/public/portfolio/999999/', '/api/public/users/999999/projects/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 404, url)
+            self.assertEqual(response.json(), expected.json(), url)
+        self.assertEqual(self.client.get(f'/api/public/users/{self.user.pk}/unknown/').status_code, 404)
+
+
+@override_settings(PORTFOLIO_CACHE_ALLOW_LOCAL=True)
+class ResponseCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='cache@example.com', username='cache', password='pw-cache-123')
+        cls.project = Project.objects.create(user=cls.user, title='Avant', description='Projet')
+        for index in range(2):
+            Project.objects.create(user=cls.user, title=f'Projet {index}', description='Projet')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/projects/user/{self.user.pk}/'
+
+    def test_second_read_served_from_cache(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 0)
+
+    def test_save_invalidates_cached_section(self):
+        self.client.get(self.url)
+        self.client.get(f'/api/portfolio/{self.user.pk}/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.title = 'Après'
+            self.project.save()
+        titles = [item['title'] for item in self.client.get(self.url).data['results']]
+        self.assertIn('Après', titles)
+        portfolio = self.client.get(f'/api/portfolio/{self.user.pk}/').data
+        self.assertIn('Après', [item['title'] for item in portfolio['projects']])
+
+    def test_bench_keeps_other_cache_entries(self):
+        self.client.get(self.url)
+        cache.set('autre:cle', 'valeur')
+        output = io.StringIO()
+        call_command(
+            'bench', users=2, projects=1, services=1, socials=1, contacts=1, articles=1, sections=1,
+            requests=2, warmup=1, cold=True, endpoint=['portfolio'], stdout=output,
+        )
+        self.assertEqual(cache.get('autre:cle'), 'valeur')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertEqual(len(queries), 0)
+
+    def test_delete_invalidates_cached_section(self):
+        other = Project.objects.create(user=self.user, title='Supprimé', description='Projet')
+        self.assertEqual(len(self.client.get(self.url).data['results']), 4)
+        with self.captureOnCommitCallbacks(execute=True):
+            other.delete()
+        self.assertEqual(len(self.client.get(self.url).data['results']), 3)
+
+    def test_host_is_part_of_the_key(self):
+        first = self.client.get(self.url, {'page_size': 1}, HTTP_HOST='localhost')
+        second = self.client.get(self.url, {'page_size': 1}, HTTP_HOST='127.0.0.1')
+        self.assertTrue(first.data['next'].startswith('http://localhost/'))
+        self.assertTrue(second.data['next'].startswith('http://127.0.0.1/'))
+
+    def test_owner_check_compares_integers(self):
+        response = self.client.get(f'/api/projects/user/0{self.user.pk}/')
+        self.assertEqual(response.status_code, 200)
+        other = User.objects.create_user(email='other-cache@example.com', username='other-cache', password='pw-other-123')
+        self.assertEqual(self.client.get(f'/api/projects/user/{other.pk}/').status_code, 403)
+
+    @override_settings(PORTFOLIO_CACHE_ALLOW_LOCAL=False)
+    def test_process_local_cache_disables_response_cache(self):
+        from django.core.checks import run_checks
+        self.assertIn('portfolio.W001', [message.id for message in run_checks()])
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertGreater(len(queries), 0)
+
+
+class CursorPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='pages@example.com', username='pages', password='pw-pages-123')
+        for index in range(5):
+            Skill.objects.create(user=cls.user, label=f'Skill {index}')
+            Education.objects.create(
+                user=cls.user, title=f'Formation {index}', school='École',
+                start_date=date(2010 + index, 9, 1), description='.',
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url, key='results'):
+        """Suit les liens next et retourne les éléments de toutes les pages"""
+        items, pages = [], 0
+        while url:
+            data = self.client.get(url).data
+            items.extend(data[key])
+            url, pages = data['next'], pages + 1
+        return items, pages
+
+    def test_pages_cover_every_row_once(self):
+        items, pages = self.walk('/api/skills/my-skills/?page_size=2')
+        self.assertEqual(pages, 3)
+        self.assertEqual([item['label'] for item in items], [f'Skill {index}' for index in reversed(range(5))])
+
+    def test_educations_wrapper_paginated_by_start_date(self):
+        items, pages = self.walk(f'/api/educations/user/{self.user.pk}/?page_size=2', key='educations')
+        self.assertEqual(pages, 3)
+        self.assertEqual([item['title'] for item in items], [f'Formation {index}' for index in reversed(range(5))])
+
+    def test_page_size_capped(self):
+        # Plafond abaissé sous le nombre de lignes: la page demandée est tronquée
+        with mock.patch.object(CreatedAtCursorPagination, 'max_page_size', 3):
+            response = self.client.get('/api/skills/my-skills/?page_size=100000')
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNotNone(response.data['next'])
+
+    @override_settings(PORTFOLIO_CACHE_ALLOW_LOCAL=True)
+    def test_cache_key_ignores_unrelated_params(self):
+        url = f'/api/skills/user/{self.user.pk}/?page_size=2'
+        first = self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url + '&utm_source=newsletter')
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(response.data, first.data)
+        next_page = self.client.get(first.data['next'])
+        self.assertNotEqual(next_page.data['results'], first.data['results'])
+
+
+class ReorderTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='order@example.com', username='order', password='pw-order-123')
+        cls.other = User.objects.create_user(email='order-other@example.com', username='order-other', password='pw-other-123')
+        cls.projects = [
+            Project.objects.create(user=cls.user, title=f'Projet {index}', description='.') for index in range(4)
+        ]
+        cls.foreign = Project.objects.create(user=cls.other, title='Autre', description='.')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def listed_ids(self, url='/api/projects/my-projects/'):
+        ids = []
+        while url:
+            data = self.client.get(url).data
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return ids
+
+    def test_new_item_placed_first(self):
+        self.assertEqual(self.listed_ids(), [project.pk for project in reversed(self.projects)])
+
+    def test_reorder_persists_and_invalidates(self):
+        self.listed_ids(f'/api/projects/user/{self.user.pk}/')
+        etag = self.client.get('/api/projects/my-projects/')['ETag']
+        ids = [project.pk for project in self.projects]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/reorder/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.listed_ids(), ids)
+        self.assertEqual(self.listed_ids(f'/api/projects/user/{self.user.pk}/'), ids)
+        response = self.client.get('/api/projects/my-projects/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_reorder_requires_exactly_own_items(self):
+        ids = [project.pk for project in self.projects]
+        response = self.client.post('/api/projects/reorder/', {'ids': ids[:3] + [self.foreign.pk]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['missing'], [ids[3]])
+        self.assertEqual(response.data['unknown'], [self.foreign.pk])
+        response = self.client.post('/api/projects/reorder/', {'ids': ids + ids[:1]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_move_single_item(self):
+        target = self.projects[0]
+        response = self.client.patch(f'/api/projects/{target.pk}/update_order/', {'order': 0}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.listed_ids()[0], target.pk)
+        self.assertEqual(response.data['position'], 0)
+
+    def test_pages_cover_items_with_duplicate_positions(self):
+        Project.objects.filter(user=self.user).update(position=0)
+        ids = self.listed_ids('/api/projects/my-projects/?page_size=1')
+        self.assertEqual(sorted(ids), sorted(project.pk for project in self.projects))
+        self.assertEqual(len(ids), len(set(ids)))
+
+
+class ConditionalGetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='etag@example.com', username='etag', password='pw-etag-123')
+        cls.project = Project.objects.create(user=cls.user, title='Projet', description='Projet')
+        cls.article = Article.objects.create(
+            user=cls.user, category=Category.objects.create(name='Catégorie ETag'), title='Article', content='Contenu',
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, headers={'If-None-Match': etag})
+
+    def test_unchanged_list_returns_304(self):
+        response = self.client.get('/api/projects/my-projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+        revalidated = self.revalidate('/api/projects/my-projects/', response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b'')
+        self.assertEqual(revalidated['ETag'], response['ETag'])
+
+    def test_save_changes_etag(self):
+        etag = self.client.get('/api/projects/my-projects/')['ETag']
+        self.project.title = 'Modifié'
+        self.project.save()
+        self.assertEqual(self.revalidate('/api/projects/my-projects/', etag).status_code, 200)
+
+    def test_etag_is_per_user(self):
+        etag = self.client.get('/api/projects/my-projects/')['ETag']
+        other = User.objects.create_user(email='etag-other@example.com', username='etag-other', password='pw-other-123')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.revalidate('/api/projects/my-projects/', etag).status_code, 200)
+
+    def run_admin_action(self, model, action, queryset):
+        model_admin = admin.site._registry[model]
+        with mock.patch.object(model_admin, 'message_user'):
+            getattr(model_admin, action)(None, queryset)
+
+    def test_admin_publish_changes_etag(self):
+        url = f'/api/articles/{self.article.pk}/'
+        for action in ('publish_articles', 'unpublish_articles'):
+            with self.subTest(action=action):
+                etag = self.client.get(url)['ETag']
+                self.run_admin_action(Article, action, Article.objects.filter(pk=self.article.pk))
+                self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_admin_verify_changes_etag(self):
+        url = f'/api/users/{self.user.pk}/'
+        for action in ('verify_users', 'unverify_users'):
+            with self.subTest(action=action):
+                etag = self.client.get(url)['ETag']
+                self.run_admin_action(User, action, User.objects.filter(pk=self.user.pk))
+                self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+
+class SearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='search@example.com', username='search', password='pw-search-123')
+        category = Category.objects.create(name='Catégorie recherche')
+        cls.article = Article.objects.create(
+            user=cls.user, category=category, title='Déploiement Kubernetes', content='Guide de déploiement', is_published=True,
+        )
+        Article.objects.create(user=cls.user, category=category, title='Brouillon Kubernetes', content='Caché')
+        cls.project = Project.objects.create(
+            user=cls.user, title='Plateforme Django', description='Application de réservation', technologies=['Django'],
+        )
+        Project.objects.create(user=cls.user, title='Prototype Django', description='Non publié', status=Project.STATUS_DRAFT)
+        cls.service = Service.objects.create(user=cls.user, title='Audit Django', description='Revue de code')
+        Service.objects.create(user=cls.user, title='Formation Django', description='Indisponible', is_active=False)
+
+    def search(self, query, **params):
+        response = APIClient().get('/api/search/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def found(self, data):
+        return {(result['type'], result['id']) for result in data['results']}
+
+    def test_accents_ignored(self):
+        self.assertEqual(self.found(self.search('deploiement')), {('article', self.article.pk)})
+        self.assertEqual(self.found(self.search('DÉPLOIEMENT')), {('article', self.article.pk)})
+
+    def test_every_word_matches_prefixes(self):
+        self.assertEqual(self.found(self.search('kuber')), {('article', self.article.pk)})
+        self.assertEqual(self.found(self.search('plate reserv')), {('project', self.project.pk)})
+
+    def test_all_words_required(self):
+        self.assertEqual(self.found(self.search('django audit')), {('service', self.service.pk)})
+        self.assertEqual(self.search('django kubernetes')['count'], 0)
+
+    def test_private_documents_excluded(self):
+        data = self.search('django')
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(self.found(data), {('project', self.project.pk), ('service', self.service.pk)})
+        self.assertEqual(self.found(self.search('kubernetes')), {('article', self.article.pk)})
+
+    def test_status_change_reindexes_project(self):
+        self.project.status = Project.STATUS_DRAFT
+        self.project.save(update_fields=['status', 'updated_at'])
+        self.assertNotIn(('project', self.project.pk), self.found(self.search('plateforme')))
+
+    def test_exact_title_ranked_first_and_count_beyond_limit(self):
+        data = self.search('django', limit=1)
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(len(data['results']), 1)
+        self.assertEqual(data['results'][0]['id'], self.project.pk)
+
+
+class TagFacetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='tags@example.com', username='tags', password='pw-tags-123')
+        cls.other = User.objects.create_user(email='tags-other@example.com', username='tags-other', password='pw-other-123')
+        Service.objects.create(user=cls.user, title='A', description='.', tags=['Web', ' web ', 'API'])
+        Service.objects.create(user=cls.user, title='B', description='.', tags=['WEB'])
+        Service.objects.create(user=cls.user, title='C', description='.', tags=['web'], is_active=False)
+        Service.objects.create(user=cls.other, title='D', description='.', tags=['Design'])
+        Project.objects.create(user=cls.user, title='P1', description='.', technologies=['Django', 'React'])
+        Project.objects.create(user=cls.other, title='P2', description='.', technologies=['django'])
+        # Non publics: absents des facettes comme de la recherche
+        Project.objects.create(user=cls.user, title='P3', description='.', technologies=['Django', 'Vue'], status=Project.STATUS_DRAFT)
+        Project.objects.create(user=cls.other, title='P4', description='.', technologies=['Vue'], status=Project.STATUS_ARCHIVED)
+
+    def facets(self, url, key):
+        response = APIClient().get(url)
+        self.assertEqual(response.status_code, 200)
+        return [(facet['name'], facet['count']) for facet in response.data[key]]
+
+    def test_tag_facets_count_active_services(self):
+        self.assertEqual(self.facets('/api/tags/facets/', 'tags'), [('web', 2), ('api', 1), ('design', 1)])
+        self.assertEqual(self.facets(f'/api/tags/facets/?user={self.user.pk}', 'tags'), [('web', 2), ('api', 1)])
+
+    def test_technology_facets(self):
+        self.assertEqual(
+            self.facets('/api/technologies/facets/', 'technologies'), [('django', 2), ('react', 1)]
+        )
+        self.assertEqual(
+            self.facets(f'/api/technologies/facets/?user={self.other.pk}', 'technologies'), [('django', 1)]
+        )
+
+    def test_links_follow_edits(self):
+        service = Service.objects.get(title='B')
+        service.tags = ['API']
+        service.save()
+        self.assertEqual(self.facets('/api/tags/facets/', 'tags'), [('api', 2), ('design', 1), ('web', 1)])
+        service.delete()
+        self.assertEqual(self.facets('/api/tags/facets/', 'tags'), [('api', 1), ('design', 1), ('web', 1)])
+
+    def test_invalid_user_rejected(self):
+        self.assertEqual(APIClient().get('/api/tags/facets/?user=abc').status_code, 400)
+
+
+class SyncTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='sync@example.com', username='sync', password='pw-sync-123')
+        cls.other = User.objects.create_user(email='sync-other@example.com', username='sync-other', password='pw-other-123')
+        cls.kept = Project.objects.create(user=cls.user, title='Inchangé', description='Projet')
+        cls.edited = Project.objects.create(user=cls.user, title='Avant', description='Projet')
+        cls.removed = Project.objects.create(user=cls.user, title='Supprimé', description='Projet')
+        cls.foreign = Project.objects.create(user=cls.other, title='Autre', description='Projet')
+        Skill.objects.create(user=cls.user, label='Python')
+        # Lignes antérieures au recouvrement du curseur (SYNC_OVERLAP)
+        Project.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        Skill.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_first_sync_is_full_copy(self):
+        response = self.client.get('/api/sync/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['reset'])
+        self.assertEqual(
+            sorted(item['title'] for item in response.data['changes']['projects']), ['Avant', 'Inchangé', 'Supprimé']
+        )
+        self.assertEqual([item['label'] for item in response.data['changes']['skills']], ['Python'])
+        self.assertEqual(response.data['deleted']['projects'], [])
+
+    def test_changes_and_deletions_since_last_sync(self):
+        since = self.client.get('/api/sync/').data['next_since']
+        removed_id = self.removed.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.edited.title = 'Après'
+            self.edited.save()
+            self.removed.delete()
+            self.foreign.delete()
+
+        response = self.client.get('/api/sync/', {'since': since})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['reset'])
+        self.assertEqual([item['title'] for item in response.data['changes']['projects']], ['Après'])
+        self.assertEqual(response.data['changes']['skills'], [])
+        # Suppressions de l'utilisateur seulement
+        self.assertEqual(response.data['deleted']['projects'], [removed_id])
+
+    def test_since_older_than_retention_resets(self):
+        self.removed.delete()
+        since = (timezone.now() - timedelta(days=31)).isoformat()
+        response = self.client.get('/api/sync/', {'since': since})
+        self.assertTrue(response.data['reset'])
+        self.assertEqual(len(response.data['changes']['projects']), 2)
+        self.assertEqual(response.data['deleted']['projects'], [])
+
+    def test_tombstones_purged_after_retention(self):
+        self.removed.delete()
+        self.assertEqual(purge_tombstones(), 0)
+        self.assertEqual(purge_tombstones(now=timezone.now() + timedelta(days=31)), 1)
+
+    def test_invalid_since_and_anonymous(self):
+        self.assertEqual(self.client.get('/api/sync/', {'since': 'hier'}).status_code, 400)
+        self.assertEqual(APIClient().get('/api/sync/').status_code, 401)
+
+
+class BulkActionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='bulk@example.com', username='bulk', password='pw-bulk-123')
+        cls.other = User.objects.create_user(email='bulk-other@example.com', username='bulk-other', password='pw-other-123')
+        cls.foreign_skill = Skill.objects.create(user=cls.other, label='Autre')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_create_all_valid_returns_201(self):
+        response = self.client.post('/api/skills/bulk/', [{'label': 'Python'}, {'label': 'Go'}], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item['label'] for item in response.data['results']], ['Python', 'Go'])
+        self.assertEqual(Skill.objects.filter(user=self.user).count(), 2)
+
+    def test_create_partial_failure_returns_207(self):
+        response = self.client.post('/api/skills/bulk/', [{'label': 'Python'}, {'label': ''}], format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+        self.assertEqual(Skill.objects.filter(user=self.user).count(), 1)
+
+    def test_update_skips_foreign_and_unknown_rows(self):
+        skill = Skill.objects.create(user=self.user, label='Avant')
+        response = self.client.patch('/api/skills/bulk/', [
+            {'id': skill.pk, 'label': 'Après'},
+            {'id': self.foreign_skill.pk, 'label': 'Piraté'},
+            {'label': 'Sans id'},
+        ], format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        skill.refresh_from_db()
+        self.foreign_skill.refresh_from_db()
+        self.assertEqual((skill.label, self.foreign_skill.label), ('Après', 'Autre'))
+
+    def test_delete_partial_failure_returns_207(self):
+        skill = Skill.objects.create(user=self.user, label='À supprimer')
+        response = self.client.delete('/api/skills/bulk/', [skill.pk, self.foreign_skill.pk, 'x'], format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['results'], [skill.pk])
+        self.assertFalse(Skill.objects.filter(pk=skill.pk).exists())
+        self.assertTrue(Skill.objects.filter(pk=self.foreign_skill.pk).exists())
+
+    def test_nothing_processed_returns_400(self):
+        self.assertEqual(self.client.post('/api/skills/bulk/', [{'label': ''}], format='json').status_code, 400)
+        self.assertEqual(self.client.post('/api/skills/bulk/', {}, format='json').status_code, 400)
+        self.assertEqual(self.client.post('/api/skills/bulk/', [{'label': 'x'}] * 101, format='json').status_code, 400)
+
+
+class ContactTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='contacts@example.com', username='contacts', password='pw-contacts-123')
+        cls.admin_user = User.objects.create_superuser(email='contacts-admin@example.com', username='contacts-admin', password='pw-admin-123')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_contacts(self, count, **kwargs):
+        return [
+            Contact.objects.create(user=self.user, name='Visiteur', email='visiteur@example.com', message=f'Message {index}', **kwargs)
+            for index in range(count)
+        ]
+
+    def unread_count(self):
+        self.user.refresh_from_db(fields=['unread_contacts_count'])
+        return self.user.unread_contacts_count
+
+    def test_unread_count_follows_create_read_and_delete(self):
+        first, second, third = self.create_contacts(3)
+        self.create_contacts(1, read=True)
+        self.assertEqual(self.unread_count(), 3)
+
+        response = self.client.patch(f'/api/contacts/{first.pk}/mark_as_read/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.unread_count(), 2)
+        second.delete()
+        self.assertEqual(self.unread_count(), 1)
+        self.assertEqual(self.client.get('/api/contacts/unread-count/').data, {'unread_count': 1})
+
+    def test_admin_actions_refresh_unread_count(self):
+        contacts = self.create_contacts(2)
+        self.client.force_login(self.admin_user)
+        url = reverse('admin:portfolio_contact_changelist')
+        selected = [contact.pk for contact in contacts]
+        self.client.post(url, {'action': 'mark_as_read', '_selected_action': selected})
+        self.assertEqual(self.unread_count(), 0)
+        self.client.post(url, {'action': 'mark_as_unread', '_selected_action': selected[:1]})
+        self.assertEqual(self.unread_count(), 1)
+
+    def test_digest_preference_validated_and_invalidates_cache(self):
+        response = self.client.patch('/api/contacts/digest/', {'frequency': 'hourly'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        updated_at = self.user.updated_at
+        version = get_user_cache_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch('/api/contacts/digest/', {'frequency': User.DIGEST_WEEKLY}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['frequency'], User.DIGEST_WEEKLY)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.contact_digest, User.DIGEST_WEEKLY)
+        self.assertGreater(self.user.updated_at, updated_at)
+        self.assertNotEqual(get_user_cache_version(self.user.pk), version)
+
+    def test_digest_sent_once_per_period(self):
+        self.create_contacts(2)
+        self.create_contacts(1, read=True)
+        now = timezone.now()
+        User.objects.filter(pk=self.user.pk).update(contact_digest=User.DIGEST_DAILY)
+        quiet = User.objects.create_user(email='quiet@example.com', username='quiet', password='pw-quiet-123', contact_digest=User.DIGEST_WEEKLY)
+        recent = User.objects.create_user(email='recent@example.com', username='recent', password='pw-recent-123', contact_digest=User.DIGEST_WEEKLY)
+        User.objects.filter(pk=recent.pk).update(contact_digest_sent_at=now - timedelta(days=3))
+
+        self.assertEqual(set(digest_due_users(now).values_list('pk', flat=True)), {self.user.pk, quiet.pk})
+        self.assertEqual(send_contact_digests(now), 1)
+        message = OutboundEmail.objects.get()
+        self.assertEqual(message.recipients, [self.user.email])
+        self.assertIn('2 nouveau(x) message(s)', message.subject)
+        self.assertIn('Message 0', message.body)
+        # Utilisateur sans message: pas d'email, mais attend aussi une période complète
+        self.assertFalse(digest_due_users(now).exists())
+        self.assertEqual(send_contact_digests(now + timedelta(hours=1)), 0)
+
+        # Période suivante: seuls les messages non lus reçus depuis le résumé sont repris
+        User.objects.filter(pk=self.user.pk).update(contact_digest_sent_at=now - timedelta(days=1))
+        Contact.objects.filter(user=self.user).update(created_at=now - timedelta(days=2))
+        self.assertEqual(send_contact_digests(), 0)
+        User.objects.filter(pk=self.user.pk).update(contact_digest_sent_at=now - timedelta(days=1))
+        Contact.objects.create(user=self.user, name='Visiteur', email='visiteur@example.com', message='Nouveau')
+        self.assertEqual(send_contact_digests(), 1)
+        message = OutboundEmail.objects.latest('id')
+        self.assertIn('Nouveau', message.body)
+        self.assertNotIn('Message 0', message.body)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', PORTFOLIO_OUTBOX_MAX_ATTEMPTS=2)
+class OutboxTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='outbox@example.com', username='outbox', password='pw-outbox-123')
+
+    def test_password_reset_only_queues_email(self):
+        response = APIClient().post('/api/auth/password-reset/', {'email': self.user.email}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+        message = OutboundEmail.objects.get()
+        self.assertEqual(message.recipients, [self.user.email])
+        self.assertEqual(message.status, OutboundEmail.STATUS_PENDING)
+
+    def test_batch_sent_over_one_connection(self):
+        for index in range(3):
+            OutboundEmail.objects.create(subject=f'Sujet {index}', body='Corps', recipients=[f'dest{index}@example.com'])
+        with mock.patch('portfolio.outbox.get_connection', wraps=mail.get_connection) as get_connection:
+            self.assertEqual(send_pending(), (3, 0))
+        get_connection.assert_called_once()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmail.STATUS_SENT).exists())
+        self.assertFalse(OutboundEmail.objects.exclude(body='').exists())
+        self.assertEqual(send_pending(), (0, 0))
+
+    def test_status_saved_after_each_message(self):
+        first = OutboundEmail.objects.create(subject='Premier', body='Corps', recipients=['un@example.com'])
+        second = OutboundEmail.objects.create(subject='Second', body='Corps', recipients=['deux@example.com'])
+        # Arrêt du worker pendant l'envoi du second message
+        with mock.patch('portfolio.outbox.EmailMessage.send', side_effect=[1, KeyboardInterrupt]):
+            with self.assertRaises(KeyboardInterrupt):
+                send_pending()
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, OutboundEmail.STATUS_SENT)
+        self.assertEqual(second.status, OutboundEmail.STATUS_PENDING)
+        self.assertEqual(second.body, 'Corps')
+
+    def test_reset_link_not_shown_in_admin(self):
+        APIClient().post('/api/auth/password-reset/', {'email': self.user.email}, format='json')
+        token = str(PasswordResetToken.objects.get(user=self.user).token)
+        message = OutboundEmail.objects.get()
+        self.assertIn(token, message.body)
+        admin_user = User.objects.create_superuser(email='outbox-admin@example.com', username='outbox-admin', password='pw-admin-123')
+        self.client.force_login(admin_user)
+        response = self.client.get(reverse('admin:portfolio_outboundemail_change', args=[message.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, token)
+
+    def test_failed_send_is_retried_with_backoff(self):
+        message = OutboundEmail.objects.create(subject='Sujet', body='Corps', recipients=['dest@example.com'])
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=SMTPException('boom')):
+            self.assertEqual(send_pending(), (0, 1))
+            message.refresh_from_db()
+            self.assertEqual(message.status, OutboundEmail.STATUS_PENDING)
+            self.assertEqual(message.attempts, 1)
+            self.assertGreater(message.next_attempt_at, timezone.now() + timedelta(seconds=30))
+            # Pas encore dû
+            self.assertEqual(send_pending(), (0, 0))
+
+            OutboundEmail.objects.update(next_attempt_at=timezone.now())
+            self.assertEqual(send_pending(), (0, 1))
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboundEmail.STATUS_FAILED)
+        self.assertIn('boom', message.last_error)
+
+
+class MediaStorageTests(TestCase):
+
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location, ignore_errors=True)
+        self.storage = ContentAddressedStorage(location=self.location)
+
+    def test_identical_uploads_share_one_file(self):
+        first = self.storage.save('projects/a.PNG', ContentFile(b'image'))
+        second = self.storage.save('services/b.png', ContentFile(b'image'))
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith('blobs/') and first.endswith('.png'))
+        self.assertNotEqual(first, self.storage.save('projects/c.png', ContentFile(b'autre')))
+
+    def test_sweep_keeps_referenced_and_recent_files(self):
+        user = User.objects.create_user(email='media@example.com', username='media', password='pw-media-123')
+        referenced = self.storage.save('projects/a.png', ContentFile(b'image'))
+        orphan = self.storage.save('projects/b.png', ContentFile(b'orphelin'))
+        Project.objects.filter(pk=Project.objects.create(user=user, title='Projet').pk).update(image=referenced)
+
+        self.assertEqual(sweep_unreferenced(storage=self.storage), (0, 0))
+        self.assertEqual(sweep_unreferenced(min_age=0, dry_run=True, storage=self.storage), (1, 8))
+        self.assertTrue(self.storage.exists(orphan))
+        self.assertEqual(sweep_unreferenced(min_age=0, storage=self.storage), (1, 8))
+        self.assertFalse(self.storage.exists(orphan))
+        self.assertTrue(self.storage.exists(referenced))
+
+    def test_blob_served_immutable_and_revalidated(self):
+        name = self.storage.save('projects/a.png', ContentFile(b'image'))
+        with override_settings(MEDIA_ROOT=self.location, PORTFOLIO_FILE_SERVE_MODE='django'):
+            response = self.client.get(f'/media/{name}')
+            self.assertEqual(b''.join(response.streaming_content), b'image')
+            self.assertIn('immutable', response['Cache-Control'])
+            response = self.client.get(f'/media/{name}', headers={'If-None-Match': response['ETag']})
+            self.assertEqual(response.status_code, 304)
+
+        # Production: nginx envoie le fichier, le worker ne le lit pas
+        with override_settings(MEDIA_ROOT=self.location, PORTFOLIO_FILE_SERVE_MODE='x-accel'):
+            response = self.client.get(f'/media/{name}', headers={'X-Accel-Enabled': '1'})
+            self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{name}')
+            self.assertEqual(response.content, b'')
+
+            # Requête arrivée sans passer par nginx (URL construite avec SITE_URL)
+            response = self.client.get(f'/media/{name}')
+            self.assertNotIn('X-Accel-Redirect', response)
+            self.assertEqual(b''.join(response.streaming_content), b'image')
+
+
+def make_image(name='image.png', size=(40, 20), image_format='PNG'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, format=image_format)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f'image/{image_format.lower()}')
+
+
+@override_settings(
+    IMAGE_PROCESSING_ASYNC=False,
+    IMAGE_VARIANT_SIZES={'thumb': 16, 'full': 64},
+    IMAGE_VARIANT_FORMATS=['webp', 'original'],
+)
+class ImageVariantTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='variants@example.com', username='variants', password='pw-variants-1')
+
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        media_root = override_settings(MEDIA_ROOT=location)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+
+    def test_variants_generated_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(
+                user=self.user, title='Projet', image=make_image(size=(200, 100)),
+            )
+        project.refresh_from_db()
+        self.assertEqual(set(project.image_variants), {'thumb', 'full'})
+        self.assertEqual(set(project.image_variants['thumb']), {'webp', 'png'})
+        with project.image.storage.open(project.image_variants['thumb']['webp']) as file, Image.open(file) as thumb:
+            self.assertEqual((thumb.format, thumb.size), ('WEBP', (16, 8)))
+        with project.image.storage.open(project.image_variants['full']['png']) as file, Image.open(file) as full:
+            self.assertEqual((full.format, full.size), ('PNG', (64, 32)))
+
+    def image_writes(self, queries, model):
+        table = model._meta.db_table
+        return [
+            query['sql'] for query in queries
+            if query['sql'].startswith((f'INSERT INTO "{table}"', f'UPDATE "{table}"'))
+        ]
+
+    def test_upload_written_in_one_statement(self):
+        # URL calculée avant l'écriture: pas de second UPDATE après l'upload
+        with self.captureOnCommitCallbacks(execute=False), CaptureQueriesContext(connection) as queries:
+            project = Project.objects.create(user=self.user, title='Projet', image=make_image())
+        self.assertEqual(len(self.image_writes(queries, Project)), 1)
+        self.assertEqual(project.image_url, f'{settings.SITE_URL}{project.image.url}')
+
+        with self.captureOnCommitCallbacks(execute=False), CaptureQueriesContext(connection) as queries:
+            project.image = make_image('autre.png', size=(30, 30))
+            project.save()
+        self.assertEqual(len(self.image_writes(queries, Project)), 1)
+        self.assertEqual(Project.objects.get(pk=project.pk).image_url, f'{settings.SITE_URL}{project.image.url}')
+
+        with self.captureOnCommitCallbacks(execute=False), CaptureQueriesContext(connection) as queries:
+            self.user.profile_image = make_image('profil.png')
+            self.user.save()
+        self.assertEqual(len(self.image_writes(queries, User)), 1)
+        self.assertEqual(User.objects.get(pk=self.user.pk).profile_image_url, f'{settings.SITE_URL}{self.user.profile_image.url}')
+
+    def test_replaced_image_is_not_processed(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            project = Project.objects.create(user=self.user, title='Projet', image=make_image())
+        process_image_variants(Project, project.pk, 'image', 'image_variants', 'blobs/remplacée.png')
+        project.refresh_from_db()
+        self.assertEqual(project.image_variants, {})
+
+    def test_removing_image_clears_variants(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(user=self.user, title='Projet', image=make_image())
+        project.refresh_from_db()
+        self.assertTrue(project.image_variants)
+        project.image = None
+        project.save()
+        project.refresh_from_db()
+        self.assertEqual(project.image_variants, {})
+
+
+class ImageValidatorTests(TestCase):
+
+    def assertRejected(self, file, message):
+        with self.assertRaisesMessage(ValueError, message):
+            validate_image_file(file)
+
+    def test_valid_images_accepted(self):
+        for name, image_format in (('a.png', 'PNG'), ('a.jpg', 'JPEG'), ('a.webp', 'WEBP')):
+            with self.subTest(image_format=image_format):
+                file = make_image(name, image_format=image_format)
+                self.assertTrue(validate_image_file(file))
+                self.assertEqual(file.tell(), 0)
+
+    def test_spoofed_content_rejected(self):
+        self.assertRejected(
+            SimpleUploadedFile('a.png', b'<?php echo "pas une image"; ?>', content_type='image/png'),
+            'type de contenu non reconnu',
+        )
+        self.assertRejected(make_image('a.gif', image_format='GIF'), 'Format de fichier non supporté')
+
+    def test_truncated_header_rejected(self):
+        self.assertRejected(SimpleUploadedFile('a.png', b'\x89PNG\r\n\x1a\n' + b'\x00' * 8), 'en-tête illisible')
+
+    @override_settings(MAX_IMAGE_SIZE=100)
+    def test_oversized_file_rejected(self):
+        self.assertRejected(make_image(size=(200, 200)), 'trop volumineux')
+
+    @override_settings(MAX_IMAGE_PIXELS=1000)
+    def test_too_many_pixels_rejected(self):
+        self.assertRejected(make_image(size=(100, 20)), '100x20 pixels')
+
+
+class LoggingTests(TestCase):
+
+    def test_request_id_header(self):
+        client = APIClient()
+        response = client.get('/api/portfolio/999999/', headers={REQUEST_ID_HEADER: 'proxy-id.42'})
+        self.assertEqual(response[REQUEST_ID_HEADER], 'proxy-id.42')
+        # Identifiant non sûr à journaliser: remplacé par un identifiant généré
+        response = client.get('/api/portfolio/999999/', headers={REQUEST_ID_HEADER: 'a b\nc'})
+        self.assertRegex(response[REQUEST_ID_HEADER], r'^[0-9a-f]{32}$')
+
+    def test_queued_stream_handler(self):
+        stream = io.StringIO()
+        handler = QueuedStreamHandler(stream)
+        self.addCleanup(handler.close)
+        handler.setFormatter(logging.Formatter('[%(request_id)s] %(message)s'))
+        handler.addFilter(RequestIdFilter())
+        logger = logging.getLogger('portfolio.tests.queued')
+        logger.addHandler(handler)
+        logger.propagate = False
+        self.addCleanup(logger.removeHandler, handler)
+
+        values = ['avant']
+        token = request_id_var.set('req-1')
+        try:
+            logger.warning("valeurs=%s", values)
+        finally:
+            request_id_var.reset(token)
+        # Les arguments sont fusionnés au dépôt dans la file, pas à l'écriture
+        values.append('après')
+        handler.stop_listener()
+        self.assertEqual(stream.getvalue(), "[req-1] valeurs=['avant']\n")
+
+    def test_queued_handler_never_blocks(self):
+        handler = QueuedStreamHandler(io.StringIO(), maxsize=1)
+        self.addCleanup(handler.close)
+        handler.stop_listener()
+        record = logging.makeLogRecord({'msg': 'message'})
+        handler.handle(record)
+        handler.handle(record)
+        self.assertEqual(handler.queue.qsize(), 1)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='jwt@example.com', username='jwt', password='pw-jwt-12345')
+
+    def setUp(self):
+        clear_auth_cache()
+        self.client = APIClient()
+        response = self.client.post('/api/token/', {'email': self.user.email, 'password': 'pw-jwt-12345'}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.json()['access']}")
+
+    def test_cached_user_authenticates_without_query(self):
+        self.client.get('/api/projects/my-projects/')
+        # ETag (agrégat) + liste: la ligne utilisateur n'est pas relue
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/projects/my-projects/')
+        self.assertEqual(response.status_code, 200)
+
+        # Les champs du profil sont chargés en une requête à la première lecture
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/auth/current-user/')
+        self.assertEqual(response.json()['email'], self.user.email)
+
+    def test_saved_user_is_reloaded(self):
+        self.client.get('/api/projects/my-projects/')
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(self.client.get('/api/projects/my-projects/').status_code, 401)
+
+    def test_admin_deactivation_flushes_caches(self):
+        self.client.get('/api/projects/my-projects/')
+        version = get_user_cache_version(self.user.pk)
+        admin_client = Client()
+        admin_client.force_login(User.objects.create_superuser(
+            email='jwt-admin@example.com', username='jwt-admin', password='pw-admin-123',
+        ))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = admin_client.post(reverse('admin:portfolio_user_changelist'), {
+                'action': 'deactivate_users', '_selected_action': [self.user.pk],
+            })
+        self.assertEqual(response.status_code, 302)
+        self.assertNotEqual(get_user_cache_version(self.user.pk), version)
+        self.assertEqual(self.client.get('/api/projects/my-projects/').status_code, 401)
+
+
+class TokenHousekeepingTests(TestCase):
+
+    def test_expired_tokens_purged_in_batches(self):
+        user = User.objects.create_user(email='tokens@example.com', username='tokens', password='pw-tokens-123')
+        for _ in range(5):
+            RefreshToken.for_user(user).blacklist()
+        valid = RefreshToken.for_user(user)
+        OutstandingToken.objects.exclude(jti=valid['jti']).update(expires_at=timezone.now() - timedelta(seconds=1))
+        PasswordResetToken.objects.create(user=user)
+        expired = PasswordResetToken.objects.create(user=user)
+        PasswordResetToken.objects.filter(pk=expired.pk).update(created_at=timezone.now() - timedelta(hours=25))
+
+        old_email = OutboundEmail.objects.create(subject='Ancien', body='Lien', recipients=[user.email], status=OutboundEmail.STATUS_FAILED)
+        OutboundEmail.objects.filter(pk=old_email.pk).update(created_at=timezone.now() - timedelta(hours=25))
+        recent_email = OutboundEmail.objects.create(subject='Récent', body='Lien', recipients=[user.email], status=OutboundEmail.STATUS_FAILED)
+
+        purged = purge_expired_tokens(batch_size=2)
+        self.assertEqual(purged, {
+            'outstanding_tokens': 5, 'blacklisted_tokens': 5, 'password_reset_tokens': 1, 'email_bodies': 1,
+        })
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), [valid['jti']])
+        self.assertEqual(PasswordResetToken.objects.count(), 1)
+        self.assertEqual(
+            dict(OutboundEmail.objects.values_list('pk', 'body')), {old_email.pk: '', recent_email.pk: 'Lien'}
+        )
+
+
+class ThrottlingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    @override_settings(REST_FRAMEWORK={
+        'DEFAULT_AUTHENTICATION_CLASSES': ['portfolio.authentication.CachedJWTAuthentication'],
+        'DEFAULT_THROTTLE_RATES': {'signin.email': '2/min'},
+    })
+    def test_signin_throttled_per_email_before_hashing(self):
+        client = APIClient()
+        for _ in range(2):
+            response = client.post('/api/auth/login/', {'email': 'bot@example.com', 'password': 'x'}, format='json')
+            self.assertEqual(response.status_code, 400)
+        with mock.patch('portfolio.views.auth_view.UserLoginSerializer') as serializer:
+            response = client.post('/api/auth/login/', {'email': ' BOT@example.com', 'password': 'x'}, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        serializer.assert_not_called()
+        # Les autres adresses ont leur propre seau
+        response = client.post('/api/auth/login/', {'email': 'other@example.com', 'password': 'x'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_rotating_forwarded_for_still_throttled(self):
+        rest_framework = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'signin.ip': '2/min'}}
+        client = APIClient()
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            statuses = [
+                # nginx ajoute l'adresse du client après celle envoyée par le client
+                client.post('/api/auth/login/', {'password': 'x'}, format='json',
+                            headers={'X-Forwarded-For': f'198.51.100.{index}, 203.0.113.7'}).status_code
+                for index in range(3)
+            ]
+            self.assertEqual(statuses, [400, 400, 429])
+            response = client.post('/api/auth/login/', {'password': 'x'}, format='json',
+                                   headers={'X-Forwarded-For': '198.51.100.1, 203.0.113.8'})
+            self.assertEqual(response.status_code, 400)
+
+    def test_process_local_throttle_cache_warns(self):
+        with override_settings(PORTFOLIO_CACHE_ALLOW_LOCAL=False):
+            self.assertEqual([message.id for message in check_throttle_cache(None)], ['portfolio.W002'])
+            with override_settings(PORTFOLIO_THROTTLE_STORE='portfolio.throttling.RedisBucketStore'):
+                self.assertEqual(check_throttle_cache(None), [])
+
+
+class PasswordHashingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_legacy_hash_upgraded_on_login(self):
+        user = User.objects.create_user(email='hash@example.com', username='hash', password='pw-hash-12345')
+        self.assertTrue(user.password.startswith('scrypt$'))
+        User.objects.filter(pk=user.pk).update(password=make_password('pw-hash-12345', hasher='pbkdf2_sha1'))
+
+        response = APIClient().post('/api/auth/login/', {'email': user.email, 'password': 'pw-hash-12345'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('hash;dur=', response['Server-Timing'])
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('scrypt$'))
+
+
+class AdminChangelistQueryTests(TestCase):
+    """Le nombre de requêtes d'une page de liste de l'admin ne dépend pas du nombre de lignes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser(email='admin@example.com', username='admin', password='pw-admin-123')
+        cls.rows = 0
+
+    def create_rows(self, count):
+        for _ in range(count):
+            index = self.rows = self.rows + 1
+            user = User.objects.create_user(email=f'row{index}@example.com', username=f'row{index}', password=None)
+            social_type = SocialType.objects.create(label=f'Réseau {index}')
+            category = Category.objects.create(name=f'Catégorie {index}')
+            Settings.objects.create(user=user, color='#000000')
+            Social.objects.create(user=user, social_type=social_type, link=f'https://example.com/{index}')
+            Education.objects.create(user=user, title='Formation', school='École', start_date=date(2020, 1, 1), description='Formation')
+            Experience.objects.create(user=user, title='Poste', company='Société', start_date=date(2020, 1, 1), description='Expérience')
+            Skill.objects.create(user=user, label=f'Skill {index}')
+            Project.objects.create(user=user, title=f'Projet {index}', description='Projet', technologies=['django'])
+            Service.objects.create(user=user, title=f'Service {index}', description='Service', tags=['web'])
+            Contact.objects.create(user=user, name='Visiteur', email='visiteur@example.com', message='Bonjour')
+            Article.objects.create(user=user, category=category, title=f'Article {index}', content='Contenu')
+            OutboundEmail.objects.create(subject='Sujet', body='Corps', recipients=[user.email])
+
+    def changelist_queries(self):
+        counts = {}
+        for model in admin.site._registry:
+            if model._meta.app_label != 'portfolio':
+                continue
+            url = reverse(f'admin:portfolio_{model._meta.model_name}_changelist')
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            counts[model.__name__] = len(queries)
+        return counts
+
+    def test_changelist_query_count_is_constant(self):
+        self.client.force_login(self.admin_user)
+        self.create_rows(2)
+        baseline = self.changelist_queries()
+        self.create_rows(5)
+        self.assertEqual(self.changelist_queries(), baseline)
+
+
+class MigrationTests(TransactionTestCase):
+    """Migrations de données: lignes créées avec l'état du schéma précédent"""
+
+    def migrate(self, target):
+        """Migre la base vers `target` et retourne les modèles historiques de cet état"""
+        executor = MigrationExecutor(connection)
+        executor.migrate([('portfolio', target)])
+        executor.loader.build_graph()
+        return executor.loader.project_state([('portfolio', target)]).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_image_urls_backfilled(self):
+        apps = self.migrate('0009_image_variants')
+        user = apps.get_model('portfolio', 'User').objects.create(
+            username='ancien', email='ancien@example.com', profile_image='users/profiles/ancien.png',
+        )
+        project = apps.get_model('portfolio', 'Project').objects.create(
+            user_id=user.pk, title='Ancien', description='Projet', image='projects/ancien.png',
+        )
+        apps.get_model('portfolio', 'Project').objects.create(user_id=user.pk, title='Sans image', description='Projet')
+
+        apps = self.migrate('0010_backfill_image_urls')
+        project = apps.get_model('portfolio', 'Project').objects.get(pk=project.pk)
+        self.assertEqual(project.image_url, f'{settings.SITE_URL}{default_storage.url("projects/ancien.png")}')
+        self.assertEqual(apps.get_model('portfolio', 'Project').objects.get(title='Sans image').image_url, None)
+        user = apps.get_model('portfolio', 'User').objects.get(pk=user.pk)
+        self.assertEqual(user.profile_image_url, f'{settings.SITE_URL}{default_storage.url("users/profiles/ancien.png")}')
+
+    def test_existing_projects_stay_public_after_status_field(self):
+        apps = self.migrate('0019_token_housekeeping_indexes')
+        user = apps.get_model('portfolio', 'User').objects.create(username='ancien', email='ancien@example.com')
+        apps.get_model('portfolio', 'Project').objects.create(user_id=user.pk, title='Ancien', description='Projet')
+
+        apps = self.migrate('0020_project_status')
+        project = apps.get_model('portfolio', 'Project').objects.get()
+        # Projets existants: terminés, donc toujours visibles (portfolio public, recherche)
+        self.assertEqual(project.status, Project.STATUS_COMPLETED)
@@ -0,0 +1,173 @@
+"""
+Limitation de débit par seau à jetons (token bucket)
+
+Chaque clé (portée de la vue + IP, email ou utilisateur ciblé) possède un seau
+de `capacité` jetons, rechargé en continu au débit capacité/période. Une
+requête consomme un jeton; un seau vide refuse la requête (429) avec un
+en-tête Retry-After égal au temps de recharge d'un jeton. Les throttles DRF
+s'exécutent avant la vue: le hachage du mot de passe, l'envoi d'email ou
+l'écriture du message ne commencent pas pour une requête refusée.
+
+Les débits sont définis par portée dans REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+sous la forme '<throttle_scope de la vue>.<type de clé>': '5/min', ...; une
+portée sans débit n'est pas limitée.
+L'état des seaux est partagé entre les processus via PORTFOLIO_THROTTLE_STORE:
+- CacheBucketStore (défaut): cache Django PORTFOLIO_THROTTLE_CACHE, qui doit
+  être partagé entre les processus (voir checks.py); deux requêtes simultanées
+  sur la même clé peuvent consommer le même jeton;
+- RedisBucketStore: script Lua atomique (paquet redis, PORTFOLIO_THROTTLE_REDIS_URL).
+"""
+
+import hashlib
+import math
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+try:
+    import redis
+except ImportError:  # RedisBucketStore indisponible, CacheBucketStore seulement
+    redis = None
+
+
+def parse_rate(rate):
+    """'10/min' -> (capacité, jetons rechargés par seconde)"""
+    count, period = rate.split('/')
+    seconds = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+    return int(count), int(count) / seconds
+
+
+def refill(tokens, updated_at, capacity, refill_rate, now):
+    return min(capacity, tokens + max(0.0, now - updated_at) * refill_rate)
+
+
+class CacheBucketStore:
+    """Seaux stockés dans un cache Django: (jetons, date de mise à jour)"""
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, 'PORTFOLIO_THROTTLE_CACHE', 'default')]
+
+    def consume(self, key, capacity, refill_rate, now):
+        """Retourne (autorisé, secondes avant le prochain jeton)"""
+        tokens, updated_at = self.cache.get(key, (capacity, now))
+        tokens = refill(tokens, updated_at, capacity, refill_rate, now)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # Expire quand le seau est de nouveau plein: une clé inactive ne coûte rien
+        self.cache.set(key, (tokens, now), timeout=math.ceil((capacity - tokens) / refill_rate) + 1)
+        return allowed, 0.0 if allowed else (1 - tokens) / refill_rate
+
+
+class RedisBucketStore:
+    """Seaux stockés dans Redis, lus et mis à jour atomiquement (script Lua)"""
+
+    SCRIPT = """
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+    local capacity, rate, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local tokens = tonumber(state[1]) or capacity
+    local updated_at = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self):
+        if redis is None:
+            raise ImproperlyConfigured("RedisBucketStore nécessite le paquet redis")
+        url = getattr(settings, 'PORTFOLIO_THROTTLE_REDIS_URL', 'redis://127.0.0.1:6379/2')
+        self.script = redis.Redis.from_url(url).register_script(self.SCRIPT)
+
+    def consume(self, key, capacity, refill_rate, now):
+        allowed, tokens = self.script(keys=[key], args=[capacity, refill_rate, now])
+        tokens = float(tokens)
+        return bool(allowed), 0.0 if allowed else (1 - tokens) / refill_rate
+
+
+_store = None
+
+
+def get_bucket_store():
+    global _store
+    path = getattr(settings, 'PORTFOLIO_THROTTLE_STORE', 'portfolio.throttling.CacheBucketStore')
+    if _store is None or f'{type(_store).__module__}.{type(_store).__name__}' != path:
+        _store = import_string(path)()
+    return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle DRF par seau à jetons
+    La vue définit throttle_scope; les sous-classes définissent key_type et
+    get_ident_value() (la valeur identifiant le seau)
+    """
+    key_type = None
+    timer = time.time
+
+    def get_ident_value(self, request, view):
+        raise NotImplementedError
+
+    def get_rate(self, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope is None:
+            return None
+        return api_settings.DEFAULT_THROTTLE_RATES.get(f'{scope}.{self.key_type}')
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        rate = self.get_rate(view)
+        value = self.get_ident_value(request, view) if rate else None
+        if value is None:
+            return True
+        capacity, refill_rate = parse_rate(rate)
+        # Valeur hachée: pas d'email en clair ni de caractère invalide dans la clé
+        digest = hashlib.sha256(str(value).encode()).hexdigest()[:32]
+        key = f'throttle:{view.throttle_scope}:{self.key_type}:{digest}'
+        allowed, wait = get_bucket_store().consume(key, capacity, refill_rate, self.timer())
+        if not allowed:
+            self.wait_seconds = wait
+        return allowed
+
+    def wait(self):
+        # Retry-After est un nombre entier de secondes
+        return math.ceil(self.wait_seconds) if self.wait_seconds else None
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Seau par adresse IP (X-Forwarded-For selon NUM_PROXIES)"""
+    key_type = 'ip'
+
+    def get_ident_value(self, request, view):
+        return self.get_ident(request)
+
+
+class EmailTokenBucketThrottle(TokenBucketThrottle):
+    """Seau par adresse email du corps de la requête (connexion, réinitialisation)"""
+    key_type = 'email'
+
+    def get_ident_value(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return email.strip().lower()
+
+
+class TargetUserTokenBucketThrottle(TokenBucketThrottle):
+    """Seau par utilisateur destinataire (champ 'user' du corps, sinon l'utilisateur connecté)"""
+    key_type = 'user'
+
+    def get_ident_value(self, request, view):
+        target = request.data.get('user') if hasattr(request.data, 'get') else None
+        if target in (None, ''):
+            target = request.user.pk if request.user.is_authenticated else None
+        return target
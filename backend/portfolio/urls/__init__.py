@@ -11,6 +11,11 @@ from .skill_urls import urlpatterns as skill_urls
 from .social_type_urls import urlpatterns as social_type_urls
 from .project_urls import urlpatterns as project_urls
 from .service_urls import urlpatterns as service_urls
+from .portfolio_urls import urlpatterns as portfolio_urls
+from .search_urls import urlpatterns as search_urls
+from .tag_urls import urlpatterns as tag_urls
+from .public_urls import urlpatterns as public_urls
+from .sync_urls import urlpatterns as sync_urls
 from ..views.auth_view import (SignupView, CurrentUserView, SigninView,
     ResetPasswordView, ResetPasswordConfirmView, LogoutView, UpdateProfilView)
 
@@ -27,6 +32,11 @@ urlpatterns = [
     path('', include(social_type_urls)),
     path('', include(project_urls)),
     path('', include(service_urls)),
+    path('', include(portfolio_urls)),
+    path('', include(search_urls)),
+    path('', include(tag_urls)),
+    path('', include(public_urls)),
+    path('', include(sync_urls)),
     
     # Authentification
     path('auth/register/', SignupView.as_view(), name='register'),
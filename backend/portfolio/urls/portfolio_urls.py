@@ -0,0 +1,6 @@
+from django.urls import path
+from portfolio.views.portfolio_view import PortfolioView
+
+urlpatterns = [
+    path('portfolio/<int:user_id>/', PortfolioView.as_view(), name='portfolio'),
+]
@@ -0,0 +1,7 @@
+from django.urls import path
+from portfolio.views.public_view import AsyncPortfolioView, AsyncUserSectionView
+
+urlpatterns = [
+    path('public/portfolio/<int:user_id>/', AsyncPortfolioView.as_view(), name='public-portfolio'),
+    path('public/users/<int:user_id>/<str:section>/', AsyncUserSectionView.as_view(), name='public-user-section'),
+]
@@ -0,0 +1,6 @@
+from django.urls import path
+from portfolio.views.search_view import SearchView
+
+urlpatterns = [
+    path('search/', SearchView.as_view(), name='search'),
+]
@@ -0,0 +1,6 @@
+from django.urls import path
+from portfolio.views.sync_view import SyncView
+
+urlpatterns = [
+    path('sync/', SyncView.as_view(), name='sync'),
+]
@@ -0,0 +1,7 @@
+from django.urls import path
+from portfolio.views.tag_view import TagFacetView, TechnologyFacetView
+
+urlpatterns = [
+    path('tags/facets/', TagFacetView.as_view(), name='tag-facets'),
+    path('technologies/facets/', TechnologyFacetView.as_view(), name='technology-facets'),
+]
@@ -0,0 +1,90 @@
+"""
+Validation des images uploadées
+
+Seuls les premiers Ko du fichier sont lus: le type est détecté par ses
+octets magiques et les dimensions sont lues dans l'en-tête, sans décoder
+les pixels ni copier le fichier. Le coût de la validation ne dépend donc
+pas de la taille de l'upload.
+"""
+
+import io
+from django.conf import settings
+from PIL import Image
+
+ALLOWED_IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png', 'webp']
+
+# Octets magiques -> format Pillow attendu
+IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+)
+
+# Lecture initiale de l'en-tête, puis doublée si besoin (segments EXIF des JPEG)
+HEADER_CHUNK_SIZE = 4 * 1024
+HEADER_MAX_SIZE = 256 * 1024
+
+
+def sniff_image_format(header):
+    """Retourne le format détecté à partir des octets magiques, ou None"""
+    for signature, image_format in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return image_format
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'WEBP'
+    return None
+
+
+def read_image_header(file, image_format):
+    """
+    Lit les dimensions de l'image dans l'en-tête en ne consommant que les
+    premiers Ko nécessaires. Le pointeur du fichier est remis au début.
+    """
+    size = HEADER_CHUNK_SIZE
+    try:
+        while True:
+            file.seek(0)
+            header = file.read(size)
+            try:
+                # Image.open ne lit que l'en-tête: aucun pixel n'est décodé
+                with Image.open(io.BytesIO(header), formats=[image_format]) as image:
+                    return image.size
+            except Image.DecompressionBombError:
+                raise ValueError("L'image est trop grande (nombre de pixels)")
+            except (OSError, SyntaxError):
+                # En-tête incomplet: lire davantage, sans dépasser la limite
+                if len(header) < size or size >= HEADER_MAX_SIZE:
+                    raise ValueError("Le fichier n'est pas une image valide: en-tête illisible")
+                size *= 2
+    finally:
+        file.seek(0)
+
+
+def validate_image_file(file):
+    """
+    Valide un fichier image uploadé (taille, extension, type réel, dimensions)
+    Lève ValueError avec un message destiné à l'utilisateur
+    """
+    if not hasattr(file, 'read'):
+        raise ValueError(f"L'objet n'est pas un fichier valide: {type(file)}")
+
+    max_size = getattr(settings, 'MAX_IMAGE_SIZE', 5 * 1024 * 1024)
+    if getattr(file, 'size', None) and file.size > max_size:
+        raise ValueError(f"Le fichier est trop volumineux. Taille maximale: {max_size // (1024 * 1024)}MB")
+
+    if getattr(file, 'name', None):
+        file_extension = file.name.split('.')[-1].lower()
+        if file_extension not in ALLOWED_IMAGE_EXTENSIONS:
+            raise ValueError(f"Format de fichier non supporté. Formats acceptés: {', '.join(ALLOWED_IMAGE_EXTENSIONS)}")
+
+    file.seek(0)
+    image_format = sniff_image_format(file.read(16))
+    file.seek(0)
+    if image_format is None:
+        raise ValueError("Le fichier n'est pas une image valide: type de contenu non reconnu")
+
+    width, height = read_image_header(file, image_format)
+    max_pixels = getattr(settings, 'MAX_IMAGE_PIXELS', 40_000_000)
+    if width * height > max_pixels:
+        raise ValueError(f"L'image est trop grande: {width}x{height} pixels (maximum {max_pixels} pixels)")
+
+    return True
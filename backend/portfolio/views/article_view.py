@@ -2,8 +2,9 @@ from rest_framework import viewsets
 from portfolio.models.article import Article
 from portfolio.serializers.article_serializer import ArticleSerializer
 from rest_framework.permissions import IsAuthenticated
+from portfolio.views.mixins import ConditionalGetMixin
 
-class ArticleViewSet(viewsets.ModelViewSet):
+class ArticleViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
     permission_classes = [IsAuthenticated]
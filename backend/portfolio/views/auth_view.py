@@ -4,14 +4,14 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.core.mail import send_mail
 from django.conf import settings
 from django.utils import timezone
-from datetime import timedelta
-import os
-from PIL import Image
-import tempfile
+import logging
 from portfolio.models import User, PasswordResetToken
+from portfolio.validators import validate_image_file
+from portfolio.outbox import queue_email
+from portfolio.housekeeping import PASSWORD_RESET_TOKEN_LIFETIME
+from portfolio.throttling import IPTokenBucketThrottle, EmailTokenBucketThrottle
 from portfolio.serializers.auth_serializer import (
     UserRegistrationSerializer,
     UserLoginSerializer, 
@@ -20,6 +20,8 @@ from portfolio.serializers.auth_serializer import (
     UserProfileSerializer
 )
 
+logger = logging.getLogger(__name__)
+
 
 def get_tokens_for_user(user):
     refresh = RefreshToken.for_user(user)
@@ -29,87 +31,6 @@ def get_tokens_for_user(user):
     }
 
 
-def validate_image_file_debug(file):
-    """
-    Valide le fichier image uploadé avec debug détaillé
-    """
-    print(f"=== VALIDATION IMAGE DEBUG ===")
-    print(f"File object type: {type(file)}")
-    print(f"File name: {getattr(file, 'name', 'NO NAME')}")
-    print(f"File size: {getattr(file, 'size', 'NO SIZE')}")
-    print(f"File content_type: {getattr(file, 'content_type', 'NO CONTENT_TYPE')}")
-    
-    # Vérifier si c'est bien un objet fichier Django
-    if not hasattr(file, 'read'):
-        raise ValueError(f"L'objet n'est pas un fichier valide: {type(file)}")
-    
-    # Vérifier la taille du fichier (max 5MB)
-    max_size = 5 * 1024 * 1024  # 5MB
-    if hasattr(file, 'size') and file.size > max_size:
-        raise ValueError("Le fichier est trop volumineux. Taille maximale: 5MB")
-    
-    # Vérifier l'extension
-    if hasattr(file, 'name') and file.name:
-        allowed_extensions = ['jpg', 'jpeg', 'png', 'webp']
-        file_extension = file.name.split('.')[-1].lower()
-        print(f"Extension détectée: {file_extension}")
-        if file_extension not in allowed_extensions:
-            raise ValueError(f"Format de fichier non supporté. Formats acceptés: {', '.join(allowed_extensions)}")
-    
-    # Vérifier que c'est vraiment une image avec PIL
-    try:
-        print("Tentative d'ouverture avec PIL...")
-        # Sauvegarder temporairement pour debugger
-        file.seek(0)  # Retour au début du fichier
-        image = Image.open(file)
-        print(f"Image PIL ouverte: format={image.format}, mode={image.mode}, size={image.size}")
-        
-        # Vérifier l'image
-        image.verify()
-        print("✅ Image PIL vérifiée avec succès")
-        
-        # Remettre le pointeur au début pour utilisation ultérieure
-        file.seek(0)
-        
-    except Exception as e:
-        print(f"❌ Erreur PIL: {str(e)}")
-        print(f"Type d'erreur: {type(e)}")
-        
-        # Essayer de créer un fichier temporaire pour debug
-        try:
-            file.seek(0)
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.tmp') as temp_file:
-                temp_file.write(file.read())
-                temp_path = temp_file.name
-            
-            print(f"Fichier temporaire créé: {temp_path}")
-            
-            # Essayer d'ouvrir le fichier temporaire
-            with Image.open(temp_path) as temp_image:
-                print(f"Fichier temporaire ouvert: {temp_image.format}, {temp_image.size}")
-            
-            # Nettoyer
-            os.unlink(temp_path)
-            file.seek(0)
-            
-        except Exception as temp_error:
-            print(f"❌ Erreur fichier temporaire: {str(temp_error)}")
-            raise ValueError(f"Le fichier n'est pas une image valide: {str(e)}")
-    
-    return True
-
-
-def remove_old_file(file_field):
-    """
-    Supprime un ancien fichier s'il existe
-    """
-    if file_field and hasattr(file_field, 'path') and os.path.isfile(file_field.path):
-        try:
-            os.remove(file_field.path)
-        except OSError:
-            pass  # Le fichier n'existe peut-être plus
-
-
 class UpdateProfilView(APIView):
     """
     Endpoint UNIFIÉ pour toutes les modifications de profil
@@ -136,39 +57,35 @@ class UpdateProfilView(APIView):
         """
         user = request.user
         
-        print("=== DEBUG UPDATE PROFILE ===")
-        print(f"User: {user.email}")
-        print(f"Request FILES keys: {list(request.FILES.keys())}")
-        print(f"Request data keys: {list(request.data.keys())}")
+        logger.debug(
+            "Mise à jour du profil user=%s files=%s data=%s",
+            user.pk, list(request.FILES.keys()), list(request.data.keys())
+        )
         
         # ========================
         # 1. GESTION DES IMAGES
         # ========================
         
         # Debug des fichiers reçus
-        if request.FILES:
+        if logger.isEnabledFor(logging.DEBUG):
             for key, file in request.FILES.items():
-                print(f"Fichier reçu - {key}: {file.name} ({file.size} bytes)")
+                logger.debug("Fichier reçu %s: %s (%d octets)", key, file.name, file.size)
         
         # Validation des nouvelles images
         if 'profile_image_file' in request.FILES:
             try:
-                print("🔍 Validation de profile_image_file...")
-                validate_image_file_debug(request.FILES['profile_image_file'])
-                print("✅ profile_image_file validé")
+                validate_image_file(request.FILES['profile_image_file'])
             except ValueError as e:
-                print(f"❌ Erreur validation profile_image_file: {str(e)}")
+                logger.info("Image de profil refusée user=%s: %s", user.pk, e)
                 return Response({
                     'error': f'Erreur image de profil: {str(e)}'
                 }, status=status.HTTP_400_BAD_REQUEST)
         
         if 'banner_file' in request.FILES:
             try:
-                print("🔍 Validation de banner_file...")
-                validate_image_file_debug(request.FILES['banner_file'])
-                print("✅ banner_file validé")
+                validate_image_file(request.FILES['banner_file'])
             except ValueError as e:
-                print(f"❌ Erreur validation banner_file: {str(e)}")
+                logger.info("Bannière refusée user=%s: %s", user.pk, e)
                 return Response({
                     'error': f'Erreur bannière: {str(e)}'
                 }, status=status.HTTP_400_BAD_REQUEST)
@@ -177,35 +94,26 @@ class UpdateProfilView(APIView):
         delete_profile_image = request.data.get('delete_profile_image', '').lower() == 'true'
         delete_banner = request.data.get('delete_banner', '').lower() == 'true'
         
-        print(f"Delete profile image: {delete_profile_image}")
-        print(f"Delete banner: {delete_banner}")
+        logger.debug("Suppression demandée: image de profil=%s, bannière=%s", delete_profile_image, delete_banner)
         
         # ========================
         # 2. SUPPRESSION ANCIENNES IMAGES
         # ========================
+        # Les fichiers retirés ou remplacés sont supprimés par sweep_media
+        # s'ils ne sont plus référencés
         
         if delete_profile_image and user.profile_image:
-            remove_old_file(user.profile_image)
             user.profile_image = None
             user.profile_image_url = None
         
         if delete_banner and user.banner:
-            remove_old_file(user.banner)
             user.banner = None
             user.banner_url = None
         
-        # Supprimer les anciennes images si de nouvelles sont uploadées
-        if 'profile_image_file' in request.FILES and user.profile_image:
-            remove_old_file(user.profile_image)
-        
-        if 'banner_file' in request.FILES and user.banner:
-            remove_old_file(user.banner)
-        
         # ========================
         # 3. MISE À JOUR VIA SERIALIZER
         # ========================
         
-        print("🔄 Création du serializer...")
         serializer = UserProfileSerializer(
             user,
             data=request.data,
@@ -213,13 +121,10 @@ class UpdateProfilView(APIView):
             context={'request': request}
         )
         
-        print(f"Serializer data keys: {list(request.data.keys())}")
-        
         if serializer.is_valid():
-            print("✅ Serializer valide")
             # Sauvegarder les modifications
             updated_user = serializer.save()
-            print("✅ User sauvegardé")
+            logger.debug("Profil sauvegardé user=%s", user.pk)
             
             # ========================
             # 4. RESPONSE AVEC DÉTAILS
@@ -259,9 +164,7 @@ class UpdateProfilView(APIView):
             }, status=status.HTTP_200_OK)
         
         else:
-            print("❌ Erreurs de validation du serializer:")
-            for field, errors in serializer.errors.items():
-                print(f"  {field}: {errors}")
+            logger.info("Profil invalide user=%s: %s", user.pk, serializer.errors)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -269,6 +172,8 @@ class UpdateProfilView(APIView):
 # Autres vues restent identiques...
 class SignupView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = 'signup'
     
     def post(self, request):
         serializer = UserRegistrationSerializer(data=request.data)
@@ -285,6 +190,8 @@ class SignupView(APIView):
 
 class SigninView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = 'signin'
 
     def post(self, request):
         serializer = UserLoginSerializer(data=request.data)
@@ -310,6 +217,8 @@ class CurrentUserView(APIView):
 
 class ResetPasswordConfirmView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = 'password_reset_confirm'
 
     def post(self, request):
         serializer = PasswordResetConfirmSerializer(data=request.data)
@@ -321,7 +230,7 @@ class ResetPasswordConfirmView(APIView):
                 reset_token = PasswordResetToken.objects.get(
                     token=token,
                     is_used=False,
-                    created_at__gte=timezone.now() - timedelta(hours=24)
+                    created_at__gte=timezone.now() - PASSWORD_RESET_TOKEN_LIFETIME
                 )
                 
                 user = reset_token.user
@@ -358,6 +267,8 @@ class LogoutView(APIView):
 
 class ResetPasswordView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = 'password_reset'
 
     def post(self, request):
         serializer = PasswordResetSerializer(data=request.data)
@@ -371,14 +282,12 @@ class ResetPasswordView(APIView):
             # Créer un nouveau token
             reset_token = PasswordResetToken.objects.create(user=user)
             
-            # Envoyer l'email
+            # Mise en file de l'email (envoyé par la commande send_outbox)
             reset_url = f"http://localhost:3000/reset-password/{reset_token.token}"
-            send_mail(
+            queue_email(
                 'Réinitialisation de mot de passe',
                 f'Cliquez sur ce lien pour réinitialiser votre mot de passe: {reset_url}',
-                settings.DEFAULT_FROM_EMAIL,
                 [email],
-                fail_silently=False,
             )
             
             return Response({
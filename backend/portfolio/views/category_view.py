@@ -2,8 +2,9 @@ from rest_framework import viewsets
 from portfolio.models.category import Category
 from portfolio.serializers.category_serializer import CategorySerializer
 from rest_framework.permissions import IsAuthenticated
+from portfolio.views.mixins import ConditionalGetMixin
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticated]
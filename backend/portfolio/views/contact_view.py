@@ -3,13 +3,24 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from ..models.contact import Contact
 from ..models.user import User
 from ..serializers.contact_serializer import ContactSerializer
+from ..signals import invalidate_user_cache
+from ..throttling import IPTokenBucketThrottle, TargetUserTokenBucketThrottle
+from .mixins import ConditionalGetMixin
 
-class ContactViewSet(viewsets.ModelViewSet):
+class ContactViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Contact.objects.all()
     serializer_class = ContactSerializer
+    throttle_scope = 'contact'
+
+    def get_throttles(self):
+        """Seule la création de messages est limitée (par IP et par destinataire)"""
+        if self.action == 'create':
+            return [IPTokenBucketThrottle(), TargetUserTokenBucketThrottle()]
+        return super().get_throttles()
     
     def get_queryset(self):
         """
@@ -41,8 +52,9 @@ class ContactViewSet(viewsets.ModelViewSet):
             )
         
         contacts = Contact.objects.filter(user=user)
-        serializer = self.get_serializer(contacts, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(contacts)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='my-contacts')
     def my_contacts(self, request):
@@ -51,8 +63,13 @@ class ContactViewSet(viewsets.ModelViewSet):
         URL: /api/contacts/my-contacts/
         """
         contacts = Contact.objects.filter(user=request.user)
-        serializer = self.get_serializer(contacts, many=True)
-        return Response(serializer.data)
+        
+        def build():
+            page = self.paginate_queryset(contacts)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        return self.conditional_response(contacts, build)
 
     @action(detail=True, methods=['patch'])
     def mark_as_read(self, request, pk=None):
@@ -61,7 +78,48 @@ class ContactViewSet(viewsets.ModelViewSet):
         URL: /api/contacts/{id}/mark_as_read/
         """
         contact = self.get_object()
-        contact.read = True
-        contact.save()
+        if not contact.read:
+            contact.read = True
+            # Le signal post_save met à jour le compteur de non lus
+            contact.save(update_fields=['read', 'updated_at'])
         serializer = self.get_serializer(contact)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'], url_path='unread-count')
+    def unread_count(self, request):
+        """
+        Nombre de messages non lus de l'utilisateur connecté
+        URL: /api/contacts/unread-count/
+
+        Une requête sur la colonne du compteur (request.user est une instance
+        partielle, voir CachedJWTAuthentication): à utiliser pour le polling
+        au lieu de my-contacts
+        """
+        unread = User.objects.filter(pk=request.user.pk).values_list('unread_contacts_count', flat=True).first()
+        return Response({'unread_count': unread or 0})
+
+    @action(detail=False, methods=['get', 'patch'], url_path='digest')
+    def digest(self, request):
+        """
+        Préférence de résumé par email des nouveaux messages
+        URL: /api/contacts/digest/
+        PATCH {"frequency": "none" | "daily" | "weekly"}
+        """
+        user = request.user
+        if request.method == 'PATCH':
+            frequency = request.data.get('frequency')
+            if frequency not in dict(User.DIGEST_CHOICES):
+                return Response(
+                    {'error': f"frequency doit valoir: {', '.join(dict(User.DIGEST_CHOICES))}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if frequency != user.contact_digest:
+                # Un seul champ mis à jour; updated_at et la version du cache changent
+                # comme pour une sauvegarde (ETag du profil, réponses en cache)
+                User.objects.filter(pk=user.pk).update(contact_digest=frequency, updated_at=timezone.now())
+                invalidate_user_cache(user.pk)
+                user.contact_digest = frequency
+        return Response({
+            'frequency': user.contact_digest,
+            'last_sent_at': user.contact_digest_sent_at,
+        })
\ No newline at end of file
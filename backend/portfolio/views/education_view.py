@@ -5,11 +5,15 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
 from ..models.education import Education
 from ..models.user import User
+from ..cache import cached_user_section
+from ..pagination import StartDateCursorPagination
 from ..serializers.education_serializer import EducationSerializer
+from .mixins import BulkMixin, ConditionalGetMixin
 
-class EducationViewSet(viewsets.ModelViewSet):
+class EducationViewSet(BulkMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = EducationSerializer
     permission_classes = [IsAuthenticated]
+    last_modified_fields = ('updated_at', 'user__updated_at')
 
     def get_queryset(self):
         """
@@ -17,8 +21,8 @@ class EducationViewSet(viewsets.ModelViewSet):
         ou seulement les formations de l'utilisateur connecté
         """
         if self.request.user.is_staff or self.request.user.is_superuser:
-            return Education.objects.all()
-        return Education.objects.filter(user=self.request.user)
+            return Education.objects.select_related('user').all()
+        return Education.objects.select_related('user').filter(user=self.request.user)
 
     def perform_create(self, serializer):
         """Associe automatiquement la formation à l'utilisateur connecté"""
@@ -46,18 +50,25 @@ class EducationViewSet(viewsets.ModelViewSet):
         Accessible sans authentification - permet aux visiteurs de voir
         les formations d'un utilisateur pour son portfolio public
         """
-        user = get_object_or_404(User, id=user_id)
+        def build():
+            user = get_object_or_404(User, id=user_id)
+            
+            # Récupérer toutes les formations de l'utilisateur
+            # (pas de restriction car endpoint public)
+            educations = Education.objects.select_related('user').filter(user=user)
+            paginator = StartDateCursorPagination()
+            page = paginator.paginate_queryset(educations, request, view=self)
+            serializer = self.get_serializer(page, many=True)
+            
+            return {
+                'user_id': user.id,
+                'user_name': user.username,
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+                'educations': serializer.data
+            }
         
-        # Récupérer toutes les formations de l'utilisateur
-        # (pas de restriction car endpoint public)
-        educations = Education.objects.filter(user=user).order_by('-start_date')
-        serializer = self.get_serializer(educations, many=True)
-        
-        return Response({
-            'user_id': user.id,
-            'user_name': user.username,
-            'educations': serializer.data
-        })
+        return Response(cached_user_section(user_id, 'educations', build, request))
 
     @action(detail=False, methods=['get'], url_path='my-educations')
     def my_educations(self, request):
@@ -65,9 +76,14 @@ class EducationViewSet(viewsets.ModelViewSet):
         Endpoint pour récupérer les formations de l'utilisateur connecté
         URL: /api/educations/my-educations/
         """
-        educations = Education.objects.filter(user=request.user)
-        serializer = self.get_serializer(educations, many=True)
-        return Response(serializer.data)
+        educations = Education.objects.select_related('user').filter(user=request.user)
+        
+        def build():
+            page = self.paginate_queryset(educations)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        return self.conditional_response(educations, build)
 
     @action(detail=False, methods=['get'], url_path='current-education')
     def current_education(self, request):
@@ -75,7 +91,7 @@ class EducationViewSet(viewsets.ModelViewSet):
         Endpoint pour récupérer la formation actuelle (sans end_date)
         URL: /api/educations/current-education/
         """
-        current_edu = Education.objects.filter(
+        current_edu = Education.objects.select_related('user').filter(
             user=request.user, 
             end_date__isnull=True
         ).first()
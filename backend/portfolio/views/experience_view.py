@@ -5,11 +5,14 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
 from ..models.experience import Experience
 from ..models.user import User
+from ..cache import cached_user_section
 from ..serializers.experience_serializer import ExperienceSerializer
+from .mixins import BulkMixin, ConditionalGetMixin, is_owner_or_admin
 
-class ExperienceViewSet(viewsets.ModelViewSet):
+class ExperienceViewSet(BulkMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = ExperienceSerializer
     permission_classes = [IsAuthenticated]
+    last_modified_fields = ('updated_at', 'user__updated_at')
 
     def get_queryset(self):
         """
@@ -17,8 +20,8 @@ class ExperienceViewSet(viewsets.ModelViewSet):
         ou seulement les expériences de l'utilisateur connecté
         """
         if self.request.user.is_staff or self.request.user.is_superuser:
-            return Experience.objects.all()
-        return Experience.objects.filter(user=self.request.user)
+            return Experience.objects.select_related('user').all()
+        return Experience.objects.select_related('user').filter(user=self.request.user)
 
     def perform_create(self, serializer):
         """Associe automatiquement l'expérience à l'utilisateur connecté"""
@@ -43,17 +46,20 @@ class ExperienceViewSet(viewsets.ModelViewSet):
         Endpoint pour récupérer les expériences d'un utilisateur spécifique
         URL: /api/experiences/user/{user_id}/
         """
-        user = get_object_or_404(User, id=user_id)
-        
-        if not (request.user == user or request.user.is_staff or request.user.is_superuser):
+        if not is_owner_or_admin(request.user, user_id):
             return Response(
                 {'error': 'Vous n\'avez pas la permission d\'accéder à ces données'}, 
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        experiences = Experience.objects.filter(user=user)
-        serializer = self.get_serializer(experiences, many=True)
-        return Response(serializer.data)
+        def build():
+            user = get_object_or_404(User, id=user_id)
+            experiences = Experience.objects.select_related('user').filter(user=user)
+            page = self.paginate_queryset(experiences)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data).data
+        
+        return Response(cached_user_section(user_id, 'experiences', build, request))
 
     @action(detail=False, methods=['get'], url_path='my-experiences')
     def my_experiences(self, request):
@@ -61,9 +67,14 @@ class ExperienceViewSet(viewsets.ModelViewSet):
         Endpoint pour récupérer les expériences de l'utilisateur connecté
         URL: /api/experiences/my-experiences/
         """
-        experiences = Experience.objects.filter(user=request.user)
-        serializer = self.get_serializer(experiences, many=True)
-        return Response(serializer.data)
+        experiences = Experience.objects.select_related('user').filter(user=request.user)
+        
+        def build():
+            page = self.paginate_queryset(experiences)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        return self.conditional_response(experiences, build)
 
     @action(detail=False, methods=['get'], url_path='current-experience')
     def current_experience(self, request):
@@ -71,7 +82,7 @@ class ExperienceViewSet(viewsets.ModelViewSet):
         Endpoint pour récupérer l'expérience actuelle (sans end_date)
         URL: /api/experiences/current-experience/
         """
-        current_exp = Experience.objects.filter(
+        current_exp = Experience.objects.select_related('user').filter(
             user=request.user, 
             end_date__isnull=True
         ).first()
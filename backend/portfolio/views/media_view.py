@@ -0,0 +1,146 @@
+"""
+Service des fichiers médias et statiques
+
+Les médias (MEDIA_ROOT) et les fichiers statiques collectés (STATIC_ROOT) sont
+servis avec un ETag fort et un Cache-Control adapté:
+- noms dérivés du contenu (blobs SHA-256 des médias, noms hachés par
+  collectstatic): cache d'un an, immuable;
+- autres noms: revalidation à chaque utilisation (réponse 304 si inchangé).
+Selon PORTFOLIO_FILE_SERVE_MODE, le contenu est envoyé:
+- 'x-accel': par nginx (en-tête X-Accel-Redirect vers une location internal),
+  le worker Django ne lit jamais le fichier. nginx signale qu'il a relayé la
+  requête par l'en-tête X-Accel-Enabled: une requête arrivée directement
+  (URL construite avec SITE_URL, port du backend) est servie par Django;
+- 'x-sendfile': par le serveur frontal (Apache mod_xsendfile, lighttpd);
+- 'django': par Django (FileResponse), réservé au développement.
+Les fichiers statiques compressibles sont servis en .br/.gz précompressés
+(voir CompressedManifestStaticFilesStorage) selon Accept-Encoding; en mode
+x-accel, nginx les choisit lui-même (gzip_static / brotli_static).
+"""
+
+import mimetypes
+import os
+import re
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers, quote_etag
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from ..storage import is_blob_name
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+
+# Nom haché par ManifestStaticFilesStorage: nom.<12 caractères hexadécimaux>.ext
+HASHED_STATIC_RE = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+# Encodages précompressés, par ordre de préférence: (encodage, extension)
+PRECOMPRESSED_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+# Ajouté par nginx aux requêtes /media/ et /static/ relayées (frontend/nginx.conf)
+ACCEL_HEADER = 'X-Accel-Enabled'
+
+
+def serve_mode(request):
+    mode = getattr(settings, 'PORTFOLIO_FILE_SERVE_MODE', 'django')
+    if mode == 'x-accel' and not request.headers.get(ACCEL_HEADER):
+        # Sans nginx devant, X-Accel-Redirect donnerait une réponse vide
+        return 'django'
+    return mode
+
+
+def accepted_encodings(request):
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    encodings = set()
+    for part in header.split(','):
+        encoding, _, params = part.partition(';')
+        quality = params.strip()
+        try:
+            if quality.startswith('q=') and float(quality[2:]) == 0:
+                continue
+        except ValueError:
+            continue
+        encodings.add(encoding.strip().lower())
+    return encodings
+
+
+def precompressed_variant(request, path):
+    """Retourne (chemin, encodage) du fichier précompressé accepté par le client, ou (path, None)"""
+    encodings = accepted_encodings(request)
+    for encoding, extension in PRECOMPRESSED_ENCODINGS:
+        if encoding in encodings and os.path.isfile(path + extension):
+            return path + extension, encoding
+    return path, None
+
+
+def serve_file(request, root, name, immutable, internal_prefix, precompressed=False):
+    """
+    Sert le fichier `name` du dossier `root`
+    internal_prefix: préfixe de la location internal nginx (mode x-accel)
+    """
+    try:
+        path = safe_join(root, name)
+    except (SuspiciousFileOperation, ValueError):
+        raise Http404("Fichier introuvable")
+    mode = serve_mode(request)
+
+    if immutable:
+        # Le nom contient l'empreinte du contenu: il sert d'ETag
+        etag = quote_etag(os.path.splitext(os.path.basename(name))[0])
+        last_modified = None
+    if not (immutable and mode == 'x-accel'):
+        # En mode x-accel, un fichier immuable est servi sans accès disque
+        # (nginx renvoie lui-même 404 s'il n'existe pas)
+        if not os.path.isfile(path):
+            raise Http404("Fichier introuvable")
+        if not immutable:
+            stat = os.stat(path)
+            etag = quote_etag(f"{stat.st_size:x}-{stat.st_mtime_ns:x}")
+            last_modified = int(stat.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        content_type, _ = mimetypes.guess_type(path)
+        content_type = content_type or 'application/octet-stream'
+        if mode == 'x-accel':
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = internal_prefix.rstrip('/') + '/' + name.replace('\\', '/')
+        elif mode == 'x-sendfile':
+            response = HttpResponse(content_type=content_type)
+            response['X-Sendfile'] = path
+        else:
+            file_path, encoding = precompressed_variant(request, path) if precompressed else (path, None)
+            response = FileResponse(open(file_path, 'rb'), content_type=content_type)
+            if encoding:
+                response['Content-Encoding'] = encoding
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+
+    response['ETag'] = etag
+    response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+    if precompressed:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Fichiers uploadés: les blobs (nommés par leur SHA-256) sont immuables"""
+    return serve_file(
+        request, settings.MEDIA_ROOT, path,
+        immutable=is_blob_name(path),
+        internal_prefix=getattr(settings, 'PORTFOLIO_MEDIA_INTERNAL_PREFIX', '/protected-media/'),
+    )
+
+
+@require_safe
+def serve_static(request, path):
+    """Fichiers collectés par collectstatic: les noms hachés sont immuables"""
+    return serve_file(
+        request, settings.STATIC_ROOT, path,
+        immutable=bool(HASHED_STATIC_RE.search(path)),
+        internal_prefix=getattr(settings, 'PORTFOLIO_STATIC_INTERNAL_PREFIX', '/protected-static/'),
+        precompressed=True,
+    )
@@ -0,0 +1,289 @@
+import calendar
+import hashlib
+from django.db import connection, transaction
+from django.db.models import Case, Count, IntegerField, Max, Value, When
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
+from rest_framework.response import Response
+from ..signals import invalidate_user_cache
+
+
+def is_owner_or_admin(user, user_id):
+    """
+    L'utilisateur connecté est-il user_id (identifiant de l'URL) ou un admin
+    Comparaison entière: /user/05/ désigne l'utilisateur 5
+    """
+    if user.is_staff or user.is_superuser:
+        return True
+    try:
+        return user.is_authenticated and user.pk == int(user_id)
+    except (TypeError, ValueError):
+        return False
+
+
+class ConditionalGetMixin:
+    """
+    Mixin de viewset pour les GET conditionnels (ETag / Last-Modified)
+
+    Les validateurs sont calculés avec une seule requête d'agrégation
+    (Count + Max des champs updated_at) sur le queryset de la vue.
+    Si le client possède déjà la version courante, une réponse 304 est
+    renvoyée avant toute sérialisation.
+    """
+    # Champs datetime dont le maximum détermine Last-Modified.
+    # Ajouter les relations dont les données sont embarquées par le serializer
+    # (ex: 'user__updated_at' pour user_name).
+    last_modified_fields = ('updated_at',)
+
+    def get_conditional_validators(self, queryset):
+        """Retourne (etag, last_modified) pour un queryset"""
+        aggregates = {
+            f'last_modified_{index}': Max(field)
+            for index, field in enumerate(self.last_modified_fields)
+        }
+        values = queryset.order_by().aggregate(count=Count('pk'), **aggregates)
+        count = values.pop('count')
+        timestamps = [value for value in values.values() if value is not None]
+        last_modified = max(timestamps) if timestamps else None
+
+        # L'utilisateur fait partie de l'ETag: deux comptes ne partagent jamais une version
+        signature = f"{self.request.user.pk}:{count}:{last_modified.isoformat() if last_modified else ''}"
+        etag = quote_etag(hashlib.md5(signature.encode()).hexdigest())
+        return etag, last_modified
+
+    def conditional_response(self, queryset, build_response):
+        """
+        Retourne 304 si le client est à jour, sinon la réponse de build_response()
+        Dans les deux cas les en-têtes ETag et Last-Modified sont ajoutés
+        """
+        etag, last_modified = self.get_conditional_validators(queryset)
+        timestamp = calendar.timegm(last_modified.utctimetuple()) if last_modified else None
+
+        response = get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = build_response()
+
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        parent_list = super().list
+        return self.conditional_response(queryset, lambda: parent_list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        parent_retrieve = super().retrieve
+        return self.conditional_response(queryset, lambda: parent_retrieve(request, *args, **kwargs))
+
+
+class BulkMixin:
+    """
+    Mixin de viewset ajoutant l'action bulk: création, modification et
+    suppression de plusieurs lignes en une seule requête
+    URL: /api/<section>/bulk/
+
+    - POST: liste d'objets à créer
+    - PATCH: liste d'objets à modifier, chacun avec son 'id'
+    - DELETE: liste d'identifiants à supprimer
+
+    Chaque élément est validé séparément: les éléments valides sont
+    enregistrés en une transaction (bulk_create / bulk_update), les erreurs
+    sont renvoyées par élément avec leur position dans la liste.
+    Statut: 200/201 si tout a réussi, 207 en cas d'échec partiel, 400 si aucun
+    élément n'a pu être traité.
+    """
+    bulk_max_items = 100
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'error': 'Une liste non vide est attendue'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {'error': f'Trop d\'éléments: {self.bulk_max_items} maximum par requête'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if request.method == 'POST':
+            return self.perform_bulk_create(items)
+        if request.method == 'PATCH':
+            return self.perform_bulk_update(items)
+        return self.perform_bulk_delete(items)
+
+    def bulk_response(self, results, errors, success_status=status.HTTP_200_OK):
+        if not errors:
+            response_status = success_status
+        elif results:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({'results': results, 'errors': errors}, status=response_status)
+
+    @staticmethod
+    def parse_bulk_id(value):
+        """Identifiant entier d'un élément, ou None s'il est invalide"""
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def perform_bulk_create(self, items):
+        model = self.get_serializer_class().Meta.model
+        instances, errors = [], []
+        for index, item in enumerate(items):
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                instances.append(model(user=self.request.user, **serializer.validated_data))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+
+        if instances:
+            with transaction.atomic():
+                if connection.features.can_return_rows_from_bulk_insert:
+                    model.objects.bulk_create(instances)
+                else:
+                    # MySQL ne renvoie pas les clés générées par un INSERT multiple
+                    for instance in instances:
+                        instance.save()
+            invalidate_user_cache(self.request.user.pk)
+
+        results = self.get_serializer(instances, many=True).data
+        return self.bulk_response(results, errors, status.HTTP_201_CREATED)
+
+    def perform_bulk_update(self, items):
+        model = self.get_serializer_class().Meta.model
+        ids = [self.parse_bulk_id(item.get('id')) for item in items if isinstance(item, dict)]
+        existing = self.get_queryset().in_bulk([pk for pk in ids if pk is not None])
+
+        instances, errors, fields = {}, [], set()
+        for index, item in enumerate(items):
+            pk = self.parse_bulk_id(item.get('id')) if isinstance(item, dict) else None
+            instance = instances.get(pk) or existing.get(pk)
+            if instance is None:
+                errors.append({'index': index, 'id': item.get('id') if isinstance(item, dict) else None,
+                               'errors': {'id': ['Objet introuvable']}})
+                continue
+
+            serializer = self.get_serializer(instance, data=item, partial=True)
+            if serializer.is_valid():
+                for attr, value in serializer.validated_data.items():
+                    setattr(instance, attr, value)
+                fields.update(serializer.validated_data)
+                instances[pk] = instance
+            else:
+                errors.append({'index': index, 'id': pk, 'errors': serializer.errors})
+
+        if instances:
+            # bulk_update ne met pas à jour les champs auto_now
+            now = timezone.now()
+            for instance in instances.values():
+                instance.updated_at = now
+            with transaction.atomic():
+                model.objects.bulk_update(instances.values(), [*fields, 'updated_at'])
+            for user_id in {instance.user_id for instance in instances.values()}:
+                invalidate_user_cache(user_id)
+
+        results = self.get_serializer(list(instances.values()), many=True).data
+        return self.bulk_response(results, errors)
+
+    def perform_bulk_delete(self, items):
+        ids = [self.parse_bulk_id(item) for item in items]
+        found = set(self.get_queryset().filter(pk__in=[pk for pk in ids if pk is not None]).values_list('pk', flat=True))
+
+        errors = [
+            {'index': index, 'id': item, 'errors': {'id': ['Objet introuvable']}}
+            for index, (item, pk) in enumerate(zip(items, ids))
+            if pk not in found
+        ]
+        if found:
+            # QuerySet.delete() émet post_delete: le cache est invalidé par les signaux
+            with transaction.atomic():
+                self.get_queryset().filter(pk__in=found).delete()
+
+        return self.bulk_response(sorted(found), errors)
+
+
+class ReorderMixin:
+    """
+    Mixin de viewset pour l'ordre d'affichage (champ position) des éléments
+    d'un utilisateur
+    URL: /api/<section>/reorder/ avec {"ids": [...]}: liste complète des
+    identifiants de l'utilisateur dans le nouvel ordre
+
+    Toutes les positions sont réécrites par un seul UPDATE ... CASE.
+    """
+
+    def get_ordered_ids(self, user_id):
+        model = self.get_serializer_class().Meta.model
+        return list(
+            model.objects.filter(user_id=user_id)
+            .order_by('position', '-created_at', '-id')
+            .values_list('pk', flat=True)
+        )
+
+    def write_positions(self, user_id, ids):
+        """Enregistre les positions 0..n-1 dans l'ordre de ids en une requête"""
+        model = self.get_serializer_class().Meta.model
+        model.objects.filter(user_id=user_id, pk__in=ids).update(
+            position=Case(
+                *[When(pk=pk, then=Value(index)) for index, pk in enumerate(ids)],
+                output_field=IntegerField(),
+            ),
+            # updated_at change aussi: les ETag des listes doivent être invalidés
+            updated_at=timezone.now(),
+        )
+        invalidate_user_cache(user_id)
+
+    def move_to_position(self, instance, index):
+        """Déplace un élément à l'indice donné de la liste de son propriétaire"""
+        ids = [pk for pk in self.get_ordered_ids(instance.user_id) if pk != instance.pk]
+        ids.insert(min(index, len(ids)), instance.pk)
+        self.write_positions(instance.user_id, ids)
+        instance.refresh_from_db(fields=['position', 'updated_at'])
+
+    @action(detail=False, methods=['post'], url_path='reorder',
+            parser_classes=[JSONParser, FormParser, MultiPartParser])
+    def reorder(self, request):
+        if hasattr(request.data, 'getlist'):
+            ids = request.data.getlist('ids')
+        else:
+            ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not ids:
+            return Response(
+                {'error': 'Une liste "ids" non vide est attendue'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            return Response({'error': 'Les identifiants doivent être des entiers'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(set(ids)) != len(ids):
+            return Response({'error': 'La liste contient des doublons'}, status=status.HTTP_400_BAD_REQUEST)
+
+        current = set(self.get_ordered_ids(request.user.pk))
+        missing = sorted(current - set(ids))
+        unknown = sorted(set(ids) - current)
+        if missing or unknown:
+            return Response({
+                'error': 'La liste doit contenir exactement tous vos éléments',
+                'missing': missing,
+                'unknown': unknown,
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        self.write_positions(request.user.pk, ids)
+        return Response({'ids': ids})
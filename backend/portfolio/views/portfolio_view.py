@@ -0,0 +1,48 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import AllowAny
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+from ..models.user import User
+from ..cache import cached_user_section
+from ..models.project import Project
+from ..models.service import Service
+from ..models.social import Social
+from ..models.education import Education
+from ..models.experience import Experience
+from ..models.skill import Skill
+from ..serializers.portfolio_serializer import PortfolioSerializer
+
+
+def get_portfolio_queryset():
+    """
+    Queryset utilisateur avec toutes les sections du portfolio préchargées:
+    une requête pour l'utilisateur puis une requête par table
+    Seuls les projets terminés et les services actifs sont publics (comme la recherche)
+    """
+    return User.objects.prefetch_related(
+        Prefetch('projects', queryset=Project.objects.filter(status=Project.STATUS_COMPLETED)),
+        Prefetch('services', queryset=Service.objects.filter(is_active=True)),
+        Prefetch('socials', queryset=Social.objects.select_related('social_type')),
+        Prefetch('educations', queryset=Education.objects.order_by('-start_date')),
+        Prefetch('experiences', queryset=Experience.objects.all()),
+        Prefetch('skills', queryset=Skill.objects.all()),
+    )
+
+
+class PortfolioView(APIView):
+    """
+    Endpoint PUBLIC agrégé du portfolio d'un utilisateur
+    URL: /api/portfolio/{user_id}/
+
+    Retourne le profil et toutes les sections (projets, services, réseaux sociaux,
+    formations, expériences, skills) en une seule réponse
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, user_id):
+        def build():
+            user = get_object_or_404(get_portfolio_queryset(), id=user_id)
+            return PortfolioSerializer(user, context={'request': request}).data
+        
+        return Response(cached_user_section(user_id, 'portfolio', build, request))
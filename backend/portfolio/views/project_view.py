@@ -4,95 +4,20 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
-from PIL import Image
-import os
-import tempfile
 from ..models.project import Project
 from ..models.user import User
+from ..cache import cached_user_section
 from ..serializers.project_serializer import ProjectSerializer
+from ..validators import validate_image_file
+from ..tags import normalize_name
+from .mixins import ConditionalGetMixin, ReorderMixin, is_owner_or_admin
+from ..pagination import PositionPagination
 
-def validate_project_image(file):
-    """
-    Valide le fichier image uploadé avec debug détaillé
-    """
-    print(f"=== VALIDATION IMAGE DEBUG ===")
-    print(f"File object type: {type(file)}")
-    print(f"File name: {getattr(file, 'name', 'NO NAME')}")
-    print(f"File size: {getattr(file, 'size', 'NO SIZE')}")
-    print(f"File content_type: {getattr(file, 'content_type', 'NO CONTENT_TYPE')}")
-    
-    # Vérifier si c'est bien un objet fichier Django
-    if not hasattr(file, 'read'):
-        raise ValueError(f"L'objet n'est pas un fichier valide: {type(file)}")
-    
-    # Vérifier la taille du fichier (max 5MB)
-    max_size = 5 * 1024 * 1024  # 5MB
-    if hasattr(file, 'size') and file.size > max_size:
-        raise ValueError("Le fichier est trop volumineux. Taille maximale: 5MB")
-    
-    # Vérifier l'extension
-    if hasattr(file, 'name') and file.name:
-        allowed_extensions = ['jpg', 'jpeg', 'png', 'webp']
-        file_extension = file.name.split('.')[-1].lower()
-        print(f"Extension détectée: {file_extension}")
-        if file_extension not in allowed_extensions:
-            raise ValueError(f"Format de fichier non supporté. Formats acceptés: {', '.join(allowed_extensions)}")
-    
-    # Vérifier que c'est vraiment une image avec PIL
-    try:
-        print("Tentative d'ouverture avec PIL...")
-        # Sauvegarder temporairement pour debugger
-        file.seek(0)  # Retour au début du fichier
-        image = Image.open(file)
-        print(f"Image PIL ouverte: format={image.format}, mode={image.mode}, size={image.size}")
-        
-        # Vérifier l'image
-        image.verify()
-        print("✅ Image PIL vérifiée avec succès")
-        
-        # Remettre le pointeur au début pour utilisation ultérieure
-        file.seek(0)
-        
-    except Exception as e:
-        print(f"❌ Erreur PIL: {str(e)}")
-        print(f"Type d'erreur: {type(e)}")
-        
-        # Essayer de créer un fichier temporaire pour debug
-        try:
-            file.seek(0)
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.tmp') as temp_file:
-                temp_file.write(file.read())
-                temp_path = temp_file.name
-            
-            print(f"Fichier temporaire créé: {temp_path}")
-            
-            # Essayer d'ouvrir le fichier temporaire
-            with Image.open(temp_path) as temp_image:
-                print(f"Fichier temporaire ouvert: {temp_image.format}, {temp_image.size}")
-            
-            # Nettoyer
-            os.unlink(temp_path)
-            file.seek(0)
-            
-        except Exception as temp_error:
-            print(f"❌ Erreur fichier temporaire: {str(temp_error)}")
-            raise ValueError(f"Le fichier n'est pas une image valide: {str(e)}")
-    
-    return True
-
-def remove_old_file(file_field):
-    """
-    Supprime un ancien fichier s'il existe
-    """
-    if file_field and hasattr(file_field, 'path') and os.path.isfile(file_field.path):
-        try:
-            os.remove(file_field.path)
-        except OSError:
-            pass
-
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ReorderMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
+    pagination_class = PositionPagination
     permission_classes = [IsAuthenticated]
+    last_modified_fields = ('updated_at', 'user__updated_at')
     parser_classes = [MultiPartParser, FormParser]
 
     def get_queryset(self):
@@ -126,7 +51,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         # Validation de l'image si présente
         if 'image_file' in request.FILES:
             try:
-                validate_project_image(request.FILES['image_file'])
+                validate_image_file(request.FILES['image_file'])
             except ValueError as e:
                 return Response({
                     'error': f'Erreur image: {str(e)}'
@@ -139,7 +64,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         # Validation de l'image si présente
         if 'image_file' in request.FILES:
             try:
-                validate_project_image(request.FILES['image_file'])
+                validate_image_file(request.FILES['image_file'])
             except ValueError as e:
                 return Response({
                     'error': f'Erreur image: {str(e)}'
@@ -153,17 +78,20 @@ class ProjectViewSet(viewsets.ModelViewSet):
         Endpoint pour récupérer les projets d'un utilisateur spécifique
         URL: /api/projects/user/{user_id}/
         """
-        user = get_object_or_404(User, id=user_id)
-        
-        if not (request.user == user or request.user.is_staff or request.user.is_superuser):
+        if not is_owner_or_admin(request.user, user_id):
             return Response(
                 {'error': 'Vous n\'avez pas la permission d\'accéder à ces données'}, 
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        projects = Project.objects.select_related('user').filter(user=user)
-        serializer = self.get_serializer(projects, many=True)
-        return Response(serializer.data)
+        def build():
+            user = get_object_or_404(User, id=user_id)
+            projects = Project.objects.select_related('user').filter(user=user)
+            page = self.paginate_queryset(projects)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data).data
+        
+        return Response(cached_user_section(user_id, 'projects', build, request))
 
     @action(detail=False, methods=['get'], url_path='my-projects')
     def my_projects(self, request):
@@ -172,8 +100,13 @@ class ProjectViewSet(viewsets.ModelViewSet):
         URL: /api/projects/my-projects/
         """
         projects = Project.objects.select_related('user').filter(user=request.user)
-        serializer = self.get_serializer(projects, many=True)
-        return Response(serializer.data)
+        
+        def build():
+            page = self.paginate_queryset(projects)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        return self.conditional_response(projects, build)
 
     @action(detail=False, methods=['get'], url_path='by-status/(?P<status_name>[^/.]+)')
     def projects_by_status(self, request, status_name=None):
@@ -208,6 +141,20 @@ class ProjectViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(projects, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'], url_path='by-technology/(?P<technology_name>[^/.]+)')
+    def projects_by_technology(self, request, technology_name=None):
+        """
+        Endpoint pour récupérer les projets utilisant une technologie
+        URL: /api/projects/by-technology/{technology_name}/
+        """
+        # Recherche indexée via la table ProjectTechnology (Project.technologies est un JSONField)
+        projects = Project.objects.select_related('user').filter(
+            user=request.user,
+            project_technologies__technology__name=normalize_name(technology_name)
+        )
+        serializer = self.get_serializer(projects, many=True)
+        return Response(serializer.data)
+
     @action(detail=True, methods=['post'])
     def upload_image(self, request, pk=None):
         """
@@ -224,14 +171,11 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
         # Valider le fichier
         try:
-            validate_project_image(request.FILES['image'])
+            validate_image_file(request.FILES['image'])
         except ValueError as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Supprimer l'ancienne image
-        remove_old_file(project.image)
-
-        # Assigner la nouvelle image
+        # Assigner la nouvelle image (l'ancienne est supprimée par sweep_media si elle n'est plus référencée)
         project.image = request.FILES['image']
         project.save()
 
@@ -250,7 +194,6 @@ class ProjectViewSet(viewsets.ModelViewSet):
         project = self.get_object()
         
         if project.image:
-            remove_old_file(project.image)
             project.image = None
             project.image_url = None
             project.save()
@@ -286,8 +229,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 'error': 'Ordre invalide'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        project.order = new_order
-        project.save()
+        # Déplace l'élément à l'indice demandé (positions réécrites en une requête)
+        self.move_to_position(project, new_order)
         
         serializer = self.get_serializer(project)
         return Response(serializer.data)
\ No newline at end of file
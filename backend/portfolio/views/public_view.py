@@ -0,0 +1,123 @@
+"""
+Vues publiques asynchrones (lecture seule)
+
+Servies par un serveur ASGI (uvicorn, daphne), ces vues attendent la base et
+le cache sans bloquer un thread par connexion: un worker peut servir de
+nombreux visiteurs lents en parallèle. Elles utilisent l'ORM asynchrone
+(aget, async for) et les appels asynchrones du cache; la sérialisation DRF est
+faite en mémoire, sur des objets déjà chargés. Les réponses sont identiques à
+celles des vues DRF équivalentes et partagent leurs entrées de cache.
+Sous WSGI, elles restent utilisables (Django les exécute dans une boucle
+d'événements dédiée) mais les vues DRF y sont plus directes.
+"""
+
+from django.http import Http404, JsonResponse
+from django.views import View
+from rest_framework.exceptions import NotFound
+from ..cache import acached_user_section
+from ..models.user import User
+from ..models.project import Project
+from ..models.service import Service
+from ..models.social import Social
+from ..models.education import Education
+from ..models.experience import Experience
+from ..models.skill import Skill
+from ..serializers.auth_serializer import UserProfileSerializer
+from ..serializers.project_serializer import ProjectSerializer
+from ..serializers.service_serializer import ServiceSerializer
+from ..serializers.social_serializer import SocialSerializer
+from ..serializers.education_serializer import EducationSerializer
+from ..serializers.experience_serializer import ExperienceSerializer
+from ..serializers.skill_serializer import SkillSerializer
+
+# Sections publiques: (queryset, serializer)
+# Le même contenu est déjà public via /api/portfolio/{user_id}/
+# (projets terminés et services actifs seulement)
+PUBLIC_SECTIONS = {
+    'projects': (lambda: Project.objects.filter(status=Project.STATUS_COMPLETED), ProjectSerializer),
+    'services': (lambda: Service.objects.filter(is_active=True), ServiceSerializer),
+    'socials': (lambda: Social.objects.select_related('social_type'), SocialSerializer),
+    'educations': (lambda: Education.objects.order_by('-start_date'), EducationSerializer),
+    'experiences': (lambda: Experience.objects.all(), ExperienceSerializer),
+    'skills': (lambda: Skill.objects.all(), SkillSerializer),
+}
+
+
+async def aget_public_user(user_id):
+    try:
+        return await User.objects.aget(id=user_id)
+    except User.DoesNotExist:
+        # Même message que get_object_or_404() dans PortfolioView
+        raise Http404("No %s matches the given query." % User._meta.object_name)
+
+
+async def aserialize_section(user, section, request):
+    """Charge et sérialise une section d'un utilisateur (une requête SQL)"""
+    build_queryset, serializer_class = PUBLIC_SECTIONS[section]
+    instances = []
+    async for instance in build_queryset().filter(user_id=user.pk):
+        # user_name: l'utilisateur est déjà chargé, pas de jointure ni de requête
+        instance.user = user
+        instances.append(instance)
+    return serializer_class(instances, many=True, context={'request': request}).data
+
+
+def not_found_response(exc=None):
+    # Même corps que les erreurs 404 de DRF (message de l'Http404 s'il y en a un)
+    detail = str(exc) if exc is not None and exc.args else str(NotFound.default_detail)
+    return JsonResponse({'detail': detail}, status=404)
+
+
+class AsyncPortfolioView(View):
+    """
+    Endpoint PUBLIC agrégé du portfolio d'un utilisateur (version ASGI de PortfolioView)
+    URL: /api/public/portfolio/{user_id}/
+
+    Même réponse que /api/portfolio/{user_id}/: le profil et toutes les sections
+    """
+    http_method_names = ['get', 'head', 'options']
+
+    async def get(self, request, user_id):
+        async def build():
+            user = await aget_public_user(user_id)
+            data = dict(UserProfileSerializer(user, context={'request': request}).data)
+            for section in PUBLIC_SECTIONS:
+                data[section] = await aserialize_section(user, section, request)
+            return data
+
+        try:
+            data = await acached_user_section(user_id, 'portfolio', build, request)
+        except Http404 as exc:
+            return not_found_response(exc)
+        return JsonResponse(data)
+
+
+class AsyncUserSectionView(View):
+    """
+    Endpoint PUBLIC d'une section du portfolio d'un utilisateur
+    URL: /api/public/users/{user_id}/{section}/
+    section: projects, services, socials, educations, experiences ou skills
+
+    Retourne toute la section (comme /api/portfolio/), sans pagination
+    """
+    http_method_names = ['get', 'head', 'options']
+
+    async def get(self, request, user_id, section):
+        if section not in PUBLIC_SECTIONS:
+            return not_found_response()
+
+        async def build():
+            user = await aget_public_user(user_id)
+            results = await aserialize_section(user, section, request)
+            return {
+                'user_id': user.pk,
+                'user_name': user.username,
+                'count': len(results),
+                'results': results,
+            }
+
+        try:
+            data = await acached_user_section(user_id, f'public:{section}', build, request)
+        except Http404 as exc:
+            return not_found_response(exc)
+        return JsonResponse(data)
@@ -0,0 +1,57 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import AllowAny
+from rest_framework import status
+from .. import search
+
+
+class SearchView(APIView):
+    """
+    Endpoint PUBLIC de recherche plein texte dans les articles publiés,
+    les projets terminés et les services actifs
+    URL: /api/search/?q=<texte>
+
+    Paramètres optionnels:
+    - type: types de documents séparés par des virgules (article,project,service)
+    - user: restreint la recherche au contenu d'un utilisateur
+    - limit: nombre de résultats (20 par défaut, 50 maximum)
+
+    Les résultats contiennent tous les mots et sont triés par pertinence; chaque
+    mot peut être incomplet (recherche par préfixe, score réduit de moitié)
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'Le paramètre de recherche "q" est requis'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        document_types = None
+        if request.query_params.get('type'):
+            document_types = [t.strip() for t in request.query_params['type'].split(',') if t.strip()]
+            invalid_types = [t for t in document_types if t not in search.DOCUMENT_FIELDS]
+            if invalid_types:
+                return Response(
+                    {'error': f"Type(s) invalide(s): {', '.join(invalid_types)}. Types valides: {', '.join(search.DOCUMENT_FIELDS)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        try:
+            user_id = int(request.query_params['user']) if request.query_params.get('user') else None
+            limit = int(request.query_params.get('limit', search.DEFAULT_LIMIT))
+        except ValueError:
+            return Response(
+                {'error': 'Les paramètres "user" et "limit" doivent être des entiers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, search.MAX_LIMIT))
+
+        count, results = search.search(query, document_types=document_types, user_id=user_id, limit=limit)
+        return Response({
+            'query': query,
+            'count': count,
+            'results': results,
+        })
@@ -4,95 +4,20 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
-from PIL import Image
-import tempfile
-import os
 from ..models.service import Service
 from ..models.user import User
+from ..cache import cached_user_section
 from ..serializers.service_serializer import ServiceSerializer
+from ..validators import validate_image_file
+from ..tags import normalize_name
+from .mixins import ConditionalGetMixin, ReorderMixin, is_owner_or_admin
+from ..pagination import PositionPagination
 
-def validate_service_icon(file):
-    """
-    Valide le fichier image uploadé avec debug détaillé
-    """
-    print(f"=== VALIDATION IMAGE DEBUG ===")
-    print(f"File object type: {type(file)}")
-    print(f"File name: {getattr(file, 'name', 'NO NAME')}")
-    print(f"File size: {getattr(file, 'size', 'NO SIZE')}")
-    print(f"File content_type: {getattr(file, 'content_type', 'NO CONTENT_TYPE')}")
-    
-    # Vérifier si c'est bien un objet fichier Django
-    if not hasattr(file, 'read'):
-        raise ValueError(f"L'objet n'est pas un fichier valide: {type(file)}")
-    
-    # Vérifier la taille du fichier (max 5MB)
-    max_size = 5 * 1024 * 1024  # 5MB
-    if hasattr(file, 'size') and file.size > max_size:
-        raise ValueError("Le fichier est trop volumineux. Taille maximale: 5MB")
-    
-    # Vérifier l'extension
-    if hasattr(file, 'name') and file.name:
-        allowed_extensions = ['jpg', 'jpeg', 'png', 'webp']
-        file_extension = file.name.split('.')[-1].lower()
-        print(f"Extension détectée: {file_extension}")
-        if file_extension not in allowed_extensions:
-            raise ValueError(f"Format de fichier non supporté. Formats acceptés: {', '.join(allowed_extensions)}")
-    
-    # Vérifier que c'est vraiment une image avec PIL
-    try:
-        print("Tentative d'ouverture avec PIL...")
-        # Sauvegarder temporairement pour debugger
-        file.seek(0)  # Retour au début du fichier
-        image = Image.open(file)
-        print(f"Image PIL ouverte: format={image.format}, mode={image.mode}, size={image.size}")
-        
-        # Vérifier l'image
-        image.verify()
-        print("✅ Image PIL vérifiée avec succès")
-        
-        # Remettre le pointeur au début pour utilisation ultérieure
-        file.seek(0)
-        
-    except Exception as e:
-        print(f"❌ Erreur PIL: {str(e)}")
-        print(f"Type d'erreur: {type(e)}")
-        
-        # Essayer de créer un fichier temporaire pour debug
-        try:
-            file.seek(0)
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.tmp') as temp_file:
-                temp_file.write(file.read())
-                temp_path = temp_file.name
-            
-            print(f"Fichier temporaire créé: {temp_path}")
-            
-            # Essayer d'ouvrir le fichier temporaire
-            with Image.open(temp_path) as temp_image:
-                print(f"Fichier temporaire ouvert: {temp_image.format}, {temp_image.size}")
-            
-            # Nettoyer
-            os.unlink(temp_path)
-            file.seek(0)
-            
-        except Exception as temp_error:
-            print(f"❌ Erreur fichier temporaire: {str(temp_error)}")
-            raise ValueError(f"Le fichier n'est pas une image valide: {str(e)}")
-    
-    return True
-
-def remove_old_file(file_field):
-    """
-    Supprime un ancien fichier s'il existe
-    """
-    if file_field and hasattr(file_field, 'path') and os.path.isfile(file_field.path):
-        try:
-            os.remove(file_field.path)
-        except OSError:
-            pass
-
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(ReorderMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = ServiceSerializer
+    pagination_class = PositionPagination
     permission_classes = [IsAuthenticated]
+    last_modified_fields = ('updated_at', 'user__updated_at')
     parser_classes = [MultiPartParser, FormParser]
 
     def get_queryset(self):
@@ -126,7 +51,7 @@ class ServiceViewSet(viewsets.ModelViewSet):
         # Validation de l'icône si présente
         if 'icon_file' in request.FILES:
             try:
-                validate_service_icon(request.FILES['icon_file'])
+                validate_image_file(request.FILES['icon_file'])
             except ValueError as e:
                 return Response({
                     'error': f'Erreur icône: {str(e)}'
@@ -139,7 +64,7 @@ class ServiceViewSet(viewsets.ModelViewSet):
         # Validation de l'icône si présente
         if 'icon_file' in request.FILES:
             try:
-                validate_service_icon(request.FILES['icon_file'])
+                validate_image_file(request.FILES['icon_file'])
             except ValueError as e:
                 return Response({
                     'error': f'Erreur icône: {str(e)}'
@@ -153,17 +78,20 @@ class ServiceViewSet(viewsets.ModelViewSet):
         Endpoint pour récupérer les services d'un utilisateur spécifique
         URL: /api/services/user/{user_id}/
         """
-        user = get_object_or_404(User, id=user_id)
-        
-        if not (request.user == user or request.user.is_staff or request.user.is_superuser):
+        if not is_owner_or_admin(request.user, user_id):
             return Response(
                 {'error': 'Vous n\'avez pas la permission d\'accéder à ces données'}, 
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        services = Service.objects.select_related('user').filter(user=user)
-        serializer = self.get_serializer(services, many=True)
-        return Response(serializer.data)
+        def build():
+            user = get_object_or_404(User, id=user_id)
+            services = Service.objects.select_related('user').filter(user=user)
+            page = self.paginate_queryset(services)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data).data
+        
+        return Response(cached_user_section(user_id, 'services', build, request))
 
     @action(detail=False, methods=['get'], url_path='my-services')
     def my_services(self, request):
@@ -172,8 +100,13 @@ class ServiceViewSet(viewsets.ModelViewSet):
         URL: /api/services/my-services/
         """
         services = Service.objects.select_related('user').filter(user=request.user)
-        serializer = self.get_serializer(services, many=True)
-        return Response(serializer.data)
+        
+        def build():
+            page = self.paginate_queryset(services)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        return self.conditional_response(services, build)
 
     @action(detail=False, methods=['get'], url_path='active')
     def active_services(self, request):
@@ -194,9 +127,10 @@ class ServiceViewSet(viewsets.ModelViewSet):
         Endpoint pour récupérer les services par tag
         URL: /api/services/by-tag/{tag_name}/
         """
+        # Recherche indexée via la table ServiceTag (Service.tags est un JSONField)
         services = Service.objects.select_related('user').filter(
             user=request.user,
-            tags__contains=[tag_name]
+            service_tags__tag__name=normalize_name(tag_name)
         )
         serializer = self.get_serializer(services, many=True)
         return Response(serializer.data)
@@ -249,14 +183,11 @@ class ServiceViewSet(viewsets.ModelViewSet):
 
         # Valider le fichier
         try:
-            validate_service_icon(request.FILES['icon'])
+            validate_image_file(request.FILES['icon'])
         except ValueError as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Supprimer l'ancienne icône
-        remove_old_file(service.icon)
-
-        # Assigner la nouvelle icône
+        # Assigner la nouvelle icône (l'ancienne est supprimée par sweep_media si elle n'est plus référencée)
         service.icon = request.FILES['icon']
         service.save()
 
@@ -275,7 +206,6 @@ class ServiceViewSet(viewsets.ModelViewSet):
         service = self.get_object()
         
         if service.icon:
-            remove_old_file(service.icon)
             service.icon = None
             service.icon_url = None
             service.save()
@@ -329,8 +259,8 @@ class ServiceViewSet(viewsets.ModelViewSet):
                 'error': 'Ordre invalide'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        service.order = new_order
-        service.save()
+        # Déplace l'élément à l'indice demandé (positions réécrites en une requête)
+        self.move_to_position(service, new_order)
         
         serializer = self.get_serializer(service)
         return Response(serializer.data)
@@ -2,8 +2,9 @@ from rest_framework import viewsets
 from portfolio.models.settings import Settings
 from portfolio.serializers.settings_serializer import SettingsSerializer
 from rest_framework.permissions import IsAuthenticated
+from portfolio.views.mixins import ConditionalGetMixin
 
-class SettingsViewSet(viewsets.ModelViewSet):
+class SettingsViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Settings.objects.all()
     serializer_class = SettingsSerializer
     permission_classes = [IsAuthenticated]
\ No newline at end of file
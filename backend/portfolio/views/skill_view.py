@@ -5,11 +5,14 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
 from ..models.skill import Skill
 from ..models.user import User
+from ..cache import cached_user_section
 from ..serializers.skill_serializer import SkillSerializer
+from .mixins import BulkMixin, ConditionalGetMixin, is_owner_or_admin
 
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(BulkMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = SkillSerializer
     permission_classes = [IsAuthenticated]
+    last_modified_fields = ('updated_at', 'user__updated_at')
 
     def get_queryset(self):
         """
@@ -17,8 +20,8 @@ class SkillViewSet(viewsets.ModelViewSet):
         ou seulement les skills de l'utilisateur connecté
         """
         if self.request.user.is_staff or self.request.user.is_superuser:
-            return Skill.objects.all()
-        return Skill.objects.filter(user=self.request.user)
+            return Skill.objects.select_related('user').all()
+        return Skill.objects.select_related('user').filter(user=self.request.user)
 
     def perform_create(self, serializer):
         """Associe automatiquement la skill à l'utilisateur connecté"""
@@ -43,17 +46,20 @@ class SkillViewSet(viewsets.ModelViewSet):
         Endpoint pour récupérer les skills d'un utilisateur spécifique
         URL: /api/skills/user/{user_id}/
         """
-        user = get_object_or_404(User, id=user_id)
-        
-        if not (request.user == user or request.user.is_staff or request.user.is_superuser):
+        if not is_owner_or_admin(request.user, user_id):
             return Response(
                 {'error': 'Vous n\'avez pas la permission d\'accéder à ces données'}, 
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        skills = Skill.objects.filter(user=user)
-        serializer = self.get_serializer(skills, many=True)
-        return Response(serializer.data)
+        def build():
+            user = get_object_or_404(User, id=user_id)
+            skills = Skill.objects.select_related('user').filter(user=user)
+            page = self.paginate_queryset(skills)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data).data
+        
+        return Response(cached_user_section(user_id, 'skills', build, request))
 
     @action(detail=False, methods=['get'], url_path='my-skills')
     def my_skills(self, request):
@@ -61,6 +67,11 @@ class SkillViewSet(viewsets.ModelViewSet):
         Endpoint pour récupérer les skills de l'utilisateur connecté
         URL: /api/skills/my-skills/
         """
-        skills = Skill.objects.filter(user=request.user)
-        serializer = self.get_serializer(skills, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        skills = Skill.objects.select_related('user').filter(user=request.user)
+        
+        def build():
+            page = self.paginate_queryset(skills)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        return self.conditional_response(skills, build)
\ No newline at end of file
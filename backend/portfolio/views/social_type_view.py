@@ -5,8 +5,9 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.parsers import MultiPartParser, FormParser
 from ..models.social_type import SocialType
 from ..serializers.social_type_serializer import SocialTypeSerializer
+from .mixins import ConditionalGetMixin
 
-class SocialTypeViewSet(viewsets.ModelViewSet):
+class SocialTypeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = SocialType.objects.all()
     serializer_class = SocialTypeSerializer
     parser_classes = [MultiPartParser, FormParser]  # Pour gérer les uploads de fichiers
@@ -38,13 +39,7 @@ class SocialTypeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Supprimer l'ancien logo si il existe
-        if social_type.logo:
-            old_logo = social_type.logo
-            if old_logo and os.path.isfile(old_logo.path):
-                os.remove(old_logo.path)
-
-        # Assigner le nouveau logo
+        # Assigner le nouveau logo (l'ancien est supprimé par sweep_media s'il n'est plus référencé)
         social_type.logo = request.FILES['logo']
         social_type.save()
 
@@ -60,11 +55,7 @@ class SocialTypeViewSet(viewsets.ModelViewSet):
         social_type = self.get_object()
         
         if social_type.logo:
-            # Supprimer le fichier physique
-            if os.path.isfile(social_type.logo.path):
-                os.remove(social_type.logo.path)
-            
-            # Vider les champs logo
+            # Vider les champs logo (le fichier est supprimé par sweep_media s'il n'est plus référencé)
             social_type.logo = None
             social_type.logo_url = None
             social_type.save()
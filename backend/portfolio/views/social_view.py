@@ -5,11 +5,14 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
 from ..models.social import Social
 from ..models.user import User
+from ..cache import cached_user_section
 from ..serializers.social_serializer import SocialSerializer
+from .mixins import BulkMixin, ConditionalGetMixin, is_owner_or_admin
 
-class SocialViewSet(viewsets.ModelViewSet):
+class SocialViewSet(BulkMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = SocialSerializer
     permission_classes = [IsAuthenticated]
+    last_modified_fields = ('updated_at', 'user__updated_at', 'social_type__updated_at')
 
     def get_queryset(self):
         """
@@ -44,17 +47,20 @@ class SocialViewSet(viewsets.ModelViewSet):
         Endpoint pour récupérer les réseaux sociaux d'un utilisateur spécifique
         URL: /api/socials/user/{user_id}/
         """
-        user = get_object_or_404(User, id=user_id)
-        
-        if not (request.user == user or request.user.is_staff or request.user.is_superuser):
+        if not is_owner_or_admin(request.user, user_id):
             return Response(
                 {'error': 'Vous n\'avez pas la permission d\'accéder à ces données'}, 
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        socials = Social.objects.select_related('social_type', 'user').filter(user=user)
-        serializer = self.get_serializer(socials, many=True)
-        return Response(serializer.data)
+        def build():
+            user = get_object_or_404(User, id=user_id)
+            socials = Social.objects.select_related('social_type', 'user').filter(user=user)
+            page = self.paginate_queryset(socials)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data).data
+        
+        return Response(cached_user_section(user_id, 'socials', build, request))
 
     @action(detail=False, methods=['get'], url_path='my-socials')
     def my_socials(self, request):
@@ -63,8 +69,13 @@ class SocialViewSet(viewsets.ModelViewSet):
         URL: /api/socials/my-socials/
         """
         socials = Social.objects.select_related('social_type', 'user').filter(user=request.user)
-        serializer = self.get_serializer(socials, many=True)
-        return Response(serializer.data)
+        
+        def build():
+            page = self.paginate_queryset(socials)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        return self.conditional_response(socials, build)
 
     @action(detail=False, methods=['get'], url_path='by-type/(?P<social_type_id>[^/.]+)')
     def socials_by_type(self, request, social_type_id=None):
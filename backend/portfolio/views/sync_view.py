@@ -0,0 +1,42 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from datetime import timezone as dt_timezone
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from ..sync import changes_since
+
+
+def parse_since(value):
+    """Date ISO 8601 (ex: next_since d'une réponse précédente); ValueError si invalide"""
+    since = parse_datetime(value)
+    if since is None:
+        raise ValueError(value)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since, dt_timezone.utc)
+    return since
+
+
+class SyncView(APIView):
+    """
+    Synchronisation incrémentale des sections de l'utilisateur connecté
+    URL: /api/sync/?since=<date ISO 8601>
+
+    Retourne les lignes créées ou modifiées depuis `since` (changes) et les
+    identifiants supprimés (deleted), par section. Sans `since`, ou si la date
+    est trop ancienne, retourne une copie complète avec reset=true.
+    Le client rappelle ensuite l'endpoint avec since=next_since.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        since = request.query_params.get('since')
+        try:
+            since = parse_since(since) if since else None
+        except ValueError:
+            return Response(
+                {'error': 'Le paramètre "since" doit être une date ISO 8601'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(changes_since(request.user, since, request))
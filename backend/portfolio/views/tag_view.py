@@ -0,0 +1,64 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import AllowAny
+from rest_framework import status
+from django.db.models import Count
+from ..models.project import Project
+from ..models.tag import Tag, Technology
+
+
+def parse_user_id(request):
+    """Retourne l'identifiant du paramètre 'user' (None s'il est absent), ValueError s'il est invalide"""
+    user_id = request.query_params.get('user')
+    return int(user_id) if user_id else None
+
+
+class TagFacetView(APIView):
+    """
+    Endpoint PUBLIC des facettes de tags: nombre de services actifs par tag
+    URL: /api/tags/facets/?user=<user_id>
+
+    Le comptage passe par l'index (tag, service) de la table ServiceTag
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        try:
+            user_id = parse_user_id(request)
+        except ValueError:
+            return Response({'error': 'Le paramètre "user" doit être un entier'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Un seul filter(): les conditions portent sur la même jointure que le Count
+        filters = {'service_tags__service__is_active': True}
+        if user_id is not None:
+            filters['service_tags__service__user_id'] = user_id
+        facets = Tag.objects.filter(**filters).annotate(count=Count('service_tags')).order_by('-count', 'name').values('name', 'count')
+        return Response({'tags': list(facets)})
+
+
+class TechnologyFacetView(APIView):
+    """
+    Endpoint PUBLIC des facettes de technologies: nombre de projets terminés
+    (les seuls publics, comme dans la recherche) par technologie
+    URL: /api/technologies/facets/?user=<user_id>
+
+    Le comptage passe par l'index (technology, project) de la table ProjectTechnology
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        try:
+            user_id = parse_user_id(request)
+        except ValueError:
+            return Response({'error': 'Le paramètre "user" doit être un entier'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Un seul filter(): les conditions portent sur la même jointure que le Count
+        filters = {'project_technologies__project__status': Project.STATUS_COMPLETED}
+        if user_id is not None:
+            filters['project_technologies__project__user_id'] = user_id
+        facets = (
+            Technology.objects.filter(**filters).annotate(count=Count('project_technologies'))
+            .order_by('-count', 'name')
+            .values('name', 'count')
+        )
+        return Response({'technologies': list(facets)})
@@ -2,9 +2,10 @@ from rest_framework import viewsets
 from portfolio.models.user import User
 from portfolio.serializers.user_serializer import UserSerializer
 from rest_framework.permissions import IsAuthenticated
+from portfolio.views.mixins import ConditionalGetMixin
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
\ No newline at end of file
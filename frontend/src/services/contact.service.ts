@@ -1,5 +1,6 @@
 import { ContactPayload } from "../interfaces/contact";
 import api from "./api";
+import { fetchAllPages } from "./pagination";
 
 const updateContact = async (id: number, data: ContactPayload) => {
   return api
@@ -22,7 +23,25 @@ const deleteContact = async (contactId: number) => {
 };
 
 const getMyContacts = async () => {
-  return api.get(`/contacts/my-contacts/`).then((response: any) => {
+  return fetchAllPages(`/contacts/my-contacts/`).then((data: any) => {
+    return data.results;
+  });
+};
+
+const getUnreadCount = async (): Promise<number> => {
+  return api.get(`/contacts/unread-count/`).then((response: any) => {
+    return response.data.unread_count;
+  });
+};
+
+const getDigestFrequency = async () => {
+  return api.get(`/contacts/digest/`).then((response: any) => {
+    return response.data;
+  });
+};
+
+const updateDigestFrequency = async (frequency: "none" | "daily" | "weekly") => {
+  return api.patch(`/contacts/digest/`, { frequency }).then((response: any) => {
     return response.data;
   });
 };
@@ -31,6 +50,9 @@ const contactService = {
   updateContact,
   getContacts,
   deleteContact,
-  getMyContacts
+  getMyContacts,
+  getUnreadCount,
+  getDigestFrequency,
+  updateDigestFrequency
 };
 export default contactService;
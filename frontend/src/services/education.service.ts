@@ -1,5 +1,6 @@
 import { EducationFormPayload } from "../interfaces/education";
 import api from "./api";
+import { fetchAllPages } from "./pagination";
 
 const createEducation = async (data: EducationFormPayload) => {
   return api.post(`/educations/`, data).then((response: any) => {
@@ -14,14 +15,12 @@ const updateEducation = async (id: number, data: EducationFormPayload) => {
 };
 
 const getEducations = async (userId: number) => {
-  return api.get(`/educations/user/${userId}/`).then((response: any) => {
-    return response.data;
-  });
+  return fetchAllPages(`/educations/user/${userId}/`, "educations");
 };
 
 const getMyEducations = async () => {
-  return api.get(`/educations/my-educations/`).then((response: any) => {
-    return response.data;
+  return fetchAllPages(`/educations/my-educations/`).then((data: any) => {
+    return data.results;
   });
 };
 
@@ -1,5 +1,6 @@
 import { ExperienceFormPayload } from "../interfaces/experience";
 import api from "./api";
+import { fetchAllPages } from "./pagination";
 
 const createExperience = async (data: ExperienceFormPayload) => {
   return api.post(`/experiences/`, data).then((response: any) => {
@@ -14,14 +15,14 @@ const updateExperience = async (id: number, data: ExperienceFormPayload) => {
 };
 
 const getExperiences = async (userId: number) => {
-  return api.get(`/experiences/user/${userId}/`).then((response: any) => {
-    return response.data;
+  return fetchAllPages(`/experiences/user/${userId}/`).then((data: any) => {
+    return data.results;
   });
 };
 
 const getMyExperiences = async () => {
-  return api.get(`/experiences/my-experiences/`).then((response: any) => {
-    return response.data;
+  return fetchAllPages(`/experiences/my-experiences/`).then((data: any) => {
+    return data.results;
   });
 };
 
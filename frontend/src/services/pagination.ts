@@ -0,0 +1,24 @@
+import api from "./api";
+
+// Taille de page maximale acceptée par l'API (max_page_size)
+const PAGE_SIZE = 100;
+
+/**
+ * Charge toutes les pages d'une liste paginée (curseur ou décalage).
+ * Retourne la première page avec tous les éléments sous `key`
+ * ("results", ou "educations" pour /educations/user/{id}/).
+ */
+export const fetchAllPages = async (url: string, key: string = "results") => {
+  const first = (await api.get(url, { params: { page_size: PAGE_SIZE } })).data;
+  const items = [...first[key]];
+  let next: string | null = first.next;
+  while (next) {
+    // Seuls les paramètres sont repris (cursor, ou offset pour les listes ordonnées
+    // par l'utilisateur): le lien `next` contient l'hôte vu par le backend
+    const params = Object.fromEntries(new URL(next).searchParams);
+    const page = (await api.get(url, { params })).data;
+    items.push(...page[key]);
+    next = page.next;
+  }
+  return { ...first, [key]: items, next: null, previous: null };
+};
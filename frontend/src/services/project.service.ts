@@ -1,4 +1,5 @@
 import api from "./api";
+import { fetchAllPages } from "./pagination";
 
 const createProject = async (data: FormData) => {
   return api
@@ -21,14 +22,14 @@ const updateProject = async (id: number, data: FormData) => {
 };
 
 const getProjects = async (userId: number) => {
-  return api.get(`/projects/user/${userId}/`).then((response: any) => {
-    return response.data;
+  return fetchAllPages(`/projects/user/${userId}/`).then((data: any) => {
+    return data.results;
   });
 };
 
 const getMyProjects = async () => {
-  return api.get(`/projects/my-projects/`).then((response: any) => {
-    return response.data;
+  return fetchAllPages(`/projects/my-projects/`).then((data: any) => {
+    return data.results;
   });
 };
 
@@ -1,4 +1,5 @@
 import api from "./api";
+import { fetchAllPages } from "./pagination";
 
 const createService = async (data: FormData) => {
   return api
@@ -21,14 +22,14 @@ const updateService = async (id: number, data: FormData) => {
 };
 
 const getServices = async (userId: number) => {
-  return api.get(`/services/user/${userId}/`).then((response: any) => {
-    return response.data;
+  return fetchAllPages(`/services/user/${userId}/`).then((data: any) => {
+    return data.results;
   });
 };
 
 const getMyServices = async () => {
-  return api.get(`/services/my-services/`).then((response: any) => {
-    return response.data;
+  return fetchAllPages(`/services/my-services/`).then((data: any) => {
+    return data.results;
   });
 };
 
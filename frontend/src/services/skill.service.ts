@@ -1,5 +1,6 @@
 import { SkillPayload } from "../interfaces/skill";
 import api from "./api";
+import { fetchAllPages } from "./pagination";
 
 const createSkill = async (data: SkillPayload) => {
   return api.post(`/skills/`, data).then((response: any) => {
@@ -14,14 +15,14 @@ const updateSkill = async (id: number, data: SkillPayload) => {
 };
 
 const getSkills = async (userId: number) => {
-  return api.get(`/skills/user/${userId}/`).then((response: any) => {
-    return response.data;
+  return fetchAllPages(`/skills/user/${userId}/`).then((data: any) => {
+    return data.results;
   });
 };
 
 const getMySkills = async () => {
-  return api.get(`/skills/my-skills/`).then((response: any) => {
-    return response.data;
+  return fetchAllPages(`/skills/my-skills/`).then((data: any) => {
+    return data.results;
   });
 };
 
@@ -1,5 +1,6 @@
 import { SocialPayload } from "../interfaces/social";
 import api from "./api";
+import { fetchAllPages } from "./pagination";
 
 const createSocial = async (data: SocialPayload) => {
   return api.post(`/socials/`, data).then((response: any) => {
@@ -14,14 +15,14 @@ const updateSocial = async (id: number, data: SocialPayload) => {
 };
 
 const getSocials = async (userId: number) => {
-  return api.get(`/socials/user/${userId}/`).then((response: any) => {
-    return response.data;
+  return fetchAllPages(`/socials/user/${userId}/`).then((data: any) => {
+    return data.results;
   });
 };
 
 const getMySocials = async () => {
-  return api.get(`/socials/my-socials/`).then((response: any) => {
-    return response.data;
+  return fetchAllPages(`/socials/my-socials/`).then((data: any) => {
+    return data.results;
   });
 };
 
@@ -0,0 +1,16 @@
+import api from "./api";
+
+// Modifications des sections de l'utilisateur connecté depuis `since`
+// (valeur next_since de la réponse précédente). reset=true: copie complète
+const getChanges = async (since?: string) => {
+  return api
+    .get(`/sync/`, { params: since ? { since } : {} })
+    .then((response: any) => {
+      return response.data;
+    });
+};
+
+const syncService = {
+  getChanges
+};
+export default syncService;
@@ -1,14 +1,14 @@
-import api from "./api";
+import { fetchAllPages } from "./pagination";
 
 const getSocialTypes = async () => {
-  return api.get(`/social-types/`).then((response: any) => {
-    return response.data;
+  return fetchAllPages(`/social-types/`).then((data: any) => {
+    return data.results;
   });
 };
 
 const getCategories = async () => {
-  return api.get(`/categories/`).then((response: any) => {
-    return response.data;
+  return fetchAllPages(`/categories/`).then((data: any) => {
+    return data.results;
   });
 };
 